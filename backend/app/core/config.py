@@ -1,5 +1,5 @@
 import os
-from typing import List, Union
+from typing import Dict, List, Union
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
@@ -17,10 +17,58 @@ class Settings(BaseSettings):
     allowed_origins: List[str] = []
     audio_root: str = "/tmp/nativewrite/audio"
     youtube_cookies_file: str = ""  # Path to cookies.txt file (optional)
+    youtube_browser_max_pages: int = 2  # Concurrent pages in the shared Chromium
+    youtube_browser_max_uses: int = 50  # Pages served before the browser is replaced
+    youtube_extract_timeout_seconds: float = 20.0  # Wait for the player to request the wanted stream
+    youtube_hedge_delay_seconds: float = 8.0  # Start the next extractor if none has succeeded by then
+    youtube_ytdlp_timeout_seconds: float = 60.0  # Kill a yt-dlp extraction process after this long
+    ytdlp_workers: int = 4  # yt-dlp worker processes (concurrent yt-dlp jobs)
+    ytdlp_worker_memory_mb: int = 2048  # Address-space limit per worker incl. its ffmpeg (0 disables)
+    ytdlp_worker_max_jobs: int = 25  # Jobs served before a worker is replaced
+    ytdlp_job_timeout_seconds: float = 3600.0  # Kill a yt-dlp download after this long
+    strategy_stats_window: int = 100  # Outcomes kept per extraction strategy, provider and domain
+    strategy_stats_window_seconds: float = 3600.0  # Outcomes older than this no longer count
+    strategy_breaker_failures: int = 5  # Consecutive failures that make a strategy be skipped
+    strategy_breaker_cooldown_seconds: float = 300.0  # Skip time before a single probe is allowed
     cleanup_interval_seconds: int = 900  # 15 min
-    cleanup_max_age_seconds: int = 7200  # 2 hours
+    cleanup_max_age_seconds: int = 7200  # 2 hours, TTL for files in audio_root
+    storage_media_dir: str = "storage/media"
+    storage_media_ttl_seconds: int = 604800  # 7 days since last access
+    storage_quota_bytes: int = 10 * 1024**3  # Total for media + audio_root, LRU eviction above it (0 disables)
+    storage_job_ttl_seconds: int = 2592000  # 30 days, finished job records are deleted after this
+    storage_dedup: bool = True  # Store media content-addressed; identical outputs share one hardlinked copy
     rate_limit_requests: int = 30
     rate_limit_window_seconds: int = 60
+    job_store_backend: str = "json"  # "json" or "sqlite"
+    job_store_jobs_dir: str = "storage/jobs"
+    job_store_sqlite_path: str = "storage/jobs.db"
+    job_store_cache_size: int = 1024  # Parsed jobs kept in memory (JSON backend)
+    download_reservation_ttl_seconds: float = 10.0  # Lookup-to-create lock per media key
+    download_retry_backoff_seconds: int = 60  # Doubles per failed attempt
+    download_retry_backoff_max_seconds: int = 3600
+    download_workers: int = 4  # Concurrent downloads
+    download_lease_seconds: float = 120.0  # Running jobs not renewed for this long are re-queued by any process
+    download_provider_concurrency: Dict[str, int] = {"youtube": 2}  # Per-provider caps (JSON in env)
+    download_batch_max_items: int = 100  # URLs per batch, including expanded playlist entries
+    download_max_bytes: int = 4 * 1024**3  # Largest direct/stream download, 4 GiB (0 disables)
+    download_connections: int = 4  # Parallel range requests per direct download (1 disables)
+    download_segment_min_bytes: int = 4 * 1024**2  # Smallest range request, 4 MiB
+    download_hls_concurrency: int = 8  # HLS segments fetched in parallel per download
+    download_provider_plugins: bool = True  # Load providers registered under the nativewrite.providers entry point
+    http_http2: bool = True  # Shared client negotiates HTTP/2 (parallel range requests stay on HTTP/1.1)
+    http_max_connections: int = 100  # Per shared client
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http_max_connections_per_host: int = 16  # Concurrent requests per host across providers
+    http_connect_timeout_seconds: float = 10.0
+    http_read_timeout_seconds: float = 60.0  # Per chunk, not for the whole download
+    http_pool_timeout_seconds: float = 60.0  # Waiting for a free connection
+    download_long_poll_max_seconds: float = 30.0  # Cap for GET /api/download/{job_id}?wait=N
+    media_probe_timeout_seconds: float = 60.0  # Kill a metadata extraction process after this long
+    media_probe_cache_ttl_seconds: int = 1800  # Below the lifetime of signed stream URLs
+    media_probe_cache_max_entries: int = 256
+    humanizer_checkpoint_max_entries: int = 512
+    humanizer_checkpoint_ttl_seconds: int = 3600  # 1 hour
 
     @field_validator("allowed_origins", mode="before")
     @classmethod
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import os
+from collections import deque
+from typing import AsyncIterable, Callable, Optional
+
 from loguru import logger
 import ffmpeg
 
@@ -34,3 +38,83 @@ def ensure_mp3(input_path: str, output_dir: str) -> str:
 
     return output_path
 
+
+class FFmpegError(RuntimeError):
+    """Raised when an ffmpeg process exits with a non-zero status."""
+
+
+async def run_ffmpeg(
+    args: list[str],
+    on_progress: Optional[Callable[[float, int], None]] = None,
+    timeout: Optional[float] = None,
+    input_chunks: Optional[AsyncIterable[bytes]] = None,
+) -> None:
+    """
+    Run ffmpeg as an asyncio subprocess without blocking the event loop.
+
+    Progress is read from ``-progress pipe:1``. With ``input_chunks`` the data
+    is written to ffmpeg's stdin (pass ``-i pipe:0``) as it is produced,
+    waiting for ffmpeg to drain the pipe, so only a pipe buffer is held.
+
+    Args:
+        args: ffmpeg arguments (without the leading "ffmpeg")
+        on_progress: Called with (seconds of output written, bytes written)
+        timeout: Seconds before the process is killed
+        input_chunks: Data to feed to stdin; an error raised by it kills ffmpeg and propagates
+
+    Raises:
+        FFmpegError: ffmpeg exited with an error
+        asyncio.TimeoutError: timeout elapsed
+    """
+    cmd = ["ffmpeg", "-hide_banner", "-nostats", "-progress", "pipe:1", *args]
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if input_chunks is not None else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr_tail: deque[str] = deque(maxlen=20)
+
+    async def read_progress() -> None:
+        out_seconds = 0.0
+        total_size = 0
+        async for raw in process.stdout:
+            key, _, value = raw.decode(errors="replace").strip().partition("=")
+            if key == "out_time_us" and value.isdigit():
+                out_seconds = int(value) / 1_000_000
+            elif key == "total_size" and value.isdigit():
+                total_size = int(value)
+            elif key == "progress" and on_progress:
+                on_progress(out_seconds, total_size)
+
+    async def read_stderr() -> None:
+        async for raw in process.stderr:
+            stderr_tail.append(raw.decode(errors="replace").rstrip())
+
+    async def feed_input() -> None:
+        if input_chunks is None:
+            return
+        try:
+            async for chunk in input_chunks:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg exited early; its exit status reports why
+        finally:
+            process.stdin.close()
+            if hasattr(input_chunks, "aclose"):
+                await input_chunks.aclose()
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(read_progress(), read_stderr(), feed_input(), process.wait()),
+            timeout=timeout,
+        )
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+    if process.returncode != 0:
+        raise FFmpegError("\n".join(stderr_tail) or f"ffmpeg exited with status {process.returncode}")
@@ -7,21 +7,25 @@ from __future__ import annotations
 import os
 import subprocess
 import tempfile
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from loguru import logger
-from yt_dlp import YoutubeDL
 
+from .ytdlp_process import ytdlp_pool
 
-def extract_with_ytdlp(url: str, output_dir: str, cookies_file: Optional[str] = None) -> Optional[Tuple[str, float]]:
-    """Try extracting with yt-dlp (primary method)."""
+
+async def extract_with_ytdlp(
+    url: str,
+    output_dir: str,
+    cookies_file: Optional[str] = None,
+    progress_hooks: Optional[List[Callable[[dict], None]]] = None,
+) -> Optional[Tuple[str, float]]:
+    """Try extracting with yt-dlp (primary method), in the yt-dlp worker pool."""
     try:
         tmp_template = os.path.join(output_dir, "%(id)s.%(ext)s")
         ydl_opts = {
             "format": "bestaudio/best",
             "outtmpl": tmp_template,
             "noplaylist": True,
-            "quiet": False,
-            "no_warnings": False,
             "merge_output_format": "mp3",
             "extractor_args": {
                 "youtube": {
@@ -40,9 +44,8 @@ def extract_with_ytdlp(url: str, output_dir: str, cookies_file: Optional[str] =
         if cookies_file and os.path.exists(cookies_file):
             ydl_opts["cookiefile"] = cookies_file
             logger.info("Using cookies file: {cookies_file}", cookies_file=cookies_file)
-        
-        with YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
+
+        info = await ytdlp_pool.download(url, ydl_opts, progress_hooks=progress_hooks)
         
         file_id = info.get("id")
         downloaded_path = os.path.join(output_dir, f"{file_id}.mp3")
@@ -57,6 +60,49 @@ def extract_with_ytdlp(url: str, output_dir: str, cookies_file: Optional[str] =
     return None
 
 
+async def extract_playlist_entries(
+    url: str,
+    max_entries: int,
+    cookies_file: Optional[str] = None,
+) -> Tuple[Optional[str], List[str]]:
+    """
+    List the entry URLs of a playlist without downloading anything.
+
+    Uses yt-dlp flat extraction in the worker pool, so only the playlist pages
+    are fetched. A URL that is not a playlist yields just itself.
+
+    Returns:
+        (playlist title, entry URLs) with at most max_entries entries
+    """
+    ydl_opts = {
+        "extract_flat": "in_playlist",
+        "skip_download": True,
+        "playlistend": max_entries,
+    }
+    if cookies_file and os.path.exists(cookies_file):
+        ydl_opts["cookiefile"] = cookies_file
+
+    info = await ytdlp_pool.extract(url, ydl_opts)
+
+    if not info or info.get("_type") not in ("playlist", "multi_video"):
+        return None, [url]
+
+    urls = []
+    for entry in info.get("entries") or []:
+        if not entry:
+            continue
+        entry_url = entry.get("url") or entry.get("webpage_url")
+        if entry_url and not entry_url.startswith(("http://", "https://")):
+            entry_url = None
+        if not entry_url and entry.get("ie_key") == "Youtube" and entry.get("id"):
+            entry_url = f"https://www.youtube.com/watch?v={entry['id']}"
+        if entry_url:
+            urls.append(entry_url)
+        if len(urls) >= max_entries:
+            break
+    return info.get("title"), urls
+
+
 def extract_with_playwright(url: str, output_dir: str) -> Optional[Tuple[str, float]]:
     """
     Extract YouTube audio using Playwright (headless browser).
@@ -72,7 +118,12 @@ def extract_with_playwright(url: str, output_dir: str) -> Optional[Tuple[str, fl
         return None
 
 
-def extract_youtube_audio(url: str, output_dir: str, cookies_file: Optional[str] = None) -> Tuple[str, float]:
+async def extract_youtube_audio(
+    url: str,
+    output_dir: str,
+    cookies_file: Optional[str] = None,
+    progress_hooks: Optional[List[Callable[[dict], None]]] = None,
+) -> Tuple[str, float]:
     """
     Extract YouTube audio using multiple strategies (like TurboScribe).
     Tries yt-dlp first, then falls back to other methods.
@@ -80,14 +131,14 @@ def extract_youtube_audio(url: str, output_dir: str, cookies_file: Optional[str]
     os.makedirs(output_dir, exist_ok=True)
     
     # Strategy 1: Try yt-dlp with cookies
-    result = extract_with_ytdlp(url, output_dir, cookies_file)
+    result = await extract_with_ytdlp(url, output_dir, cookies_file, progress_hooks)
     if result:
         return result
     
     # Strategy 2: Try yt-dlp without cookies (in case cookies are invalid)
     if cookies_file:
         logger.info("Retrying without cookies...")
-        result = extract_with_ytdlp(url, output_dir, None)
+        result = await extract_with_ytdlp(url, output_dir, None, progress_hooks)
         if result:
             return result
     
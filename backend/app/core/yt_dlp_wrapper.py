@@ -6,7 +6,6 @@ import tempfile
 from typing import Tuple, Optional
 
 from loguru import logger
-from yt_dlp import YoutubeDL
 
 # Import the multi-strategy extractor
 from .youtube_extractor import extract_youtube_audio
@@ -21,13 +20,13 @@ def sanitize_filename(name: str) -> str:
     return sanitized or "nativewrite_audio"
 
 
-def download_best_audio(url: str, output_dir: str, cookies_file: Optional[str] = None) -> Tuple[str, float]:
+async def download_best_audio(url: str, output_dir: str, cookies_file: Optional[str] = None) -> Tuple[str, float]:
     """
     Download the best audio track using multiple strategies (like TurboScribe).
     Tries yt-dlp first, then falls back to other methods.
     """
-    # Use the multi-strategy extractor
-    raw_path, duration = extract_youtube_audio(url, output_dir, cookies_file)
+    # Use the multi-strategy extractor (yt-dlp runs in the worker pool)
+    raw_path, duration = await extract_youtube_audio(url, output_dir, cookies_file)
     
     # Rename file to use sanitized title
     file_id = os.path.splitext(os.path.basename(raw_path))[0]
@@ -0,0 +1,386 @@
+"""
+Run yt-dlp in a pool of worker processes.
+
+yt-dlp is synchronous, CPU-heavy while parsing and cannot be interrupted
+from a thread. Each worker is a separate Python process that imports yt-dlp
+once and serves jobs one at a time over JSON lines on stdin/stdout, so the
+event loop and the server's GIL stay free. A cancelled or timed-out job
+kills its worker's whole process group (including ffmpeg postprocessors);
+the pool starts a fresh worker for the next job. Workers run under an
+address-space limit and are replaced after a number of jobs.
+
+Requests carry an action: "extract" resolves a URL without downloading,
+"select" re-runs format selection on an already extracted info dict and
+"download" downloads a URL or a previously extracted info dict.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+
+from .config import get_settings
+
+
+# Directory containing the ``app`` package, put on the workers' PYTHONPATH
+PACKAGE_ROOT = str(Path(__file__).resolve().parents[2])
+# Bulky info fields that are not needed to pick a format again
+DROPPED_FIELDS = (
+    "automatic_captions",
+    "subtitles",
+    "requested_subtitles",
+    "heatmap",
+    "requested_formats",
+    "requested_downloads",
+)
+PROGRESS_FIELDS = ("status", "downloaded_bytes", "total_bytes", "total_bytes_estimate", "speed", "eta")
+PROGRESS_INTERVAL = 0.25  # Seconds between relayed download progress updates
+LINE_LIMIT = 64 * 1024**2  # Largest message line (a full info dict)
+QUIET_OPTIONS = {"quiet": True, "no_warnings": True, "noprogress": True}
+
+
+class YtDlpProcessError(RuntimeError):
+    """Raised when a yt-dlp job fails in its worker process."""
+
+
+# --- Worker process -------------------------------------------------------
+
+
+def _worker_main(memory_limit: int) -> None:
+    if memory_limit:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    # Messages go to a private copy of stdout; anything yt-dlp prints lands on stderr
+    channel = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    from yt_dlp import YoutubeDL
+
+    def send(message: dict) -> None:
+        channel.write(json.dumps(message) + "\n")
+        channel.flush()
+
+    last_progress = 0.0
+
+    def progress_hook(update: dict) -> None:
+        nonlocal last_progress
+        now = time.monotonic()
+        if update.get("status") == "downloading" and now - last_progress < PROGRESS_INTERVAL:
+            return
+        last_progress = now
+        send({"type": "progress", "update": {field: update.get(field) for field in PROGRESS_FIELDS}})
+
+    def postprocessor_hook(update: dict) -> None:
+        update = {"status": update.get("status"), "postprocessor": update.get("postprocessor")}
+        send({"type": "postprocess", "update": update})
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        action = request["action"]
+        download = action == "download"
+        options = {**request["options"], **QUIET_OPTIONS}
+        if download:
+            options["progress_hooks"] = [progress_hook]
+            options["postprocessor_hooks"] = [postprocessor_hook]
+        try:
+            with YoutubeDL(options) as ydl:
+                if action == "select" or request.get("info") is not None:
+                    info = ydl.process_ie_result(request["info"], download=download)
+                else:
+                    info = ydl.extract_info(request["url"], download=download)
+                info = ydl.sanitize_info(info)
+            downloads = info.get("requested_downloads") or []
+            if downloads:
+                info["filepath"] = downloads[0].get("filepath")
+            for field in DROPPED_FIELDS:
+                info.pop(field, None)
+            send({"type": "result", "info": info})
+        except MemoryError:
+            send({"type": "error", "message": "yt-dlp worker ran out of memory"})
+            return
+        except Exception as e:
+            send({"type": "error", "message": str(e) or type(e).__name__})
+
+
+# --- Pool -----------------------------------------------------------------
+
+
+class _Worker:
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self.jobs = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def kill(self) -> None:
+        if self.alive:
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await self.process.wait()
+
+
+class YtDlpPool:
+    """
+    Bounded pool of long-lived yt-dlp worker processes.
+
+    At most ``max_workers`` jobs run at once; further jobs wait for a worker.
+    Idle workers are kept warm (yt-dlp already imported) and replaced after
+    ``max_jobs_per_worker`` jobs or when they die.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        memory_limit_mb: int = 2048,
+        max_jobs_per_worker: int = 25,
+        job_timeout: float = 3600.0,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            max_workers: Worker processes (and concurrent jobs)
+            memory_limit_mb: Address-space limit per worker, including its ffmpeg children (0 disables)
+            max_jobs_per_worker: Jobs served by one worker before it is replaced
+            job_timeout: Default seconds before a job's worker is killed
+        """
+        self.max_workers = max_workers
+        self.memory_limit = memory_limit_mb * 1024**2
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._idle: list[_Worker] = []
+        self._busy: set[_Worker] = set()
+
+    @classmethod
+    def from_settings(cls, settings) -> "YtDlpPool":
+        """Build a pool from application settings."""
+        return cls(
+            max_workers=settings.ytdlp_workers,
+            memory_limit_mb=settings.ytdlp_worker_memory_mb,
+            max_jobs_per_worker=settings.ytdlp_worker_max_jobs,
+            job_timeout=settings.ytdlp_job_timeout_seconds,
+        )
+
+    async def _spawn(self) -> _Worker:
+        env = {
+            **os.environ,
+            "PYTHONPATH": os.pathsep.join(filter(None, [PACKAGE_ROOT, os.environ.get("PYTHONPATH")])),
+        }
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "app.core.ytdlp_process",
+            str(self.memory_limit),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            env=env,
+            limit=LINE_LIMIT,
+            start_new_session=True,  # Own process group, so ffmpeg children die with the worker
+        )
+        logger.info("Started yt-dlp worker {pid}", pid=process.pid)
+        return _Worker(process)
+
+    async def _acquire(self) -> _Worker:
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive:
+                return worker
+            await worker.kill()
+        return await self._spawn()
+
+    async def _exchange(
+        self,
+        worker: _Worker,
+        request: dict,
+        progress_hooks: Optional[list[Callable[[dict], None]]],
+        postprocessor_hooks: Optional[list[Callable[[dict], None]]],
+    ) -> dict:
+        worker.process.stdin.write((json.dumps(request) + "\n").encode())
+        await worker.process.stdin.drain()
+        while True:
+            line = await worker.process.stdout.readline()
+            if not line:
+                await worker.process.wait()
+                raise YtDlpProcessError(f"yt-dlp worker exited with status {worker.process.returncode}")
+            message = json.loads(line)
+            if message["type"] == "result":
+                return message["info"]
+            if message["type"] == "error":
+                raise YtDlpProcessError(message["message"])
+            hooks = progress_hooks if message["type"] == "progress" else postprocessor_hooks
+            for hook in hooks or ():
+                try:
+                    hook(message["update"])
+                except Exception as e:
+                    logger.debug("yt-dlp progress hook failed: {error}", error=str(e))
+
+    async def _run(
+        self,
+        request: dict,
+        timeout: Optional[float],
+        progress_hooks: Optional[list[Callable[[dict], None]]] = None,
+        postprocessor_hooks: Optional[list[Callable[[dict], None]]] = None,
+    ) -> dict:
+        async with self._semaphore:
+            worker = await self._acquire()
+            self._busy.add(worker)
+            reusable = False
+            try:
+                info = await asyncio.wait_for(
+                    self._exchange(worker, request, progress_hooks, postprocessor_hooks),
+                    timeout=timeout or self.job_timeout,
+                )
+                reusable = True
+                return info
+            except YtDlpProcessError:
+                reusable = worker.alive
+                raise
+            finally:
+                self._busy.discard(worker)
+                worker.jobs += 1
+                if reusable and worker.jobs < self.max_jobs_per_worker:
+                    self._idle.append(worker)
+                else:
+                    if worker.alive:
+                        logger.info("Stopping yt-dlp worker {pid}", pid=worker.process.pid)
+                    await worker.kill()
+
+    async def extract(self, url: str, options: dict, timeout: Optional[float] = None) -> dict:
+        """
+        Extract metadata without downloading.
+
+        Args:
+            url: Media URL
+            options: YoutubeDL options (JSON-serializable, no hooks)
+            timeout: Seconds before the worker is killed (pool default if None)
+
+        Returns:
+            Sanitized info dict (without DROPPED_FIELDS); a selected format's
+            fields (url, ext, http_headers) are at the top level
+
+        Raises:
+            YtDlpProcessError: yt-dlp failed
+            asyncio.TimeoutError: timeout elapsed
+        """
+        return await self._run({"action": "extract", "url": url, "info": None, "options": options}, timeout)
+
+    async def select(self, info: dict, options: dict, timeout: Optional[float] = None) -> dict:
+        """
+        Run format selection on a previously extracted info dict.
+
+        Args:
+            info: Info dict returned by extract
+            options: YoutubeDL options (``format`` decides the selection)
+            timeout: Seconds before the worker is killed (pool default if None)
+
+        Returns:
+            Sanitized info dict with the selected format's fields at the top level
+
+        Raises:
+            YtDlpProcessError: yt-dlp failed (e.g. no format matches)
+            asyncio.TimeoutError: timeout elapsed
+        """
+        return await self._run({"action": "select", "url": None, "info": info, "options": options}, timeout)
+
+    async def download(
+        self,
+        url: Optional[str],
+        options: dict,
+        timeout: Optional[float] = None,
+        info: Optional[dict] = None,
+        progress_hooks: Optional[list[Callable[[dict], None]]] = None,
+        postprocessor_hooks: Optional[list[Callable[[dict], None]]] = None,
+    ) -> dict:
+        """
+        Download media with yt-dlp.
+
+        Progress updates from the worker are passed to the hooks with the
+        same fields yt-dlp's own hooks receive (see PROGRESS_FIELDS).
+
+        Args:
+            url: Media URL
+            options: YoutubeDL options (JSON-serializable, hooks go in the arguments below)
+            timeout: Seconds before the worker is killed (pool default if None)
+            info: Previously extracted info to download instead of extracting ``url`` again
+            progress_hooks: Called with download progress updates
+            postprocessor_hooks: Called with postprocessor status updates
+
+        Returns:
+            Sanitized info dict with ``filepath`` of the final file
+
+        Raises:
+            YtDlpProcessError: yt-dlp failed
+            asyncio.TimeoutError: timeout elapsed
+        """
+        request = {"action": "download", "url": url, "info": info, "options": options}
+        return await self._run(request, timeout, progress_hooks, postprocessor_hooks)
+
+    async def close(self) -> None:
+        """Kill all workers (called on app shutdown)."""
+        workers = self._idle + list(self._busy)
+        self._idle = []
+        for worker in workers:
+            await worker.kill()
+
+
+ytdlp_pool = YtDlpPool.from_settings(get_settings())
+
+
+async def extract_info(url: str, options: dict, timeout: Optional[float] = None) -> dict:
+    """
+    Resolve a URL with yt-dlp (no download) in the worker pool.
+
+    Cancelling the call or hitting the timeout kills the worker.
+
+    Args:
+        url: Media URL
+        options: YoutubeDL options
+        timeout: Seconds before the worker is killed
+
+    Returns:
+        Sanitized info dict (without DROPPED_FIELDS); the selected format's
+        fields (url, ext, http_headers) are at the top level
+
+    Raises:
+        YtDlpProcessError: yt-dlp failed
+        asyncio.TimeoutError: timeout elapsed
+    """
+    return await ytdlp_pool.extract(url, options, timeout)
+
+
+async def select_format(info: dict, options: dict, timeout: Optional[float] = None) -> dict:
+    """
+    Run yt-dlp format selection on a cached info dict in the worker pool, without extracting again.
+
+    Args:
+        info: Info dict returned by extract_info
+        options: YoutubeDL options (``format`` decides the selection)
+        timeout: Seconds before the worker is killed
+
+    Returns:
+        Info dict with the selected format's fields at the top level
+
+    Raises:
+        YtDlpProcessError: No format matches or yt-dlp failed
+        asyncio.TimeoutError: timeout elapsed
+    """
+    return await ytdlp_pool.select(info, options, timeout)
+
+
+if __name__ == "__main__":
+    _worker_main(int(sys.argv[1]) if len(sys.argv) > 1 else 0)
@@ -1,10 +1,29 @@
 """NativeWrite Universal Downloader Engine."""
 
 from .base import BaseProvider, DownloadResult
-from .registry import ProviderRegistry
-from .jobs import DownloadJob, JobStore
+from .http_pool import HttpClientPool
+from .registry import ProviderRegistry, ProviderSpec
+from .jobs import BaseJobStore, DownloadJob, JobStore, create_job_store
+from .sqlite_store import SQLiteJobStore
+from .queue import DownloadQueue
+from .progress import DownloadProgress, ProgressCallback, ProgressReporter
 
-__all__ = ["BaseProvider", "DownloadResult", "ProviderRegistry", "DownloadJob", "JobStore"]
+__all__ = [
+    "BaseProvider",
+    "DownloadResult",
+    "HttpClientPool",
+    "ProviderRegistry",
+    "ProviderSpec",
+    "BaseJobStore",
+    "DownloadJob",
+    "JobStore",
+    "SQLiteJobStore",
+    "create_job_store",
+    "DownloadQueue",
+    "DownloadProgress",
+    "ProgressCallback",
+    "ProgressReporter",
+]
 
 
 
@@ -2,10 +2,69 @@
 
 from __future__ import annotations
 
+import re
 from abc import ABC, abstractmethod
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import httpx
 from pydantic import BaseModel
 
+from ..core.config import get_settings
+from ..core.ytdlp_process import extract_info
+from .http_pool import HttpClientPool
+from .progress import ProgressCallback
+
+
+# Query parameters that never change which media a URL points to
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "si",
+    "feature",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def is_tracking_param(name: str) -> bool:
+    """Check if a query parameter is a tracking parameter."""
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL for deduplication.
+
+    Lowercases scheme and host, drops default ports, the fragment and
+    tracking parameters, and sorts the remaining query parameters.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    parsed = urlparse(url.strip())
+    scheme = (parsed.scheme or "https").lower()
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not is_tracking_param(key)
+    )
+    path = re.sub(r"/{2,}", "/", parsed.path) or "/"
+    return urlunparse((scheme, host, path, "", urlencode(query), ""))
+
 
 class DownloadResult(BaseModel):
     """Result of a download operation."""
@@ -22,19 +81,88 @@ class BaseProvider(ABC):
 
     name: str
     supported_domains: list[str]
+    http: Optional[HttpClientPool] = None  # Shared client pool, attached by the registry
 
-    @abstractmethod
     def can_handle(self, url: str) -> bool:
         """
         Check if this provider can handle the given URL.
 
+        By default the hostname must be one of ``supported_domains`` or a
+        subdomain of one (``m.youtube.com`` matches ``youtube.com``,
+        ``notyoutube.com`` does not).
+
         Args:
             url: The URL to check
 
         Returns:
             True if this provider can handle the URL, False otherwise
         """
-        pass
+        try:
+            hostname = (urlparse(url).hostname or "").lower()
+        except ValueError:
+            return False
+        return any(hostname == domain or hostname.endswith(f".{domain}") for domain in self.supported_domains)
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Build a stable media key for a URL.
+
+        Different URLs for the same media must produce the same key; providers
+        override this to extract their platform's media id.
+
+        Args:
+            url: The URL to canonicalize
+
+        Returns:
+            Media key of the form "<provider>:<id or normalized url>"
+        """
+        return f"{self.name}:{canonicalize_url(url)}"
+
+    @asynccontextmanager
+    async def http_client(self, bulk: bool = False) -> AsyncIterator[httpx.AsyncClient]:
+        """
+        Borrow an HTTP client for a download.
+
+        Uses the shared pool when the registry attached an open one; otherwise
+        (e.g. a provider used on its own) a short-lived client is created.
+
+        Args:
+            bulk: Use the HTTP/1.1 client meant for parallel range requests
+
+        Yields:
+            HTTP client, closed on exit only if it was created here
+        """
+        if self.http is not None and self.http.is_open:
+            yield self.http.bulk_client if bulk else self.http.client
+            return
+        async with httpx.AsyncClient(timeout=300.0) as client:
+            yield client
+
+    def ytdlp_options(self) -> dict:
+        """yt-dlp options for extracting this provider's media (providers add cookies, clients, ...)."""
+        return {"noplaylist": True}
+
+    async def probe(self, url: str) -> dict:
+        """
+        Extract metadata (title, duration, formats) without downloading.
+
+        Runs yt-dlp in a child process that is killed after
+        ``media_probe_timeout_seconds``.
+
+        Args:
+            url: Media URL
+
+        Returns:
+            yt-dlp info dict
+
+        Raises:
+            YtDlpProcessError: If extraction fails
+            asyncio.TimeoutError: If extraction takes too long
+        """
+        return await extract_info(url, self.ytdlp_options(), timeout=get_settings().media_probe_timeout_seconds)
+
+    async def close(self) -> None:
+        """Release long-lived resources (called by the registry on shutdown)."""
 
     @abstractmethod
     async def download(
@@ -43,6 +171,7 @@ class BaseProvider(ABC):
         output_dir: str,
         output_type: str = "audio",
         job_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> DownloadResult:
         """
         Download media from the given URL.
@@ -52,6 +181,7 @@ class BaseProvider(ABC):
             output_dir: Directory to save the output file
             output_type: "audio" or "video"
             job_id: Optional job ID for tracking
+            progress: Optional callback receiving stage/bytes progress
 
         Returns:
             DownloadResult with success status and file path
@@ -0,0 +1,83 @@
+"""Batch download jobs: a parent job aggregating many child downloads."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from loguru import logger
+
+from .jobs import BaseJobStore, DownloadJob
+
+
+# Child statuses after which a child no longer changes
+_DONE_STATUSES = ("completed", "failed", "expired")
+
+
+def summarize_batch(job_store: BaseJobStore, batch: DownloadJob) -> tuple[dict, list[DownloadJob]]:
+    """
+    Aggregate the state of a batch's child jobs.
+
+    Finished children count as 100%, running ones with their reported
+    percentage. The batch is ``running`` while any child is active, then
+    ``completed`` if at least one child completed, otherwise ``failed``. A
+    batch whose children are still being created is ``running``.
+
+    Args:
+        job_store: Store holding the jobs
+        batch: Batch parent job
+
+    Returns:
+        (summary dict with status, total, counts and percent, child jobs)
+    """
+    child_ids = batch.metadata.get("children")
+    children = [job_store.get_job(job_id) for job_id in child_ids or []]
+    children = [child for child in children if child]
+
+    counts: dict[str, int] = {}
+    percent = 0.0
+    for child in children:
+        counts[child.status] = counts.get(child.status, 0) + 1
+        if child.status in _DONE_STATUSES:
+            percent += 100.0
+        elif child.status == "running":
+            percent += child.progress.get("percent") or 0.0
+
+    if child_ids is None or any(child.status not in _DONE_STATUSES for child in children):
+        status = "running"
+    elif counts.get("completed"):
+        status = "completed"
+    else:
+        status = "failed"
+
+    summary = {
+        "status": status,
+        "total": len(children),
+        "counts": counts,
+        "percent": round(percent / len(children), 1) if children else 100.0,
+    }
+    return summary, children
+
+
+def refresh_batch(job_store: BaseJobStore, batch_id: str) -> Optional[dict]:
+    """
+    Recompute a batch's aggregate state and persist its status if it changed.
+
+    Args:
+        job_store: Store holding the jobs
+        batch_id: Batch parent job ID
+
+    Returns:
+        Summary from summarize_batch(), or None if the batch does not exist
+    """
+    batch = job_store.get_job(batch_id)
+    if not batch:
+        return None
+    summary, _ = summarize_batch(job_store, batch)
+    if summary["status"] != batch.status:
+        failed = summary["total"] - summary["counts"].get("completed", 0)
+        error_message = None
+        if summary["status"] != "running" and failed:
+            error_message = f"{failed} of {summary['total']} downloads did not complete"
+        job_store.update_job_status(batch_id, summary["status"], error_message=error_message)
+        logger.info(f"Batch {batch_id} is {summary['status']} ({summary['counts']})")
+    return summary
@@ -0,0 +1,154 @@
+"""Pool of long-lived headless browsers for page-based extraction."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+from playwright.async_api import Browser, Page, Playwright, Route, async_playwright
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+# Requests never needed to find media URLs
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "imageset", "font"})
+BLOCKED_URL_PARTS = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "/pagead/",
+    "/api/stats/ads",
+    "/ptracking",
+)
+LAUNCH_ARGS = ["--autoplay-policy=no-user-gesture-required", "--mute-audio"]
+
+
+class BrowserPool:
+    """
+    Shares one headless Chromium across extractions.
+
+    Each page gets its own browser context (no cookies or cache shared between
+    jobs) and concurrent pages are capped. The browser is launched on first
+    use and replaced after ``max_uses`` pages, when it disconnects, or after a
+    page crash; a retired browser closes once its last page is done. Images,
+    fonts and ad/tracking requests are aborted in every context.
+    """
+
+    def __init__(self, max_pages: int = 2, max_uses: int = 50, headless: bool = True):
+        """
+        Initialize pool.
+
+        Args:
+            max_pages: Pages open at the same time
+            max_uses: Pages served by one browser before it is replaced
+            headless: Run Chromium headless
+        """
+        self.max_pages = max_pages
+        self.max_uses = max_uses
+        self.headless = headless
+        self._semaphore = asyncio.Semaphore(max_pages)
+        self._lock = asyncio.Lock()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._uses = 0
+        self._active: dict[Browser, int] = {}  # Open pages per browser, including retired ones
+        self._unhealthy: set[Browser] = set()
+
+    @classmethod
+    def from_settings(cls, settings) -> "BrowserPool":
+        """Build a pool from application settings."""
+        return cls(max_pages=settings.youtube_browser_max_pages, max_uses=settings.youtube_browser_max_uses)
+
+    async def _acquire_browser(self) -> Browser:
+        async with self._lock:
+            browser = self._browser
+            if browser is not None and (
+                not browser.is_connected() or browser in self._unhealthy or self._uses >= self.max_uses
+            ):
+                logger.info(f"Recycling browser after {self._uses} pages")
+                self._browser = None
+                if self._active.get(browser) == 0:
+                    await self._close_browser(browser)
+
+            if self._browser is None:
+                if self._playwright is None:
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+                self._active[self._browser] = 0
+                self._uses = 0
+                logger.info("Launched pooled browser")
+
+            self._uses += 1
+            self._active[self._browser] += 1
+            return self._browser
+
+    async def _release_browser(self, browser: Browser) -> None:
+        async with self._lock:
+            pages = self._active.get(browser)
+            if pages is None:
+                return  # Already closed by close()
+            self._active[browser] = pages - 1
+            if browser is not self._browser and pages == 1:
+                await self._close_browser(browser)
+
+    async def _close_browser(self, browser: Browser) -> None:
+        self._active.pop(browser, None)
+        self._unhealthy.discard(browser)
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser: {e}")
+
+    async def _block_unneeded(self, route: Route) -> None:
+        request = route.request
+        if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @asynccontextmanager
+    async def page(self, user_agent: str = USER_AGENT) -> AsyncIterator[Page]:
+        """
+        Borrow a page in a fresh, isolated browser context.
+
+        Waits while ``max_pages`` pages are in use. Routes added to the page
+        should call ``route.fallback()`` so resource blocking still applies.
+
+        Args:
+            user_agent: User agent of the context
+
+        Yields:
+            Page, closed together with its context on exit
+        """
+        async with self._semaphore:
+            browser = await self._acquire_browser()
+            context = None
+            try:
+                context = await browser.new_context(user_agent=user_agent)
+                await context.route("**/*", self._block_unneeded)
+                page = await context.new_page()
+                page.on("crash", lambda _: self._unhealthy.add(browser))
+                yield page
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        logger.debug(f"Error closing browser context: {e}")
+                await self._release_browser(browser)
+
+    async def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        async with self._lock:
+            for browser in list(self._active):
+                await self._close_browser(browser)
+            self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
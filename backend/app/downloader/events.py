@@ -0,0 +1,101 @@
+"""In-process publish/subscribe of job events (status changes, progress)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Optional
+
+
+class JobEventBus:
+    """
+    Fan-out of job events to subscribers in this process.
+
+    ``publish`` may be called from any thread (yt-dlp progress hooks run in
+    worker threads); delivery always happens on the event loop. Slow
+    subscribers lose their oldest events rather than blocking publishers.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        """
+        Initialize event bus.
+
+        Args:
+            max_queue_size: Events buffered per subscriber
+        """
+        self.max_queue_size = max_queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """
+        Subscribe to events for a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Queue receiving event dicts; pass it to unsubscribe() when done
+        """
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers[job_id].add(queue)
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        """
+        Remove a subscription.
+
+        Args:
+            job_id: Job ID
+            queue: Queue returned by subscribe()
+        """
+        with self._lock:
+            queues = self._subscribers.get(job_id)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[job_id]
+
+    def has_subscribers(self, job_id: str) -> bool:
+        """Check if anyone is listening for a job."""
+        return bool(self._subscribers.get(job_id))
+
+    def publish(self, job_id: str, event: str, data: dict) -> None:
+        """
+        Publish an event to all subscribers of a job.
+
+        Args:
+            job_id: Job ID
+            event: Event name ("status" or "progress")
+            data: Event payload
+        """
+        if not self._subscribers.get(job_id) or self._loop is None:
+            return
+        message = {"event": event, "data": data}
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._deliver(job_id, message)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, job_id, message)
+
+    def _deliver(self, job_id: str, message: dict) -> None:
+        with self._lock:
+            queues = list(self._subscribers.get(job_id, ()))
+        for queue in queues:
+            if queue.full():
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(message)
+
+
+job_events = JobEventBus()
@@ -0,0 +1,109 @@
+"""Hedged execution of alternative strategies."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Optional, Sequence, TypeVar
+
+from loguru import logger
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class Strategy(Generic[T]):
+    """A named way of producing a result; returning None or raising means it failed."""
+
+    name: str
+    run: Callable[[], Awaitable[Optional[T]]]
+
+
+class AllStrategiesFailed(Exception):
+    """Raised when every strategy failed."""
+
+    def __init__(self, errors: dict[str, str]):
+        details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        super().__init__(f"All strategies failed ({details})")
+        self.errors = errors
+
+
+async def run_hedged(
+    strategies: Sequence[Strategy[T]],
+    hedge_delay: float,
+    on_outcome: Optional[Callable[[str, bool, float], None]] = None,
+) -> tuple[str, T]:
+    """
+    Run strategies as a hedged race and return the first success.
+
+    The first strategy starts immediately. Whenever ``hedge_delay`` passes
+    without a result, the next strategy is started alongside the running
+    ones; when a strategy fails, the next one starts right away. The first
+    success wins and every other running strategy is cancelled (strategies
+    must release their browser pages or child processes on cancellation).
+    Cancelled strategies report no outcome.
+
+    Args:
+        strategies: Strategies in order of preference
+        hedge_delay: Seconds to wait for a result before starting the next strategy
+        on_outcome: Optional callback(name, success, seconds) for every finished strategy
+
+    Returns:
+        (name of the winning strategy, its result)
+
+    Raises:
+        AllStrategiesFailed: If no strategy succeeded
+    """
+    pending = list(strategies)
+    running: dict[asyncio.Task, Strategy[T]] = {}
+    launched: dict[str, float] = {}
+    errors: dict[str, str] = {}
+    started = time.monotonic()
+
+    def launch() -> None:
+        strategy = pending.pop(0)
+        launched[strategy.name] = time.monotonic()
+        running[asyncio.create_task(strategy.run(), name=f"strategy:{strategy.name}")] = strategy
+
+    def report(strategy: Strategy[T], success: bool) -> None:
+        if on_outcome:
+            on_outcome(strategy.name, success, time.monotonic() - launched[strategy.name])
+
+    launch()
+    try:
+        while running:
+            done, _ = await asyncio.wait(
+                running, timeout=hedge_delay if pending else None, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.info(f"No result after {hedge_delay}s, hedging with {pending[0].name}")
+                launch()
+                continue
+
+            for task in done:
+                strategy = running.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    errors[strategy.name] = str(e) or type(e).__name__
+                    logger.warning(f"Strategy {strategy.name} failed: {errors[strategy.name]}")
+                    report(strategy, False)
+                    continue
+                if result is None:
+                    errors[strategy.name] = "no result"
+                    logger.warning(f"Strategy {strategy.name} returned no result")
+                    report(strategy, False)
+                    continue
+                report(strategy, True)
+                logger.info(f"Strategy {strategy.name} won after {time.monotonic() - started:.2f}s")
+                return strategy.name, result
+
+            if pending:
+                launch()
+        raise AllStrategiesFailed(errors)
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,449 @@
+"""Native HLS downloads: playlist parsing and concurrent segment fetching."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional, Union
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from loguru import logger
+
+from .progress import ProgressCallback
+from .streaming import DownloadTooLarge
+
+
+# Retries per segment before the download fails
+SEGMENT_RETRIES = 4
+ATTRIBUTE_REGEX = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+AUDIO_CODEC_PREFIXES = ("mp4a", "ac-3", "ec-3", "opus", "flac", "mp3")
+
+
+class HlsNotSupported(Exception):
+    """Raised for streams the native engine does not handle (live, encrypted, or byte ranges without Range support)."""
+
+
+@dataclass
+class HlsSegment:
+    """One media segment (or initialization section) of a media playlist."""
+
+    url: str
+    duration: float = 0.0
+    byterange: Optional[tuple[int, int]] = None  # (offset, length)
+    init: Optional["HlsSegment"] = None  # EXT-X-MAP in effect for this segment
+
+
+@dataclass
+class MediaPlaylist:
+    """Media playlist: the ordered segments of one rendition."""
+
+    url: str
+    segments: list[HlsSegment] = field(default_factory=list)
+    ended: bool = False  # EXT-X-ENDLIST seen (VOD, not live)
+    encrypted: bool = False
+
+    @property
+    def duration(self) -> float:
+        return sum(segment.duration for segment in self.segments)
+
+
+@dataclass
+class Variant:
+    """EXT-X-STREAM-INF entry of a master playlist."""
+
+    url: str
+    bandwidth: int = 0
+    codecs: str = ""
+    audio_group: Optional[str] = None
+
+    @property
+    def has_audio_codec(self) -> bool:
+        return any(codec.strip().startswith(AUDIO_CODEC_PREFIXES) for codec in self.codecs.split(","))
+
+    @property
+    def is_audio_only(self) -> bool:
+        codecs = [codec.strip() for codec in self.codecs.split(",") if codec.strip()]
+        return bool(codecs) and all(codec.startswith(AUDIO_CODEC_PREFIXES) for codec in codecs)
+
+
+@dataclass
+class Rendition:
+    """EXT-X-MEDIA entry of a master playlist."""
+
+    type: str
+    group_id: str
+    url: Optional[str] = None  # None when the audio is muxed into the variants
+    name: str = ""
+    default: bool = False
+    autoselect: bool = False
+
+
+@dataclass
+class MasterPlaylist:
+    """Master playlist: variants and alternative renditions."""
+
+    url: str
+    variants: list[Variant] = field(default_factory=list)
+    renditions: list[Rendition] = field(default_factory=list)
+
+
+@dataclass
+class HlsDownload:
+    """Concatenated segment files of a downloaded HLS stream."""
+
+    paths: list[str]  # Video (or muxed) stream first, separate audio rendition second
+    duration: float
+    size: int
+
+
+def _attributes(line: str) -> dict[str, str]:
+    values = line.split(":", 1)[1] if ":" in line else ""
+    return {key: value.strip('"') for key, value in ATTRIBUTE_REGEX.findall(values)}
+
+
+def _byterange(value: str, next_offset: int) -> tuple[int, int]:
+    length, _, offset = value.partition("@")
+    return (int(offset) if offset else next_offset, int(length))
+
+
+def parse_playlist(text: str, url: str) -> Union[MasterPlaylist, MediaPlaylist]:
+    """
+    Parse an M3U8 playlist.
+
+    Args:
+        text: Playlist body
+        url: Final URL of the playlist, relative URIs are resolved against it
+
+    Returns:
+        MasterPlaylist if it lists variants, otherwise MediaPlaylist
+
+    Raises:
+        ValueError: If the body is not an M3U8 playlist
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines or not lines[0].startswith("#EXTM3U"):
+        raise ValueError("Not an HLS playlist")
+
+    if any(line.startswith("#EXT-X-STREAM-INF") for line in lines):
+        master = MasterPlaylist(url=url)
+        pending: Optional[dict[str, str]] = None
+        for line in lines[1:]:
+            if line.startswith("#EXT-X-STREAM-INF"):
+                pending = _attributes(line)
+            elif line.startswith("#EXT-X-MEDIA:"):
+                attributes = _attributes(line)
+                master.renditions.append(
+                    Rendition(
+                        type=attributes.get("TYPE", ""),
+                        group_id=attributes.get("GROUP-ID", ""),
+                        url=urljoin(url, attributes["URI"]) if attributes.get("URI") else None,
+                        name=attributes.get("NAME", ""),
+                        default=attributes.get("DEFAULT") == "YES",
+                        autoselect=attributes.get("AUTOSELECT") == "YES",
+                    )
+                )
+            elif not line.startswith("#") and pending is not None:
+                master.variants.append(
+                    Variant(
+                        url=urljoin(url, line),
+                        bandwidth=int(pending.get("BANDWIDTH") or 0),
+                        codecs=pending.get("CODECS", ""),
+                        audio_group=pending.get("AUDIO"),
+                    )
+                )
+                pending = None
+        return master
+
+    playlist = MediaPlaylist(url=url)
+    duration = 0.0
+    byterange: Optional[tuple[int, int]] = None
+    init: Optional[HlsSegment] = None
+    next_offset = 0
+    for line in lines[1:]:
+        if line.startswith("#EXTINF:"):
+            duration = float(line[len("#EXTINF:") :].split(",", 1)[0] or 0)
+        elif line.startswith("#EXT-X-BYTERANGE:"):
+            byterange = _byterange(line.split(":", 1)[1], next_offset)
+        elif line.startswith("#EXT-X-MAP:"):
+            attributes = _attributes(line)
+            init = HlsSegment(
+                url=urljoin(url, attributes["URI"]),
+                byterange=_byterange(attributes["BYTERANGE"], 0) if attributes.get("BYTERANGE") else None,
+            )
+        elif line.startswith("#EXT-X-KEY:"):
+            if _attributes(line).get("METHOD", "NONE") != "NONE":
+                playlist.encrypted = True
+        elif line.startswith("#EXT-X-ENDLIST"):
+            playlist.ended = True
+        elif not line.startswith("#"):
+            playlist.segments.append(HlsSegment(urljoin(url, line), duration, byterange, init))
+            next_offset = byterange[0] + byterange[1] if byterange else 0
+            duration = 0.0
+            byterange = None
+    return playlist
+
+
+async def fetch_playlist(client: httpx.AsyncClient, url: str) -> Union[MasterPlaylist, MediaPlaylist]:
+    """Download and parse a playlist."""
+    response = await client.get(url, follow_redirects=True)
+    response.raise_for_status()
+    return parse_playlist(response.text, str(response.url))
+
+
+def select_streams(master: MasterPlaylist, output_type: str) -> tuple[str, Optional[str]]:
+    """
+    Choose the playlists to download from a master playlist.
+
+    For audio, the best audio rendition is used: the default entry of the
+    audio group attached to the highest-bandwidth variant. Without separate
+    renditions an audio-only variant is preferred, else the lowest-bandwidth
+    variant carrying audio (muxed audio is usually shared by all variants).
+    For video, the highest-bandwidth variant is used, plus its audio
+    rendition when the audio is not muxed.
+
+    Args:
+        master: Parsed master playlist
+        output_type: "audio" or "video"
+
+    Returns:
+        (main playlist URL, separate audio playlist URL or None)
+    """
+    if not master.variants:
+        raise ValueError("Master playlist has no variants")
+    variants = sorted(master.variants, key=lambda variant: variant.bandwidth, reverse=True)
+
+    def audio_rendition(group: Optional[str]) -> Optional[str]:
+        candidates = [
+            rendition
+            for rendition in master.renditions
+            if rendition.type == "AUDIO" and rendition.url and (group is None or rendition.group_id == group)
+        ]
+        candidates.sort(key=lambda rendition: (rendition.default, rendition.autoselect), reverse=True)
+        return candidates[0].url if candidates else None
+
+    if output_type == "audio":
+        for variant in variants:
+            if variant.audio_group and (url := audio_rendition(variant.audio_group)):
+                return url, None
+        if url := audio_rendition(None):
+            return url, None
+        audio_only = [variant for variant in variants if variant.is_audio_only]
+        if audio_only:
+            return audio_only[0].url, None
+        with_audio = [variant for variant in variants if variant.has_audio_codec] or variants
+        return with_audio[-1].url, None
+
+    best = variants[0]
+    return best.url, audio_rendition(best.audio_group) if best.audio_group else None
+
+
+async def resolve_media_playlist(client: httpx.AsyncClient, url: str) -> MediaPlaylist:
+    """
+    Fetch a media playlist and check the native engine can download it.
+
+    Raises:
+        HlsNotSupported: For live (no EXT-X-ENDLIST) or encrypted playlists
+    """
+    playlist = await fetch_playlist(client, url)
+    if isinstance(playlist, MasterPlaylist):
+        raise ValueError(f"Expected a media playlist at {url}")
+    return check_media_playlist(playlist, url)
+
+
+def check_media_playlist(playlist: MediaPlaylist, url: str) -> MediaPlaylist:
+    """
+    Check the native engine can download a parsed media playlist.
+
+    Raises:
+        HlsNotSupported: For live (no EXT-X-ENDLIST) or encrypted playlists
+    """
+    if not playlist.ended:
+        raise HlsNotSupported("Live HLS playlist")
+    if playlist.encrypted:
+        raise HlsNotSupported("Encrypted HLS playlist")
+    if not playlist.segments:
+        raise ValueError(f"Media playlist {url} has no segments")
+    return playlist
+
+
+async def _fetch_segment(client: httpx.AsyncClient, segment: HlsSegment) -> bytes:
+    """
+    Fetch one segment, retrying transient failures with backoff.
+
+    Raises:
+        HlsNotSupported: If the server ignores Range on a byte-range segment
+            (fetching the whole file per segment would cost quadratic bandwidth)
+    """
+    headers = {}
+    if segment.byterange:
+        offset, length = segment.byterange
+        headers["Range"] = f"bytes={offset}-{offset + length - 1}"
+    attempt = 0
+    while True:
+        try:
+            async with client.stream("GET", segment.url, headers=headers, follow_redirects=True) as response:
+                response.raise_for_status()
+                if segment.byterange and response.status_code != 206:
+                    raise HlsNotSupported("Server ignores Range requests for byte-range segments")
+                return await response.aread()
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            if attempt == SEGMENT_RETRIES or (status is not None and status < 500 and status not in (408, 429)):
+                raise
+            await asyncio.sleep(min(0.5 * 2**attempt, 8.0))
+            attempt += 1
+
+
+async def download_segments(
+    client: httpx.AsyncClient,
+    playlist: MediaPlaylist,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    max_bytes: Optional[int] = None,
+    concurrency: int = 8,
+    done_before: float = 0.0,
+    total_duration: Optional[float] = None,
+) -> int:
+    """
+    Fetch all segments concurrently and concatenate them in order.
+
+    A sliding window of ``concurrency`` segments is in flight; segments are
+    appended to ``<path>.part`` as soon as all earlier ones are written, so at
+    most one window of segments is held in memory. Initialization sections
+    (EXT-X-MAP) are written before the first segment that uses them.
+
+    Args:
+        client: HTTP client
+        playlist: Media playlist to download
+        path: Destination of the concatenated stream
+        progress: Optional callback for download progress
+        max_bytes: Abort once the stream exceeds this many bytes (None/0 disables)
+        concurrency: Segments fetched in parallel
+        done_before: Seconds of media already downloaded (for combined progress)
+        total_duration: Seconds of media across all playlists being downloaded
+
+    Returns:
+        Bytes written
+
+    Raises:
+        DownloadTooLarge: If the stream exceeds max_bytes
+    """
+    segments = playlist.segments
+    total_duration = total_duration or playlist.duration
+    part_path = f"{path}.part"
+    tasks: dict[int, asyncio.Task] = {}
+    written = 0
+    seconds = done_before
+    current_init: Optional[HlsSegment] = None
+
+    def schedule(index: int) -> None:
+        if index < len(segments) and index not in tasks:
+            tasks[index] = asyncio.create_task(_fetch_segment(client, segments[index]))
+
+    f = open(part_path, "wb")
+    try:
+        for index in range(min(concurrency, len(segments))):
+            schedule(index)
+        for index, segment in enumerate(segments):
+            schedule(index + concurrency)
+            if segment.init is not None and segment.init != current_init:
+                current_init = segment.init
+                init_data = await _fetch_segment(client, segment.init)
+                await asyncio.to_thread(f.write, init_data)
+                written += len(init_data)
+            data = await tasks.pop(index)
+            written += len(data)
+            if max_bytes and written > max_bytes:
+                raise DownloadTooLarge(max_bytes)
+            await asyncio.to_thread(f.write, data)
+            seconds += segment.duration
+            if progress:
+                percent = seconds * 100.0 / total_duration if total_duration else (index + 1) * 100.0 / len(segments)
+                progress("downloading", written, None, min(percent, 100.0))
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        f.close()
+        os.remove(part_path)
+        raise
+    f.close()
+    os.replace(part_path, path)
+    return written
+
+
+def _segment_extension(playlist: MediaPlaylist) -> str:
+    if playlist.segments[0].init is not None:
+        return ".mp4"
+    extension = os.path.splitext(urlparse(playlist.segments[0].url).path)[1].lower()
+    return extension if extension in (".ts", ".aac", ".ac3", ".mp3", ".m4s", ".mp4") else ".ts"
+
+
+async def download_hls(
+    client: httpx.AsyncClient,
+    url: str,
+    output_dir: str,
+    name: str,
+    output_type: str,
+    progress: Optional[ProgressCallback] = None,
+    max_bytes: Optional[int] = None,
+    concurrency: int = 8,
+) -> HlsDownload:
+    """
+    Download an HLS stream natively, leaving the remux/transcode to the caller.
+
+    Args:
+        client: HTTP client
+        url: Master or media playlist URL
+        output_dir: Directory for the concatenated streams
+        name: Base file name (e.g. the job ID)
+        output_type: "audio" or "video", drives rendition selection
+        progress: Optional callback for download progress
+        max_bytes: Abort once the streams exceed this many bytes (None/0 disables)
+        concurrency: Segments fetched in parallel
+
+    Returns:
+        HlsDownload with one concatenated file per selected playlist
+
+    Raises:
+        HlsNotSupported: For live or encrypted streams
+    """
+    playlist = await fetch_playlist(client, url)
+    if isinstance(playlist, MasterPlaylist):
+        main_url, audio_url = select_streams(playlist, output_type)
+        playlists = [await resolve_media_playlist(client, main_url)]
+        if audio_url:
+            playlists.append(await resolve_media_playlist(client, audio_url))
+    else:
+        playlists = [check_media_playlist(playlist, url)]
+
+    total_duration = sum(media.duration for media in playlists)
+    logger.info(
+        f"Downloading HLS stream: {sum(len(media.segments) for media in playlists)} segments, "
+        f"{total_duration:.0f} s, {concurrency} in parallel"
+    )
+    if progress:
+        progress("downloading", 0, None, 0.0)
+
+    paths: list[str] = []
+    size = 0
+    done_before = 0.0
+    try:
+        for index, media in enumerate(playlists):
+            suffix = "_audio" if index else ""
+            path = os.path.join(output_dir, f"{name}{suffix}.hls{_segment_extension(media)}")
+            remaining = max(max_bytes - size, 1) if max_bytes else None
+            size += await download_segments(
+                client, media, path, progress, remaining, concurrency, done_before, total_duration
+            )
+            paths.append(path)
+            done_before += media.duration
+    except BaseException:
+        for path in paths:
+            os.remove(path)
+        raise
+
+    return HlsDownload(paths=paths, duration=playlists[0].duration, size=size)
@@ -0,0 +1,182 @@
+"""Application-wide pooled HTTP clients shared by download providers."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from typing import Callable, Optional
+
+import httpx
+from loguru import logger
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that releases a per-host slot once closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper capping concurrent requests per host.
+
+    httpx only limits connections per pool, so a few large downloads from one
+    CDN could take every connection. A request holds its host's slot until the
+    response body is closed; waiting for a slot counts against no timeout.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, semaphores: dict[str, asyncio.Semaphore], per_host: int):
+        """
+        Initialize transport.
+
+        Args:
+            transport: Transport performing the requests
+            semaphores: Per-host semaphores, shared between transports
+            per_host: Concurrent requests allowed per host
+        """
+        self._transport = transport
+        self._semaphores = semaphores
+        self._per_host = per_host
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._per_host)
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClientPool:
+    """
+    Pooled HTTP clients opened at startup and shared by all providers.
+
+    ``client`` negotiates HTTP/2, so requests to a host (e.g. googlevideo.com)
+    multiplex over one warm connection. ``bulk_client`` stays on HTTP/1.1 for
+    parallel range requests, where each segment needs its own TCP connection
+    to get its own share of per-connection throttled bandwidth. Both keep
+    connections alive between downloads and share the per-host limit.
+    """
+
+    def __init__(
+        self,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_connections_per_host: int = 16,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        pool_timeout: float = 60.0,
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            http2: Negotiate HTTP/2 on the default client (requires the h2 package)
+            max_connections: Connections per client
+            max_keepalive_connections: Idle connections kept open per client
+            keepalive_expiry: Seconds an idle connection is kept
+            max_connections_per_host: Concurrent requests per host across both clients
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for each chunk of a response (also used for writes)
+            pool_timeout: Seconds to wait for a free connection
+        """
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("h2 is not installed, the shared HTTP client falls back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout, read=read_timeout, write=read_timeout, pool=pool_timeout
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._bulk_client: Optional[httpx.AsyncClient] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "HttpClientPool":
+        """Build a pool from application settings."""
+        return cls(
+            http2=settings.http_http2,
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+            max_connections_per_host=settings.http_max_connections_per_host,
+            connect_timeout=settings.http_connect_timeout_seconds,
+            read_timeout=settings.http_read_timeout_seconds,
+            pool_timeout=settings.http_pool_timeout_seconds,
+        )
+
+    def _build_client(self, http2: bool) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(http2=http2, limits=self.limits)
+        return httpx.AsyncClient(
+            transport=HostLimitedTransport(transport, self._semaphores, self.max_connections_per_host),
+            timeout=self.timeout,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None
+
+    async def open(self) -> None:
+        """Create the clients (call from the running event loop)."""
+        if self.is_open:
+            return
+        self._client = self._build_client(self.http2)
+        self._bulk_client = self._build_client(False)
+        logger.info(f"HTTP client pool opened (HTTP/2: {self.http2})")
+
+    async def close(self) -> None:
+        """Close the clients and all their connections."""
+        clients = [client for client in (self._client, self._bulk_client) if client is not None]
+        self._client = None
+        self._bulk_client = None
+        self._semaphores.clear()
+        for client in clients:
+            await client.aclose()
+        if clients:
+            logger.info("HTTP client pool closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client for single requests and streams."""
+        if self._client is None:
+            raise RuntimeError("HTTP client pool is not open")
+        return self._client
+
+    @property
+    def bulk_client(self) -> httpx.AsyncClient:
+        """Shared HTTP/1.1 client for parallel range requests."""
+        if self._bulk_client is None:
+            raise RuntimeError("HTTP client pool is not open")
+        return self._bulk_client
@@ -2,16 +2,49 @@
 
 from __future__ import annotations
 
+import base64
+import bisect
+import hashlib
 import json
 import os
+import threading
+import time
 import uuid
-from datetime import datetime
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, NamedTuple, Optional
 
 from loguru import logger
 from pydantic import BaseModel, Field
 
+from .events import job_events
+
+
+# Provider name of batch parent jobs; they are never queued themselves
+BATCH_PROVIDER = "batch"
+
+
+def encode_cursor(job: DownloadJob) -> str:
+    """Opaque pagination cursor pointing just after a job in newest-first order."""
+    raw = json.dumps([job.created_at, job.job_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """
+    Decode a cursor from encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, job_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    return str(created_at), str(job_id)
+
 
 class DownloadJob(BaseModel):
     """Download job model."""
@@ -19,33 +52,35 @@ class DownloadJob(BaseModel):
     job_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     url: str
     provider: str
-    status: str = "pending"  # pending, running, completed, failed
+    media_key: Optional[str] = None  # Provider-canonical media id used for dedup
+    status: str = "pending"  # pending, running, completed, failed, expired (media evicted)
     output_path: Optional[str] = None
     output_type: str = "audio"  # audio or video
+    priority: int = 0  # Higher runs first
+    parent_id: Optional[str] = None  # Batch job this job was created for
     metadata: dict = Field(default_factory=dict)
+    progress: dict = Field(default_factory=dict)  # Latest DownloadProgress snapshot
     created_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     error_message: Optional[str] = None
+    owner: Optional[str] = None  # Download queue running the job
+    lease_expires_at: Optional[float] = None  # Epoch seconds; a running job past this is re-queued
 
 
-class JobStore:
-    """Manages job storage as JSON files."""
-
-    def __init__(self, jobs_dir: str = "storage/jobs"):
-        """
-        Initialize job store.
-
-        Args:
-            jobs_dir: Directory to store job JSON files
-        """
-        self.jobs_dir = Path(jobs_dir)
-        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+class BaseJobStore(ABC):
+    """Base class for job storage backends."""
 
-    def _get_job_path(self, job_id: str) -> Path:
-        """Get file path for a job."""
-        return self.jobs_dir / f"{job_id}.json"
-
-    def create_job(self, url: str, provider: str, output_type: str = "audio") -> DownloadJob:
+    def create_job(
+        self,
+        url: str,
+        provider: str,
+        output_type: str = "audio",
+        media_key: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        priority: int = 0,
+        parent_id: Optional[str] = None,
+        status: str = "pending",
+    ) -> DownloadJob:
         """
         Create a new download job.
 
@@ -53,6 +88,11 @@ class JobStore:
             url: URL to download
             provider: Provider name
             output_type: "audio" or "video"
+            media_key: Canonical media key from the provider
+            metadata: Initial job metadata
+            priority: Queue priority (higher runs first)
+            parent_id: Batch job this job belongs to
+            status: Initial status
 
         Returns:
             Created DownloadJob
@@ -61,31 +101,28 @@ class JobStore:
             job_id=str(uuid.uuid4()),
             url=url,
             provider=provider,
+            media_key=media_key,
             output_type=output_type,
-            status="pending",
+            status=status,
+            metadata=metadata or {},
+            priority=priority,
+            parent_id=parent_id,
         )
         self.save_job(job)
         logger.info(f"Created job {job.job_id} for {url}")
         return job
 
+    @abstractmethod
     def save_job(self, job: DownloadJob) -> None:
         """
-        Save job to disk (atomic write).
+        Persist a job, refreshing its updated_at timestamp.
 
         Args:
             job: Job to save
         """
-        job.updated_at = datetime.utcnow().isoformat()
-        job_path = self._get_job_path(job.job_id)
-
-        # Atomic write: write to temp file, then rename
-        temp_path = job_path.with_suffix(".tmp")
-        with open(temp_path, "w") as f:
-            json.dump(job.model_dump(), f, indent=2)
-
-        temp_path.replace(job_path)
-        logger.debug(f"Saved job {job.job_id}")
+        pass
 
+    @abstractmethod
     def get_job(self, job_id: str) -> Optional[DownloadJob]:
         """
         Get job by ID.
@@ -96,21 +133,12 @@ class JobStore:
         Returns:
             DownloadJob or None if not found
         """
-        job_path = self._get_job_path(job_id)
-        if not job_path.exists():
-            return None
-
-        try:
-            with open(job_path, "r") as f:
-                data = json.load(f)
-            return DownloadJob(**data)
-        except Exception as e:
-            logger.error(f"Error reading job {job_id}: {e}")
-            return None
+        pass
 
+    @abstractmethod
     def find_job_by_url(self, url: str) -> Optional[DownloadJob]:
         """
-        Find existing job for a URL.
+        Find an existing completed job for a URL.
 
         Args:
             url: URL to search for
@@ -118,16 +146,165 @@ class JobStore:
         Returns:
             DownloadJob or None if not found
         """
-        for job_file in self.jobs_dir.glob("*.json"):
-            try:
-                with open(job_file, "r") as f:
-                    data = json.load(f)
-                job = DownloadJob(**data)
-                if job.url == url and job.status == "completed":
-                    return job
-            except Exception:
-                continue
-        return None
+        pass
+
+    @abstractmethod
+    def find_job_by_media_key(
+        self,
+        media_key: str,
+        output_type: Optional[str] = None,
+        statuses: Iterable[str] = ("completed",),
+    ) -> Optional[DownloadJob]:
+        """
+        Find the most recent job for a canonical media key.
+
+        Args:
+            media_key: Canonical media key from the provider
+            output_type: "audio" or "video", or None to match either
+            statuses: Job statuses that count as a match
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        pass
+
+    @abstractmethod
+    def reserve(self, key: str, ttl_seconds: float) -> bool:
+        """
+        Take a short-lived reservation on a key, shared by all processes.
+
+        Used to close the race between a dedup lookup and create_job. Expired
+        reservations are taken over.
+
+        Args:
+            key: Reservation key
+            ttl_seconds: Reservation lifetime
+
+        Returns:
+            True if the reservation was taken, False if someone else holds it
+        """
+        pass
+
+    @abstractmethod
+    def release(self, key: str) -> None:
+        """
+        Release a reservation taken with reserve().
+
+        Args:
+            key: Reservation key
+        """
+        pass
+
+    @abstractmethod
+    def find_jobs_by_status(self, status: str) -> list[DownloadJob]:
+        """
+        Find all jobs with a given status.
+
+        Args:
+            status: Job status
+
+        Returns:
+            List of matching jobs
+        """
+        pass
+
+    @abstractmethod
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        provider: Optional[str] = None,
+        output_type: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[DownloadJob], Optional[str]]:
+        """
+        List jobs newest first with optional filters.
+
+        Args:
+            status: Only jobs with this status
+            provider: Only jobs from this provider
+            output_type: Only jobs with this output type
+            created_from: Only jobs created at or after this ISO timestamp
+            created_to: Only jobs created before this ISO timestamp
+            limit: Maximum number of jobs to return
+            cursor: ``next_cursor`` from the previous page
+
+        Returns:
+            (jobs, next_cursor) where next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        pass
+
+    @abstractmethod
+    def delete_jobs_before(self, updated_before: str, statuses: Iterable[str]) -> int:
+        """
+        Delete jobs in the given statuses last updated before a timestamp.
+
+        Args:
+            updated_before: ISO timestamp (UTC)
+            statuses: Job statuses eligible for deletion
+
+        Returns:
+            Number of jobs deleted
+        """
+        pass
+
+    def claim_job(
+        self, job_id: str, owner: Optional[str] = None, lease_seconds: float = 0
+    ) -> Optional[DownloadJob]:
+        """
+        Atomically move a pending job to running.
+
+        Args:
+            job_id: Job ID
+            owner: Identifier of the claiming download queue
+            lease_seconds: How long the claim holds without renewal (0 for no lease)
+
+        Returns:
+            The running job, or None if it is missing or no longer pending
+        """
+        key = f"claim:{job_id}"
+        if not self.reserve(key, ttl_seconds=30):
+            return None
+        try:
+            job = self.get_job(job_id)
+            if not job or job.status != "pending":
+                return None
+            job.status = "running"
+            job.owner = owner
+            job.lease_expires_at = time.time() + lease_seconds if lease_seconds > 0 else None
+            self.save_job(job)
+            logger.info(f"Updated job {job_id} to status running")
+            job_events.publish(job_id, "status", {"status": "running"})
+            return job
+        finally:
+            self.release(key)
+
+    def update_fields(self, job_id: str, **fields) -> bool:
+        """
+        Set top-level fields of a job and persist them, refreshing updated_at.
+
+        The default reads, modifies and saves the whole record; backends
+        override it to write only the changed fields.
+
+        Args:
+            job_id: Job ID
+            **fields: DownloadJob field values
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        job = self.get_job(job_id)
+        if not job:
+            return False
+        for name, value in fields.items():
+            setattr(job, name, value)
+        self.save_job(job)
+        return True
 
     def update_job_status(
         self,
@@ -150,23 +327,551 @@ class JobStore:
         Returns:
             True if job was updated, False if not found
         """
-        job = self.get_job(job_id)
-        if not job:
-            return False
-
-        job.status = status
+        fields: dict = {"status": status}
         if output_path:
-            job.output_path = output_path
-        if metadata:
-            job.metadata.update(metadata)
+            fields["output_path"] = output_path
         if error_message:
-            job.error_message = error_message
+            fields["error_message"] = error_message
+        if metadata:
+            job = self.get_job(job_id)
+            if not job:
+                return False
+            fields["metadata"] = {**job.metadata, **metadata}
 
-        self.save_job(job)
+        if not self.update_fields(job_id, **fields):
+            return False
         logger.info(f"Updated job {job_id} to status {status}")
+        job_events.publish(job_id, "status", {"status": status})
         return True
 
+    def release_expired_job(self, job_id: str, now: Optional[float] = None) -> bool:
+        """
+        Move a running job whose lease expired back to pending.
+
+        Jobs without a lease (claimed before leases existed) count as expired.
+
+        Args:
+            job_id: Job ID
+            now: Current epoch time (defaults to time.time())
+
+        Returns:
+            True if the job was reset, False if it is held, gone or not running
+        """
+        key = f"claim:{job_id}"
+        if not self.reserve(key, ttl_seconds=30):
+            return False
+        try:
+            job = self.get_job(job_id)
+            now = time.time() if now is None else now
+            if not job or job.status != "running" or (job.lease_expires_at or 0) > now:
+                return False
+            self.update_fields(job_id, status="pending", owner=None, lease_expires_at=None)
+            logger.info(f"Updated job {job_id} to status pending")
+            job_events.publish(job_id, "status", {"status": "pending"})
+            return True
+        finally:
+            self.release(key)
+
+    def update_job_progress(self, job_id: str, progress: dict) -> bool:
+        """
+        Persist the latest progress snapshot of a job.
+
+        Args:
+            job_id: Job ID
+            progress: DownloadProgress snapshot
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        return self.update_fields(job_id, progress=progress)
+
+
+class _IndexEntry(NamedTuple):
+    url: str
+    status: str
+    media_key: Optional[str]
+    provider: str
+    output_type: str
+    created_at: str
+    mtime_ns: int
+
+
+class JobStore(BaseJobStore):
+    """
+    Manages job storage as JSON files.
+
+    An in-memory index (url, media key, status and provider -> job ids, plus
+    all jobs ordered by creation time) is built at startup and kept current on
+    every save, so lookups never scan the directory. Records are stored as
+    compact JSON; reads are decoded from a bounded LRU of serialized records.
+    File and directory mtimes are checked so writes made by other processes
+    are picked up.
+    """
+
+    def __init__(self, jobs_dir: str = "storage/jobs", cache_size: int = 1024):
+        """
+        Initialize job store.
+
+        Args:
+            jobs_dir: Directory to store job JSON files
+            cache_size: Maximum number of serialized jobs kept in memory
+        """
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+
+        self._lock = threading.RLock()
+        self._url_index: dict[str, set[str]] = defaultdict(set)
+        self._status_index: dict[str, set[str]] = defaultdict(set)
+        self._media_index: dict[str, set[str]] = defaultdict(set)
+        self._provider_index: dict[str, set[str]] = defaultdict(set)
+        # Sorted (created_at, job_id) of every indexed job
+        self._created_order: list[tuple[str, str]] = []
+        # job_id -> indexed fields of the version on disk
+        self._entries: dict[str, _IndexEntry] = {}
+        # job_id -> serialized record of the indexed version
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._dir_mtime_ns = -1
+        self._refresh_index()
+
+    def _get_job_path(self, job_id: str) -> Path:
+        """Get file path for a job."""
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _read_job_file(self, job_path: Path) -> tuple[DownloadJob, bytes]:
+        data = job_path.read_bytes()
+        return DownloadJob.model_validate_json(data), data
+
+    def _index_job(self, job: DownloadJob, data: bytes, mtime_ns: int, ordered: bool = True) -> None:
+        """
+        Add or replace a job in the indexes and the cache.
+
+        With ordered=False the caller must add the job to the creation-time
+        order itself (used to rebuild it in one sort after a full scan).
+        """
+        self._unindex_job(job.job_id)
+        self._entries[job.job_id] = _IndexEntry(
+            job.url, job.status, job.media_key, job.provider, job.output_type, job.created_at, mtime_ns
+        )
+        self._url_index[job.url].add(job.job_id)
+        self._status_index[job.status].add(job.job_id)
+        self._provider_index[job.provider].add(job.job_id)
+        if job.media_key:
+            self._media_index[job.media_key].add(job.job_id)
+        if ordered:
+            bisect.insort(self._created_order, (job.created_at, job.job_id))
+
+        self._cache[job.job_id] = data
+        self._cache.move_to_end(job.job_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _unindex_job(self, job_id: str) -> None:
+        entry = self._entries.pop(job_id, None)
+        self._cache.pop(job_id, None)
+        if entry is None:
+            return
+        for index, key in (
+            (self._url_index, entry.url),
+            (self._status_index, entry.status),
+            (self._media_index, entry.media_key),
+            (self._provider_index, entry.provider),
+        ):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(job_id)
+                if not ids:
+                    del index[key]
+
+        key = (entry.created_at, job_id)
+        position = bisect.bisect_left(self._created_order, key)
+        if position < len(self._created_order) and self._created_order[position] == key:
+            del self._created_order[position]
+
+    def _refresh_index(self) -> None:
+        """
+        Re-sync the index with the directory if it changed since the last sync.
+
+        Only a single stat is needed when nothing changed. Otherwise files are
+        stat'ed and only new or modified ones are parsed.
+        """
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(self.jobs_dir).st_mtime_ns
+            except FileNotFoundError:
+                return
+            if dir_mtime_ns == self._dir_mtime_ns:
+                return
+
+            seen = set()
+            changed: list[str] = []
+            with os.scandir(self.jobs_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    job_id = entry.name[: -len(".json")]
+                    seen.add(job_id)
+                    try:
+                        mtime_ns = entry.stat().st_mtime_ns
+                        indexed = self._entries.get(job_id)
+                        if indexed is not None and indexed.mtime_ns == mtime_ns:
+                            continue
+                        job, data = self._read_job_file(Path(entry.path))
+                        self._index_job(job, data, mtime_ns, ordered=False)
+                        changed.append(job_id)
+                    except Exception as e:
+                        logger.warning(f"Skipping unreadable job file {entry.name}: {e}")
+
+            for job_id in set(self._entries) - seen:
+                self._unindex_job(job_id)
+
+            # Insert a few changes in place, re-sort after a bulk (startup) scan
+            if len(changed) > 64:
+                self._created_order = sorted((entry.created_at, job_id) for job_id, entry in self._entries.items())
+            else:
+                for job_id in changed:
+                    bisect.insort(self._created_order, (self._entries[job_id].created_at, job_id))
+            self._dir_mtime_ns = dir_mtime_ns
+
+    def save_job(self, job: DownloadJob) -> None:
+        """
+        Save job to disk (atomic write).
+
+        Args:
+            job: Job to save
+        """
+        job.updated_at = datetime.utcnow().isoformat()
+        job_path = self._get_job_path(job.job_id)
+        data = job.model_dump_json().encode("utf-8")
+
+        with self._lock:
+            # Pick up other writers first so our own write does not mask their changes
+            self._refresh_index()
+            synced = os.stat(self.jobs_dir).st_mtime_ns == self._dir_mtime_ns
+
+            # Atomic write: write to temp file, then rename
+            temp_path = job_path.with_suffix(".tmp")
+            temp_path.write_bytes(data)
+
+            temp_path.replace(job_path)
+            self._index_job(job, data, os.stat(job_path).st_mtime_ns)
+            # Only skip the next rescan if no other writer touched the directory
+            # since the refresh; otherwise their change must still be picked up
+            if synced:
+                self._dir_mtime_ns = os.stat(self.jobs_dir).st_mtime_ns
+        logger.debug(f"Saved job {job.job_id}")
+
+    def update_fields(self, job_id: str, **fields) -> bool:
+        """
+        Set top-level fields of a job and persist them, refreshing updated_at.
+
+        Args:
+            job_id: Job ID
+            **fields: DownloadJob field values
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        # Read-modify-write under the store lock so concurrent updates from
+        # worker threads (progress hooks) do not overwrite each other
+        with self._lock:
+            return super().update_fields(job_id, **fields)
+
+    def get_job(self, job_id: str) -> Optional[DownloadJob]:
+        """
+        Get job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        job_path = self._get_job_path(job_id)
+        with self._lock:
+            try:
+                mtime_ns = os.stat(job_path).st_mtime_ns
+            except FileNotFoundError:
+                self._unindex_job(job_id)
+                return None
+
+            cached = self._cache.get(job_id)
+            entry = self._entries.get(job_id)
+            if cached is not None and entry is not None and entry.mtime_ns == mtime_ns:
+                self._cache.move_to_end(job_id)
+                return DownloadJob.model_validate_json(cached)
+
+            try:
+                job, data = self._read_job_file(job_path)
+            except Exception as e:
+                logger.error(f"Error reading job {job_id}: {e}")
+                return None
+            self._index_job(job, data, mtime_ns)
+            return job
+
+    def find_job_by_url(self, url: str) -> Optional[DownloadJob]:
+        """
+        Find the most recent completed job for a URL.
+
+        Args:
+            url: URL to search for
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        best: Optional[DownloadJob] = None
+        with self._lock:
+            self._refresh_index()
+            candidates = self._url_index.get(url, set()) & self._status_index.get("completed", set())
+            for job_id in candidates:
+                job = self.get_job(job_id)
+                if (
+                    job
+                    and job.url == url
+                    and job.status == "completed"
+                    and (best is None or job.created_at > best.created_at)
+                ):
+                    best = job
+        return best
+
+    def find_job_by_media_key(
+        self,
+        media_key: str,
+        output_type: Optional[str] = None,
+        statuses: Iterable[str] = ("completed",),
+    ) -> Optional[DownloadJob]:
+        """
+        Find the most recent job for a canonical media key.
+
+        Args:
+            media_key: Canonical media key from the provider
+            output_type: "audio" or "video", or None to match either
+            statuses: Job statuses that count as a match
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        statuses = set(statuses)
+        best: Optional[DownloadJob] = None
+        with self._lock:
+            self._refresh_index()
+            # Bounded by the jobs for this media key; get_job may re-index, so iterate a copy
+            for job_id in list(self._media_index.get(media_key, ())):
+                entry = self._entries.get(job_id)
+                if entry is None or entry.status not in statuses:
+                    continue
+                job = self.get_job(job_id)
+                if (
+                    job
+                    and job.media_key == media_key
+                    and job.status in statuses
+                    and (output_type is None or job.output_type == output_type)
+                    and (best is None or job.created_at > best.created_at)
+                ):
+                    best = job
+        return best
+
+    def _reservation_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.jobs_dir / ".reservations" / f"{digest}.lock"
+
+    def reserve(self, key: str, ttl_seconds: float) -> bool:
+        """
+        Take a short-lived reservation on a key using an exclusive lock file.
+
+        Args:
+            key: Reservation key
+            ttl_seconds: Reservation lifetime
+
+        Returns:
+            True if the reservation was taken, False if someone else holds it
+        """
+        path = self._reservation_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.stat(path).st_mtime <= ttl_seconds:
+                        return False
+                    # Holder died or overran its TTL; take the reservation over
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+        return False
+
+    def release(self, key: str) -> None:
+        """
+        Release a reservation taken with reserve().
+
+        Args:
+            key: Reservation key
+        """
+        try:
+            os.remove(self._reservation_path(key))
+        except FileNotFoundError:
+            pass
+
+    def find_jobs_by_status(self, status: str) -> list[DownloadJob]:
+        """
+        Find all jobs with a given status.
+
+        Args:
+            status: Job status
+
+        Returns:
+            List of matching jobs
+        """
+        with self._lock:
+            self._refresh_index()
+            jobs = [self.get_job(job_id) for job_id in list(self._status_index.get(status, ()))]
+        return [job for job in jobs if job and job.status == status]
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        provider: Optional[str] = None,
+        output_type: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[DownloadJob], Optional[str]]:
+        """
+        List jobs newest first with optional filters.
+
+        Served from the in-memory index: when a status/provider filter selects
+        a sparse subset only that subset is sorted, otherwise the creation-time
+        order is walked backwards. Only returned jobs are read from disk.
+
+        Args:
+            status: Only jobs with this status
+            provider: Only jobs from this provider
+            output_type: Only jobs with this output type
+            created_from: Only jobs created at or after this ISO timestamp
+            created_to: Only jobs created before this ISO timestamp
+            limit: Maximum number of jobs to return
+            cursor: ``next_cursor`` from the previous page
+
+        Returns:
+            (jobs, next_cursor) where next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        def matches(key: tuple[str, str]) -> bool:
+            entry = self._entries.get(key[1])
+            return (
+                entry is not None
+                and (status is None or entry.status == status)
+                and (provider is None or entry.provider == provider)
+                and (output_type is None or entry.output_type == output_type)
+                and (created_from is None or key[0] >= created_from)
+            )
+
+        with self._lock:
+            self._refresh_index()
+
+            subsets = [
+                index.get(value, set())
+                for index, value in ((self._status_index, status), (self._provider_index, provider))
+                if value is not None
+            ]
+            upper = [key for key in (after, (created_to, "") if created_to else None) if key]
+            bound = min(upper) if upper else None
+
+            smallest = min(subsets, key=len) if subsets else None
+            # Walking visits about limit * total / len(smallest) keys; sorting costs len(smallest)
+            if smallest is not None and len(smallest) ** 2 < (limit + 1) * len(self._created_order):
+                keys = [(self._entries[job_id].created_at, job_id) for job_id in smallest]
+                keys.sort(reverse=True)
+                candidates = (key for key in keys if bound is None or key < bound)
+            else:
+                end = bisect.bisect_left(self._created_order, bound) if bound else len(self._created_order)
+                candidates = (self._created_order[i] for i in range(end - 1, -1, -1))
+
+            keys = []
+            for key in candidates:
+                if created_from is not None and key[0] < created_from:
+                    break
+                if matches(key):
+                    keys.append(key)
+                    if len(keys) > limit:
+                        break
+
+            jobs = [self.get_job(job_id) for _, job_id in keys[:limit]]
+
+        jobs = [job for job in jobs if job]
+        next_cursor = encode_cursor(jobs[-1]) if len(keys) > limit and jobs else None
+        return jobs, next_cursor
+
+    def delete_jobs_before(self, updated_before: str, statuses: Iterable[str]) -> int:
+        """
+        Delete jobs in the given statuses last updated before a timestamp.
+
+        File mtimes pre-filter candidates so only old job files are parsed.
+
+        Args:
+            updated_before: ISO timestamp (UTC)
+            statuses: Job statuses eligible for deletion
+
+        Returns:
+            Number of jobs deleted
+        """
+        cutoff_ns = int(datetime.fromisoformat(updated_before).replace(tzinfo=timezone.utc).timestamp() * 1e9)
+        deleted = 0
+        with self._lock:
+            self._refresh_index()
+            # Collect only the old files first: get_job and _unindex_job mutate the status sets
+            candidates = [
+                job_id
+                for status in set(statuses)
+                for job_id in self._status_index.get(status, ())
+                if self._entries[job_id].mtime_ns < cutoff_ns
+            ]
+            for job_id in candidates:
+                job = self.get_job(job_id)
+                if not job or job.status not in statuses or job.updated_at >= updated_before:
+                    continue
+                try:
+                    self._get_job_path(job_id).unlink()
+                except FileNotFoundError:
+                    pass
+                self._unindex_job(job_id)
+                deleted += 1
+        return deleted
+
+    def iter_jobs(self) -> Iterator[DownloadJob]:
+        """
+        Iterate over every readable job on disk.
+
+        Yields:
+            DownloadJob for each job file
+        """
+        for job_file in self.jobs_dir.glob("*.json"):
+            try:
+                yield self._read_job_file(job_file)[0]
+            except Exception as e:
+                logger.warning(f"Skipping unreadable job file {job_file.name}: {e}")
+
 
+def create_job_store() -> BaseJobStore:
+    """
+    Create the job store selected by ``settings.job_store_backend``.
 
+    Returns:
+        JSON file store (default) or SQLite store
+    """
+    from ..core.config import get_settings
 
+    settings = get_settings()
+    if settings.job_store_backend == "sqlite":
+        from .sqlite_store import SQLiteJobStore
 
+        return SQLiteJobStore(settings.job_store_sqlite_path)
+    return JobStore(settings.job_store_jobs_dir, cache_size=settings.job_store_cache_size)
@@ -0,0 +1,189 @@
+"""Content-addressed storage of job outputs with hardlink deduplication."""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import time
+from typing import Optional
+
+from loguru import logger
+
+
+BLOB_DIR = ".blobs"
+INDEX_DIR = "index"  # Inside BLOB_DIR: media key -> blob entries
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaStore:
+    """
+    Stores each distinct output once under ``<media_dir>/.blobs/<aa>/<sha256><ext>``.
+
+    A job's output (``<media_dir>/<job_id><ext>``, the path that is served)
+    is a hardlink to its blob, so any number of jobs with identical content
+    share one copy on disk. The inode's link count is the reference count:
+    a blob whose count drops to 1 is referenced by no job and is removed by
+    the storage manager. An index maps media key and output type to the
+    blob, so a new job for media that is still stored is completed by
+    linking instead of downloading.
+
+    On filesystems without hardlinks outputs are kept as plain files.
+    """
+
+    def __init__(self, media_dir: str):
+        """
+        Initialize media store.
+
+        Args:
+            media_dir: Directory holding job outputs (blobs live below it, on the same filesystem)
+        """
+        self.media_dir = media_dir
+        self.blob_dir = os.path.join(media_dir, BLOB_DIR)
+        self.index_dir = os.path.join(self.blob_dir, INDEX_DIR)
+
+    def _blob_path(self, digest: str, ext: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}{ext}")
+
+    def _index_path(self, media_key: str, output_type: str) -> str:
+        name = hashlib.sha256(f"{media_key}|{output_type}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.index_dir, f"{name}.json")
+
+    def ingest(
+        self,
+        path: str,
+        media_key: Optional[str] = None,
+        output_type: Optional[str] = None,
+        metadata: Optional[dict] = None,
+    ) -> str:
+        """
+        Move a finished output into the store, replacing it with a hardlink to its blob.
+
+        If a blob with the same content exists, the output's own copy is
+        dropped. Blocking (hashes the file); run it in a thread.
+
+        Args:
+            path: Output file of a completed job
+            media_key: Media key to index the blob under
+            output_type: Output type to index the blob under
+            metadata: Job metadata stored with the index entry
+
+        Returns:
+            The output path (unchanged; it now shares the blob's inode)
+        """
+        ext = os.path.splitext(path)[1]
+        digest = file_digest(path)
+        blob = self._blob_path(digest, ext)
+        os.makedirs(os.path.dirname(blob), exist_ok=True)
+        try:
+            try:
+                os.link(path, blob)
+                logger.info(f"Stored blob {digest[:12]} for {os.path.basename(path)}")
+            except FileExistsError:
+                if not os.path.samefile(path, blob) and os.path.getsize(path) == os.path.getsize(blob):
+                    temp_path = f"{path}.link"
+                    os.link(blob, temp_path)
+                    os.replace(temp_path, path)
+                    logger.info(f"Deduplicated {os.path.basename(path)} against blob {digest[:12]}")
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+            logger.warning(f"Hardlinks unavailable ({e}), keeping {path} as a plain file")
+            return path
+
+        if media_key and output_type:
+            self._write_index(media_key, output_type, blob, metadata or {})
+        return path
+
+    def _write_index(self, media_key: str, output_type: str, blob: str, metadata: dict) -> None:
+        path = self._index_path(media_key, output_type)
+        os.makedirs(self.index_dir, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"blob": os.path.relpath(blob, self.blob_dir), "metadata": metadata}, f)
+        os.replace(temp_path, path)
+
+    def lookup(self, media_key: str, output_type: str) -> Optional[tuple[str, dict]]:
+        """
+        Find the stored blob for a media key and output type.
+
+        Args:
+            media_key: Media key
+            output_type: "audio" or "video"
+
+        Returns:
+            (blob path, metadata of the job that stored it), or None
+        """
+        path = self._index_path(media_key, output_type)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        blob = os.path.join(self.blob_dir, entry["blob"])
+        if not os.path.exists(blob):
+            self._discard(path)
+            return None
+        return blob, entry.get("metadata") or {}
+
+    def link(self, blob: str, job_id: str) -> str:
+        """
+        Give a job its output by hardlinking an existing blob.
+
+        Args:
+            blob: Blob path from lookup()
+            job_id: Job receiving the output
+
+        Returns:
+            Output path of the job
+
+        Raises:
+            FileNotFoundError: If the blob was removed in the meantime
+        """
+        output_path = os.path.join(self.media_dir, f"{job_id}{os.path.splitext(blob)[1]}")
+        os.link(blob, output_path)
+        # Links share the blob's inode, so this counts as an access of every job using it
+        stat = os.stat(output_path)
+        os.utime(output_path, ns=(time.time_ns(), stat.st_mtime_ns))
+        return output_path
+
+    def prune_index(self) -> int:
+        """
+        Remove index entries whose blob no longer exists.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        try:
+            names = os.listdir(self.index_dir)
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            path = os.path.join(self.index_dir, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    blob = os.path.join(self.blob_dir, json.load(f)["blob"])
+            except (OSError, ValueError, KeyError):
+                continue
+            if not os.path.exists(blob):
+                self._discard(path)
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
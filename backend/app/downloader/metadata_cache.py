@@ -0,0 +1,113 @@
+"""Cache of metadata-only extractions, keyed by canonical media key."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from ..core.config import get_settings
+
+
+class MetadataCache:
+    """
+    Bounded in-process LRU of yt-dlp info dicts with a TTL.
+
+    Signed stream URLs in the info expire, so the TTL must stay below their
+    lifetime (a few hours on YouTube). Concurrent lookups of the same media
+    key share one extraction.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 1800):
+        """
+        Initialize metadata cache.
+
+        Args:
+            max_entries: Maximum number of info dicts kept
+            ttl_seconds: Lifetime of an entry
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def get(self, media_key: str) -> Optional[dict]:
+        """Return the cached info for a media key, or None if missing/expired."""
+        entry = self._entries.get(media_key)
+        if entry is None:
+            return None
+        stored_at, info = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[media_key]
+            return None
+        self._entries.move_to_end(media_key)
+        return info
+
+    def age(self, media_key: str) -> Optional[float]:
+        """Seconds since the entry for a media key was stored, or None if not cached."""
+        entry = self._entries.get(media_key)
+        return time.monotonic() - entry[0] if entry else None
+
+    def put(self, media_key: str, info: dict) -> None:
+        """Store an info dict, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        self._entries[media_key] = (time.monotonic(), info)
+        self._entries.move_to_end(media_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, media_key: str) -> None:
+        """Drop the entry for a media key (e.g. after its stream URLs were rejected)."""
+        self._entries.pop(media_key, None)
+
+    async def get_or_extract(self, media_key: str, extract: Callable[[], Awaitable[dict]]) -> tuple[dict, bool]:
+        """
+        Return the cached info or run ``extract`` once and cache its result.
+
+        Args:
+            media_key: Canonical media key
+            extract: Coroutine factory performing the extraction
+
+        Returns:
+            (info, cached) where cached is True if no extraction was needed
+
+        Raises:
+            Whatever ``extract`` raises
+        """
+        info = self.get(media_key)
+        if info is not None:
+            return info, True
+        inflight = self._inflight.get(media_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight), False
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[media_key] = future
+        try:
+            info = await extract()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        else:
+            self.put(media_key, info)
+            future.set_result(info)
+            return info, False
+        finally:
+            del self._inflight[media_key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+
+_settings = get_settings()
+metadata_cache = MetadataCache(
+    max_entries=_settings.media_probe_cache_max_entries,
+    ttl_seconds=_settings.media_probe_cache_ttl_seconds,
+)
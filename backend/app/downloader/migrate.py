@@ -0,0 +1,53 @@
+"""Migrate JSON job files into the SQLite job store.
+
+Usage (from the backend directory):
+
+    python -m app.downloader.migrate --jobs-dir storage/jobs --db storage/jobs.db
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from loguru import logger
+
+from .jobs import JobStore
+from .sqlite_store import SQLiteJobStore
+
+
+def migrate_json_to_sqlite(jobs_dir: str, db_path: str, batch_size: int = 1000) -> int:
+    """
+    Copy every JSON job record into a SQLite job store.
+
+    Records keep their original timestamps; running the migration again
+    replaces rows with the same job_id, so it is safe to repeat.
+
+    Args:
+        jobs_dir: Directory containing ``<job_id>.json`` files
+        db_path: Target SQLite database path
+        batch_size: Rows per transaction
+
+    Returns:
+        Number of jobs migrated
+    """
+    source = JobStore(jobs_dir)
+    target = SQLiteJobStore(db_path)
+    try:
+        count = target.import_jobs(source.iter_jobs(), batch_size=batch_size)
+    finally:
+        target.close()
+    logger.info(f"Migrated {count} jobs from {jobs_dir} to {db_path}")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Migrate JSON download jobs to SQLite")
+    parser.add_argument("--jobs-dir", default="storage/jobs", help="Directory of JSON job files")
+    parser.add_argument("--db", default="storage/jobs.db", help="SQLite database path")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+    args = parser.parse_args()
+    migrate_json_to_sqlite(args.jobs_dir, args.db, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
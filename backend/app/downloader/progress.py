@@ -0,0 +1,139 @@
+"""Download progress reporting."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Callable, Optional, Protocol
+
+from pydantic import BaseModel
+
+from .events import JobEventBus
+
+if TYPE_CHECKING:
+    from .jobs import BaseJobStore
+
+
+class DownloadProgress(BaseModel):
+    """Snapshot of a running download."""
+
+    stage: str  # extracting, downloading, transcoding
+    bytes_done: Optional[int] = None
+    bytes_total: Optional[int] = None
+    percent: Optional[float] = None
+    speed: Optional[float] = None  # bytes per second
+    eta_seconds: Optional[float] = None
+
+
+class ProgressCallback(Protocol):
+    """Callback providers use to report progress."""
+
+    def __call__(
+        self,
+        stage: str,
+        bytes_done: Optional[int] = None,
+        bytes_total: Optional[int] = None,
+        percent: Optional[float] = None,
+    ) -> None: ...
+
+
+class ProgressReporter:
+    """
+    ProgressCallback that publishes to the event bus and persists to the job.
+
+    Speed and ETA are derived per stage. Publishing and persisting are
+    throttled; stage changes and completion of a stage always go through.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        job_store: "BaseJobStore",
+        events: JobEventBus,
+        publish_interval: float = 0.25,
+        persist_interval: float = 2.0,
+    ):
+        """
+        Initialize progress reporter.
+
+        Args:
+            job_id: Job being reported on
+            job_store: Store the latest snapshot is persisted to
+            events: Bus live updates are published to
+            publish_interval: Minimum seconds between published events
+            persist_interval: Minimum seconds between job store writes
+        """
+        self.job_id = job_id
+        self.job_store = job_store
+        self.events = events
+        self.publish_interval = publish_interval
+        self.persist_interval = persist_interval
+
+        self._stage: Optional[str] = None
+        self._stage_started = 0.0
+        self._last_publish = 0.0
+        self._last_persist = 0.0
+
+    def __call__(
+        self,
+        stage: str,
+        bytes_done: Optional[int] = None,
+        bytes_total: Optional[int] = None,
+        percent: Optional[float] = None,
+    ) -> None:
+        now = time.monotonic()
+        stage_changed = stage != self._stage
+        if stage_changed:
+            self._stage = stage
+            self._stage_started = now
+
+        if percent is None and bytes_done is not None and bytes_total:
+            percent = min(100.0, bytes_done * 100.0 / bytes_total)
+        finished = percent is not None and percent >= 100.0
+
+        if not (stage_changed or finished or now - self._last_publish >= self.publish_interval):
+            return
+
+        elapsed = now - self._stage_started
+        speed = bytes_done / elapsed if bytes_done and elapsed > 0 else None
+        eta = None
+        if percent and 0 < percent < 100 and elapsed > 0:
+            eta = elapsed * (100.0 - percent) / percent
+
+        snapshot = DownloadProgress(
+            stage=stage,
+            bytes_done=bytes_done,
+            bytes_total=bytes_total,
+            percent=round(percent, 1) if percent is not None else None,
+            speed=round(speed, 1) if speed is not None else None,
+            eta_seconds=round(eta, 1) if eta is not None else None,
+        ).model_dump()
+
+        self._last_publish = now
+        self.events.publish(self.job_id, "progress", snapshot)
+
+        if stage_changed or finished or now - self._last_persist >= self.persist_interval:
+            self._last_persist = now
+            self.job_store.update_job_progress(self.job_id, snapshot)
+
+
+def ytdlp_progress_hook(progress: ProgressCallback) -> Callable[[dict], None]:
+    """
+    Adapt yt-dlp ``progress_hooks`` updates to a ProgressCallback.
+
+    Args:
+        progress: Callback to forward to
+
+    Returns:
+        Hook function for the yt-dlp ``progress_hooks`` option
+    """
+
+    def hook(update: dict) -> None:
+        total = update.get("total_bytes") or update.get("total_bytes_estimate")
+        total = int(total) if total else None
+        if update.get("status") == "downloading":
+            progress("downloading", update.get("downloaded_bytes"), total)
+        elif update.get("status") == "finished":
+            done = update.get("downloaded_bytes") or total
+            progress("downloading", done, done)
+
+    return hook
@@ -1,22 +1,26 @@
-"""Download providers."""
+"""Download providers.
 
-from .youtube import YouTubeProvider
-from .direct import DirectMediaProvider
-from .tiktok import TikTokProvider
-from .instagram import InstagramProvider
-from .twitter import TwitterProvider
-from .vimeo import VimeoProvider
-
-__all__ = [
-    "YouTubeProvider",
-    "DirectMediaProvider",
-    "TikTokProvider",
-    "InstagramProvider",
-    "TwitterProvider",
-    "VimeoProvider",
-]
+Provider classes are imported on first attribute access, so importing one
+provider (e.g. ``providers.direct``) doesn't pull in the dependencies of the
+others (Playwright for YouTube).
+"""
 
+import importlib
 
+_MODULES = {
+    "YouTubeProvider": ".youtube",
+    "DirectMediaProvider": ".direct",
+    "TikTokProvider": ".tiktok",
+    "InstagramProvider": ".instagram",
+    "TwitterProvider": ".twitter",
+    "VimeoProvider": ".vimeo",
+    "YtDlpProvider": ".ytdlp",
+}
 
+__all__ = list(_MODULES)
 
 
+def __getattr__(name: str):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_MODULES[name], __name__), name)
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
 
-import httpx
 from loguru import logger
 
+from ...core.config import get_settings
+from ...core.ffmpeg_utils import FFmpegError, run_ffmpeg
 from ..base import BaseProvider, DownloadResult
+from ..hls import HlsNotSupported, download_hls
+from ..progress import ProgressCallback
+from ..segmented import download_file
 
 
 class DirectMediaProvider(BaseProvider):
@@ -48,6 +53,7 @@ class DirectMediaProvider(BaseProvider):
         output_dir: str,
         output_type: str = "audio",
         job_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> DownloadResult:
         """Download direct media file."""
         os.makedirs(output_dir, exist_ok=True)
@@ -66,23 +72,29 @@ class DirectMediaProvider(BaseProvider):
 
             # Handle HLS streams (m3u8)
             if ".m3u8" in path or ".m3u" in path:
-                return await self._download_hls_stream(url, output_dir, output_type, job_id)
+                return await self._download_hls_stream(url, output_dir, output_type, job_id, progress)
 
             # Download direct file
             output_file = os.path.join(output_dir, f"{job_id or 'media'}{extension}")
 
-            async with httpx.AsyncClient(timeout=300.0) as client:
+            async with self.http_client(bulk=True) as client:
                 logger.info(f"Downloading direct media from: {url}")
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-
-                with open(output_file, "wb") as f:
-                    async for chunk in response.aiter_bytes():
-                        f.write(chunk)
+                settings = get_settings()
+                streamed = await download_file(
+                    client,
+                    url,
+                    output_file,
+                    progress,
+                    max_bytes=settings.download_max_bytes,
+                    connections=settings.download_connections,
+                    min_segment_size=settings.download_segment_min_bytes,
+                    resume_key=self.canonicalize(url),
+                )
 
             metadata = {
-                "content_type": response.headers.get("content-type", ""),
-                "content_length": response.headers.get("content-length", ""),
+                "content_type": streamed.content_type,
+                "content_length": streamed.size,
+                "sha256": streamed.sha256,
             }
 
             return DownloadResult(
@@ -96,23 +108,95 @@ class DirectMediaProvider(BaseProvider):
             logger.error(f"Direct media download error: {e}")
             return DownloadResult(
                 success=False,
+                output_type=output_type,
                 error_message=f"Failed to download direct media: {str(e)}",
             )
 
     async def _download_hls_stream(
-        self, url: str, output_dir: str, output_type: str, job_id: Optional[str]
+        self,
+        url: str,
+        output_dir: str,
+        output_type: str,
+        job_id: Optional[str],
+        progress: Optional[ProgressCallback] = None,
     ) -> DownloadResult:
-        """Download HLS stream using ffmpeg."""
-        import subprocess
+        """Download an HLS stream: segments fetched concurrently, one ffmpeg pass to remux/transcode."""
+        name = job_id or "stream"
+        output_file = os.path.join(output_dir, f"{name}.wav" if output_type == "audio" else f"{name}.mp4")
+        settings = get_settings()
 
-        output_file = os.path.join(output_dir, f"{job_id or 'stream'}.mp4")
-        if output_type == "audio":
-            output_file = os.path.join(output_dir, f"{job_id or 'stream'}.wav")
+        try:
+            async with self.http_client() as client:
+                stream = await download_hls(
+                    client,
+                    url,
+                    output_dir,
+                    name,
+                    output_type,
+                    progress,
+                    max_bytes=settings.download_max_bytes,
+                    concurrency=settings.download_hls_concurrency,
+                )
+        except HlsNotSupported as e:
+            logger.info(f"{e}, letting ffmpeg read the stream")
+            return await self._download_hls_with_ffmpeg(url, output_file, output_type, progress)
 
+        try:
+            args = []
+            for path in stream.paths:
+                args += ["-i", path]
+            if output_type == "audio":
+                args += ["-vn", "-c:a", "pcm_s16le", "-ar", "16000", "-ac", "1"]
+            elif len(stream.paths) > 1:
+                args += ["-map", "0:v", "-map", "1:a", "-c", "copy"]
+            else:
+                args += ["-c", "copy"]
+            args += ["-y", output_file]
+
+            on_progress = None
+            if progress:
+                progress("transcoding")
+
+                def on_progress(seconds: float, size: int) -> None:
+                    percent = min(100.0, seconds * 100.0 / stream.duration) if stream.duration else None
+                    progress("transcoding", size, None, percent)
+
+            await run_ffmpeg(args, on_progress=on_progress, timeout=600)
+        except asyncio.TimeoutError:
+            return DownloadResult(
+                success=False,
+                output_type=output_type,
+                error_message="Timeout converting HLS stream (max 10 minutes)",
+            )
+        except FFmpegError as e:
+            logger.error(f"HLS conversion failed: {e}")
+            return DownloadResult(
+                success=False,
+                output_type=output_type,
+                error_message=f"Failed to convert HLS stream: {str(e)}",
+            )
+        finally:
+            for path in stream.paths:
+                os.remove(path)
+
+        return DownloadResult(
+            success=True,
+            output_path=output_file,
+            output_type=output_type,
+            metadata={"source": "hls_stream", "duration": stream.duration, "downloaded_bytes": stream.size},
+        )
+
+    async def _download_hls_with_ffmpeg(
+        self,
+        url: str,
+        output_file: str,
+        output_type: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> DownloadResult:
+        """Download a live or encrypted HLS stream with ffmpeg reading the playlist itself."""
         try:
             # Use ffmpeg to download and convert HLS stream
-            cmd = [
-                "ffmpeg",
+            args = [
                 "-i",
                 url,
                 "-c",
@@ -122,12 +206,19 @@ class DirectMediaProvider(BaseProvider):
             ]
 
             if output_type == "audio":
-                cmd.insert(-2, "-ar")
-                cmd.insert(-2, "16000")
-                cmd.insert(-2, "-ac")
-                cmd.insert(-2, "1")
+                args.insert(-2, "-ar")
+                args.insert(-2, "16000")
+                args.insert(-2, "-ac")
+                args.insert(-2, "1")
+
+            on_progress = None
+            if progress:
+                progress("downloading")
+
+                def on_progress(seconds: float, size: int) -> None:
+                    progress("downloading", size)
 
-            subprocess.run(cmd, check=True, capture_output=True, timeout=600)
+            await run_ffmpeg(args, on_progress=on_progress, timeout=600)
 
             return DownloadResult(
                 success=True,
@@ -136,19 +227,16 @@ class DirectMediaProvider(BaseProvider):
                 metadata={"source": "hls_stream"},
             )
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return DownloadResult(
                 success=False,
+                output_type=output_type,
                 error_message="Timeout downloading HLS stream (max 10 minutes)",
             )
-        except subprocess.CalledProcessError as e:
-            logger.error(f"HLS download failed: {e.stderr.decode() if e.stderr else str(e)}")
+        except FFmpegError as e:
+            logger.error(f"HLS download failed: {e}")
             return DownloadResult(
                 success=False,
+                output_type=output_type,
                 error_message=f"Failed to download HLS stream: {str(e)}",
             )
-
-
-
-
-
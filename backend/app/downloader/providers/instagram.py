@@ -1,42 +1,29 @@
-"""Instagram download provider (stub - not implemented yet)."""
+"""Instagram download provider (yt-dlp)."""
 
 from __future__ import annotations
 
-from typing import Optional
+import re
 from urllib.parse import urlparse
 
-from ..base import BaseProvider, DownloadResult
+from .ytdlp import YtDlpProvider
 
 
-class InstagramProvider(BaseProvider):
-    """Instagram provider - not yet implemented."""
+MEDIA_ID_REGEX = re.compile(r"/(?:p|reel|reels|tv)/([A-Za-z0-9_-]+)")
+
+
+class InstagramProvider(YtDlpProvider):
+    """Instagram provider backed by yt-dlp."""
 
     name = "instagram"
+    display_name = "Instagram"
     supported_domains = ["instagram.com", "www.instagram.com"]
 
-    def can_handle(self, url: str) -> bool:
-        """Check if URL is an Instagram URL."""
+    def canonicalize(self, url: str) -> str:
+        """Build a media key from the Instagram post/reel shortcode (instagram:<shortcode>)."""
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname or ""
-            return any(domain in hostname for domain in self.supported_domains)
+            match = MEDIA_ID_REGEX.search(urlparse(url).path)
+            if match:
+                return f"{self.name}:{match.group(1)}"
         except Exception:
-            return False
-
-    async def download(
-        self,
-        url: str,
-        output_dir: str,
-        output_type: str = "audio",
-        job_id: Optional[str] = None,
-    ) -> DownloadResult:
-        """Instagram download not implemented yet."""
-        return DownloadResult(
-            success=False,
-            error_message="Instagram provider is not yet implemented. Please use the 'Upload File' option instead.",
-        )
-
-
-
-
-
+            pass
+        return super().canonicalize(url)
@@ -1,42 +1,29 @@
-"""TikTok download provider (stub - not implemented yet)."""
+"""TikTok download provider (yt-dlp)."""
 
 from __future__ import annotations
 
-from typing import Optional
+import re
 from urllib.parse import urlparse
 
-from ..base import BaseProvider, DownloadResult
+from .ytdlp import YtDlpProvider
 
 
-class TikTokProvider(BaseProvider):
-    """TikTok provider - not yet implemented."""
+MEDIA_ID_REGEX = re.compile(r"/video/(\d+)")
+
+
+class TikTokProvider(YtDlpProvider):
+    """TikTok provider backed by yt-dlp."""
 
     name = "tiktok"
+    display_name = "TikTok"
     supported_domains = ["tiktok.com", "www.tiktok.com", "vm.tiktok.com"]
 
-    def can_handle(self, url: str) -> bool:
-        """Check if URL is a TikTok URL."""
+    def canonicalize(self, url: str) -> str:
+        """Build a media key from the TikTok video id (tiktok:<id>)."""
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname or ""
-            return any(domain in hostname for domain in self.supported_domains)
+            match = MEDIA_ID_REGEX.search(urlparse(url).path)
+            if match:
+                return f"{self.name}:{match.group(1)}"
         except Exception:
-            return False
-
-    async def download(
-        self,
-        url: str,
-        output_dir: str,
-        output_type: str = "audio",
-        job_id: Optional[str] = None,
-    ) -> DownloadResult:
-        """TikTok download not implemented yet."""
-        return DownloadResult(
-            success=False,
-            error_message="TikTok provider is not yet implemented. Please use the 'Upload File' option instead.",
-        )
-
-
-
-
-
+            pass
+        return super().canonicalize(url)
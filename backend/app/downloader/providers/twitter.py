@@ -1,42 +1,29 @@
-"""Twitter/X download provider (stub - not implemented yet)."""
+"""Twitter/X download provider (yt-dlp)."""
 
 from __future__ import annotations
 
-from typing import Optional
+import re
 from urllib.parse import urlparse
 
-from ..base import BaseProvider, DownloadResult
+from .ytdlp import YtDlpProvider
 
 
-class TwitterProvider(BaseProvider):
-    """Twitter/X provider - not yet implemented."""
+MEDIA_ID_REGEX = re.compile(r"/status(?:es)?/(\d+)")
+
+
+class TwitterProvider(YtDlpProvider):
+    """Twitter/X provider backed by yt-dlp."""
 
     name = "twitter"
+    display_name = "Twitter/X"
     supported_domains = ["twitter.com", "www.twitter.com", "x.com", "www.x.com"]
 
-    def can_handle(self, url: str) -> bool:
-        """Check if URL is a Twitter/X URL."""
+    def canonicalize(self, url: str) -> str:
+        """Build a media key from the tweet id (twitter:<id>)."""
         try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname or ""
-            return any(domain in hostname for domain in self.supported_domains)
+            match = MEDIA_ID_REGEX.search(urlparse(url).path)
+            if match:
+                return f"{self.name}:{match.group(1)}"
         except Exception:
-            return False
-
-    async def download(
-        self,
-        url: str,
-        output_dir: str,
-        output_type: str = "audio",
-        job_id: Optional[str] = None,
-    ) -> DownloadResult:
-        """Twitter/X download not implemented yet."""
-        return DownloadResult(
-            success=False,
-            error_message="Twitter/X provider is not yet implemented. Please use the 'Upload File' option instead.",
-        )
-
-
-
-
-
+            pass
+        return super().canonicalize(url)
@@ -4,16 +4,53 @@ from __future__ import annotations
 
 import asyncio
 import os
-import subprocess
-import tempfile
-from pathlib import Path
-from typing import Optional
-from urllib.parse import urlparse
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlunparse
 
+import httpx
 from loguru import logger
-from playwright.async_api import async_playwright, Browser, Page, TimeoutError as PlaywrightTimeout
 
+from ...core.config import get_settings
+from ...core.ffmpeg_utils import FFmpegError, run_ffmpeg
+from ...core.ytdlp_process import YtDlpProcessError, extract_info, select_format, ytdlp_pool
 from ..base import BaseProvider, DownloadResult
+from ..browser_pool import BrowserPool
+from ..hedging import AllStrategiesFailed, Strategy, run_hedged
+from ..metadata_cache import metadata_cache
+from ..progress import ProgressCallback, ytdlp_progress_hook
+from ..strategy_stats import StrategyStats, strategy_stats, url_domain
+from ..streaming import stream_url_chunks
+
+
+VIDEO_ID_REGEX = re.compile(r"[A-Za-z0-9_-]{11}")
+# Query parameters the player adds to fetch a stream piece by piece
+RANGE_PARAMS = {"range", "rn", "rbuf"}
+# yt-dlp formats that resolve to a single URL ffmpeg can read
+YTDLP_AUDIO_FORMAT = "bestaudio/best"
+YTDLP_VIDEO_FORMAT = "best[vcodec!=none][acodec!=none]/best"
+YTDLP_OPTIONS = {
+    "noplaylist": True,
+    "extractor_args": {"youtube": {"player_client": ["mweb", "ios", "android", "web"]}},
+}
+
+
+def _strip_range_params(url: str) -> str:
+    """Drop the byte-range parameters the player adds, so the URL serves the whole stream."""
+    parsed = urlparse(url)
+    query = [(key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True) if key not in RANGE_PARAMS]
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+@dataclass
+class ResolvedStreams:
+    """Stream URLs found by one extractor."""
+
+    video_url: Optional[str]
+    audio_url: Optional[str]
+    metadata: dict
+    headers: dict[str, str] = field(default_factory=dict)
 
 
 class YouTubeProvider(BaseProvider):
@@ -27,14 +64,35 @@ class YouTubeProvider(BaseProvider):
         "youtu.be",
     ]
 
-    def can_handle(self, url: str) -> bool:
-        """Check if URL is a YouTube URL."""
+    def __init__(self, browser_pool: Optional[BrowserPool] = None, stats: Optional[StrategyStats] = None):
+        """
+        Initialize provider.
+
+        Args:
+            browser_pool: Browser pool for extraction (created from settings if omitted)
+            stats: Extractor statistics (the shared instance if omitted)
+        """
+        self.browser_pool = browser_pool or BrowserPool.from_settings(get_settings())
+        self.stats = stats or strategy_stats
+
+    def canonicalize(self, url: str) -> str:
+        """Build a media key from the YouTube video id (youtube:<id>)."""
         try:
             parsed = urlparse(url)
-            hostname = parsed.hostname or ""
-            return any(domain in hostname for domain in self.supported_domains)
+            hostname = (parsed.hostname or "").lower()
+            segments = [segment for segment in parsed.path.split("/") if segment]
+            video_id = None
+            if hostname.endswith("youtu.be") and segments:
+                video_id = segments[0]
+            elif segments and segments[0] == "watch":
+                video_id = (parse_qs(parsed.query).get("v") or [None])[0]
+            elif len(segments) >= 2 and segments[0] in ("shorts", "embed", "live", "v"):
+                video_id = segments[1]
+            if video_id and VIDEO_ID_REGEX.fullmatch(video_id):
+                return f"{self.name}:{video_id}"
         except Exception:
-            return False
+            pass
+        return super().canonicalize(url)
 
     async def download(
         self,
@@ -42,198 +100,340 @@ class YouTubeProvider(BaseProvider):
         output_dir: str,
         output_type: str = "audio",
         job_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
     ) -> DownloadResult:
         """
-        Download YouTube video/audio using Playwright.
+        Download YouTube video/audio.
 
         Strategy:
-        1. Launch headless browser
-        2. Navigate to YouTube URL
-        3. Wait for page to load and media to be available
-        4. Extract media stream URLs from network requests or page state
-        5. Download using httpx or Playwright's request API
-        6. Process with ffmpeg if needed
+        1. Pick the stream from formats cached by a probe or earlier extraction,
+           otherwise resolve the stream URLs with a hedged race of extractors
+           (pooled browser and yt-dlp in a child process, ranked by recent
+           success; extractors with an open circuit breaker are skipped)
+        2. Stream the media through the shared HTTP client into ffmpeg
+        3. If streaming fails, let yt-dlp download the media itself
         """
         os.makedirs(output_dir, exist_ok=True)
         output_file = os.path.join(output_dir, f"{job_id or 'youtube'}.mp4")
+        if progress:
+            progress("extracting")
 
-        try:
-            async with async_playwright() as p:
-                # Launch browser
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        extractor = "metadata_cache"
+        streams = await self._resolve_from_cache(url, output_type)
+        if streams is None:
+            domain = url_domain(url)
+            strategies = {strategy.name: strategy for strategy in self._resolve_strategies(url, output_type)}
+            ordered = [strategies[name] for name in self.stats.order(self.name, domain, list(strategies))]
+
+            def on_outcome(name: str, success: bool, seconds: float) -> None:
+                self.stats.record(self.name, domain, name, success, seconds)
+
+            try:
+                extractor, streams = await run_hedged(
+                    ordered, get_settings().youtube_hedge_delay_seconds, on_outcome
                 )
-                page = await context.new_page()
-
-                # Intercept network requests to capture media URLs
-                media_urls = []
-                video_url = None
-                audio_url = None
-
-                async def handle_route(route):
-                    """Intercept network requests to find media streams."""
-                    request = route.request
-                    url = request.url
-
-                    # Look for video/audio streams
-                    if ".googlevideo.com" in url or "videoplayback" in url:
-                        if "mime=video" in url or "itag=18" in url or "itag=22" in url:
-                            nonlocal video_url
-                            if not video_url:
-                                video_url = url
-                                logger.info(f"Found video stream: {url[:100]}...")
-                        elif "mime=audio" in url or "itag=140" in url:
-                            nonlocal audio_url
-                            if not audio_url:
-                                audio_url = url
-                                logger.info(f"Found audio stream: {url[:100]}...")
-
-                    await route.continue_()
-
-                # Set up route interception
-                await page.route("**/*", handle_route)
-
-                # Navigate to YouTube URL
-                logger.info(f"Navigating to YouTube URL: {url}")
-                await page.goto(url, wait_until="networkidle", timeout=30000)
-
-                # Wait a bit for media to load
-                await asyncio.sleep(3)
-
-                # Try to get video element and extract src
-                try:
-                    video_element = await page.query_selector("video")
-                    if video_element:
-                        src = await video_element.get_attribute("src")
-                        if src:
-                            video_url = src
-                            logger.info("Found video src attribute")
-                except Exception as e:
-                    logger.warning(f"Could not extract video src: {e}")
+            except AllStrategiesFailed as e:
+                logger.error(f"Could not resolve YouTube streams: {e}")
+                return DownloadResult(
+                    success=False,
+                    output_type=output_type,
+                    error_message=f"Could not extract media from YouTube: {e}",
+                )
+        metadata = {**streams.metadata, "extractor": extractor}
 
-                # Try to extract metadata
-                metadata = {}
-                try:
-                    title = await page.title()
-                    metadata["title"] = title.replace(" - YouTube", "").strip()
+        try:
+            # Stream the media straight into ffmpeg, which writes the final file
+            async with self.http_client() as client:
+                if output_type == "video" and streams.video_url:
+                    logger.info("Downloading video stream...")
+                    await self._pipe_to_ffmpeg(
+                        client, streams.video_url, ["-c", "copy"], output_file, progress, streams.headers
+                    )
 
-                    # Try to get duration
-                    try:
-                        duration_text = await page.evaluate(
-                            """() => {
-                                const timeElement = document.querySelector('.ytp-time-duration');
-                                return timeElement ? timeElement.textContent : null;
-                            }"""
-                        )
-                        if duration_text:
-                            # Parse duration (e.g., "10:30" -> 630 seconds)
-                            parts = duration_text.split(":")
-                            if len(parts) == 2:
-                                metadata["duration"] = int(parts[0]) * 60 + int(parts[1])
-                            elif len(parts) == 3:
-                                metadata["duration"] = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-                    except Exception:
-                        pass
-                except Exception as e:
-                    logger.warning(f"Could not extract metadata: {e}")
+                else:
+                    if output_type == "video":
+                        logger.info("Only audio stream available, downloading as audio...")
+                        output_type = "audio"  # Update type since we only got audio
+                    else:
+                        logger.info("Downloading audio stream...")
+                    # WAV at 16kHz mono for Whisper compatibility
+                    output_file = os.path.join(output_dir, f"{job_id or 'audio'}.wav")
+                    await self._pipe_to_ffmpeg(
+                        client,
+                        streams.audio_url,
+                        ["-vn", "-ar", "16000", "-ac", "1"],
+                        output_file,
+                        progress,
+                        streams.headers,
+                    )
+
+            return DownloadResult(
+                success=True,
+                output_path=output_file,
+                output_type=output_type,
+                metadata=metadata,
+            )
 
-                await browser.close()
+        except Exception as e:
+            logger.warning(f"Streaming from {extractor} URLs failed: {e}, falling back to yt-dlp")
+            metadata_cache.discard(self.canonicalize(url))
+            return await self._fallback_to_ytdlp(url, output_dir, output_type, job_id, progress)
 
-                # Download the media
-                if not video_url and not audio_url:
-                    # Fallback to yt-dlp if Playwright fails
-                    logger.warning("Playwright failed to extract URLs, falling back to yt-dlp")
-                    return await self._fallback_to_ytdlp(url, output_dir, output_type, job_id)
+    def _resolve_strategies(self, url: str, output_type: str) -> list[Strategy[ResolvedStreams]]:
+        """
+        Build the extractors raced by ``download``, in configured order of preference.
 
-                # Download video or audio
-                import httpx
+        Args:
+            url: YouTube URL
+            output_type: "audio" or "video"
 
-                async with httpx.AsyncClient(timeout=300.0) as client:
-                    if output_type == "video" and video_url:
-                        # Download video
-                        logger.info("Downloading video stream...")
-                        response = await client.get(video_url, follow_redirects=True)
-                        response.raise_for_status()
+        Returns:
+            Strategies for run_hedged
+        """
+        strategies = [Strategy("playwright", lambda: self._resolve_with_browser(url, output_type))]
+        cookies_file = get_settings().youtube_cookies_file
+        if cookies_file and os.path.exists(cookies_file):
+            strategies.append(
+                Strategy("ytdlp_cookies", lambda: self._resolve_with_ytdlp(url, output_type, cookies_file))
+            )
+        strategies.append(Strategy("ytdlp", lambda: self._resolve_with_ytdlp(url, output_type)))
+        return strategies
+
+    async def _resolve_with_browser(self, url: str, output_type: str) -> Optional[ResolvedStreams]:
+        """Resolve stream URLs from the player's network requests (None if none were seen)."""
+        video_url, audio_url, metadata = await self._extract_stream_urls(url, output_type)
+        if not video_url and not audio_url:
+            return None
+        if output_type == "audio" and not audio_url:
+            # Progressive streams carry audio; ffmpeg drops the video track
+            audio_url = video_url
+        return ResolvedStreams(video_url, audio_url, metadata)
+
+    def ytdlp_options(self) -> dict:
+        """yt-dlp options for probes: mobile player clients first, cookies if configured."""
+        options = dict(YTDLP_OPTIONS)
+        cookies_file = get_settings().youtube_cookies_file
+        if cookies_file and os.path.exists(cookies_file):
+            options["cookiefile"] = cookies_file
+        return options
+
+    async def _resolve_from_cache(self, url: str, output_type: str) -> Optional[ResolvedStreams]:
+        """
+        Select the stream from cached yt-dlp formats, skipping a new extraction.
 
-                        with open(output_file, "wb") as f:
-                            f.write(response.content)
+        Args:
+            url: YouTube URL
+            output_type: "audio" or "video"
 
-                        # Convert to mp4 if needed
-                        final_file = await self._convert_to_mp4(output_file, output_dir, job_id)
-                        if final_file != output_file:
-                            os.remove(output_file)
-                            output_file = final_file
+        Returns:
+            Resolved stream, or None if nothing usable is cached
+        """
+        info = metadata_cache.get(self.canonicalize(url))
+        if info is None:
+            return None
+        options = {**self.ytdlp_options(), "format": self._ytdlp_format(output_type)}
+        try:
+            selected = await select_format(info, options, timeout=get_settings().youtube_ytdlp_timeout_seconds)
+            streams = self._streams_from_info(selected, output_type)
+        except Exception as e:
+            logger.warning(f"Cached formats unusable, extracting again: {e}")
+            return None
+        logger.info("Using cached formats")
+        return streams
+
+    async def _resolve_with_ytdlp(
+        self, url: str, output_type: str, cookies_file: Optional[str] = None
+    ) -> ResolvedStreams:
+        """
+        Resolve a single stream URL with yt-dlp in a killable child process.
 
-                    elif output_type == "audio" and audio_url:
-                        # Download audio
-                        logger.info("Downloading audio stream...")
-                        response = await client.get(audio_url, follow_redirects=True)
-                        response.raise_for_status()
+        The extracted info is cached for probes and later downloads.
 
-                        temp_audio = os.path.join(output_dir, f"{job_id or 'temp'}_audio.webm")
-                        with open(temp_audio, "wb") as f:
-                            f.write(response.content)
+        Args:
+            url: YouTube URL
+            output_type: "audio" or "video"
+            cookies_file: Optional cookies.txt passed to yt-dlp
 
-                        # Convert to audio format (wav for Whisper compatibility)
-                        output_file = await self._convert_to_audio(temp_audio, output_dir, job_id)
-                        os.remove(temp_audio)
+        Returns:
+            Resolved stream (progressive audio+video for video, best audio otherwise)
+        """
+        options = {**YTDLP_OPTIONS, "format": self._ytdlp_format(output_type)}
+        if cookies_file:
+            options["cookiefile"] = cookies_file
+        info = await extract_info(url, options, timeout=get_settings().youtube_ytdlp_timeout_seconds)
+        streams = self._streams_from_info(info, output_type)
+        metadata_cache.put(self.canonicalize(url), info)
+        return streams
+
+    @staticmethod
+    def _ytdlp_format(output_type: str) -> str:
+        return YTDLP_VIDEO_FORMAT if output_type == "video" else YTDLP_AUDIO_FORMAT
+
+    @staticmethod
+    def _streams_from_info(info: dict, output_type: str) -> ResolvedStreams:
+        """Build the resolved stream from a yt-dlp info dict after format selection."""
+        if not info.get("url"):
+            raise YtDlpProcessError("yt-dlp returned no direct stream URL")
+
+        metadata = {"title": info.get("title")}
+        if info.get("duration"):
+            metadata["duration"] = float(info["duration"])
+        stream_url = info["url"]
+        return ResolvedStreams(
+            video_url=stream_url if output_type == "video" else None,
+            audio_url=stream_url,
+            metadata=metadata,
+            headers=info.get("http_headers") or {},
+        )
+
+    async def _extract_stream_urls(self, url: str, output_type: str) -> tuple[Optional[str], Optional[str], dict]:
+        """
+        Load the watch page and capture the googlevideo stream URLs the player requests.
 
-                    elif output_type == "video" and audio_url:
-                        # Only audio available, download as audio
-                        logger.info("Only audio stream available, downloading as audio...")
-                        response = await client.get(audio_url, follow_redirects=True)
-                        response.raise_for_status()
+        Returns as soon as the stream needed for ``output_type`` is seen (the
+        first audio stream for audio), or after the extraction timeout with
+        whatever was captured.
 
-                        temp_audio = os.path.join(output_dir, f"{job_id or 'temp'}_audio.webm")
-                        with open(temp_audio, "wb") as f:
-                            f.write(response.content)
+        Args:
+            url: YouTube URL
+            output_type: "audio" or "video"
 
-                        output_file = await self._convert_to_audio(temp_audio, output_dir, job_id)
-                        os.remove(temp_audio)
-                        output_type = "audio"  # Update type since we only got audio
+        Returns:
+            (video stream URL, audio stream URL, metadata)
+        """
+        settings = get_settings()
+        video_url = None
+        audio_url = None
+        found = asyncio.Event()
+
+        async def handle_route(route):
+            """Intercept network requests to find media streams."""
+            nonlocal video_url, audio_url
+            request_url = route.request.url
+
+            # Look for video/audio streams
+            if ".googlevideo.com" in request_url or "videoplayback" in request_url:
+                if "mime=video" in request_url or "itag=18" in request_url or "itag=22" in request_url:
+                    if not video_url:
+                        video_url = _strip_range_params(request_url)
+                        logger.info(f"Found video stream: {request_url[:100]}...")
+                elif "mime=audio" in request_url or "itag=140" in request_url:
+                    if not audio_url:
+                        audio_url = _strip_range_params(request_url)
+                        logger.info(f"Found audio stream: {request_url[:100]}...")
+                if audio_url if output_type == "audio" else video_url:
+                    found.set()
+
+            await route.fallback()
+
+        metadata = {}
+        async with self.browser_pool.page() as page:
+            await page.route("**/*", handle_route)
+
+            logger.info(f"Navigating to YouTube URL: {url}")
+            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            try:
+                await asyncio.wait_for(found.wait(), timeout=settings.youtube_extract_timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out waiting for the wanted stream, using what was captured")
 
-                    else:
-                        # Fallback to yt-dlp if no stream found
-                        logger.warning("No stream found with Playwright, falling back to yt-dlp")
-                        return await self._fallback_to_ytdlp(url, output_dir, output_type, job_id)
+            # Progressive (non-MSE) players expose the stream as the video src
+            if not video_url:
+                try:
+                    video_element = await page.query_selector("video")
+                    src = await video_element.get_attribute("src") if video_element else None
+                    if src and not src.startswith("blob:"):
+                        video_url = src
+                        logger.info("Found video src attribute")
+                except Exception as e:
+                    logger.warning(f"Could not extract video src: {e}")
 
-                return DownloadResult(
-                    success=True,
-                    output_path=output_file,
-                    output_type=output_type,
-                    metadata=metadata,
+            try:
+                details = await page.evaluate(
+                    """() => {
+                        const details = window.ytInitialPlayerResponse && window.ytInitialPlayerResponse.videoDetails;
+                        return details ? {title: details.title, duration: details.lengthSeconds} : null;
+                    }"""
                 )
+                if details:
+                    metadata["title"] = details.get("title")
+                    if details.get("duration"):
+                        metadata["duration"] = int(details["duration"])
+                else:
+                    title = await page.title()
+                    metadata["title"] = title.replace(" - YouTube", "").strip()
+            except Exception as e:
+                logger.warning(f"Could not extract metadata: {e}")
 
-        except PlaywrightTimeout:
-            logger.warning("Playwright timeout, falling back to yt-dlp")
-            return await self._fallback_to_ytdlp(url, output_dir, output_type, job_id)
-        except Exception as e:
-            logger.warning(f"Playwright error: {e}, falling back to yt-dlp")
-            return await self._fallback_to_ytdlp(url, output_dir, output_type, job_id)
+        return video_url, audio_url, metadata
 
-    async def _convert_to_mp4(self, input_file: str, output_dir: str, job_id: Optional[str]) -> str:
-        """Convert video to MP4 using ffmpeg."""
-        output_file = os.path.join(output_dir, f"{job_id or 'video'}.mp4")
-        try:
-            subprocess.run(
-                ["ffmpeg", "-i", input_file, "-c", "copy", "-y", output_file],
-                check=True,
-                capture_output=True,
-            )
-            return output_file
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg conversion failed: {e.stderr.decode()}")
-            # Return original file if conversion fails
-            return input_file
+    async def close(self) -> None:
+        """Shut down the browser pool."""
+        await self.browser_pool.close()
 
-    async def _convert_to_audio(self, input_file: str, output_dir: str, job_id: Optional[str]) -> str:
+    async def _pipe_to_ffmpeg(
+        self,
+        client: httpx.AsyncClient,
+        stream_url: str,
+        output_args: list[str],
+        output_file: str,
+        progress: Optional[ProgressCallback],
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Feed a media stream into ffmpeg's stdin as it downloads.
+
+        ffmpeg remuxes/transcodes while the data arrives and writes only the
+        final file, so memory stays at one chunk plus the pipe buffer and no
+        intermediate copy of the stream touches the disk.
+
+        Args:
+            client: HTTP client
+            stream_url: googlevideo stream URL
+            output_args: ffmpeg output options
+            output_file: Final output path
+            progress: Optional callback for download progress
+            headers: Extra request headers the extractor requires
+        """
+        chunks = stream_url_chunks(
+            client, stream_url, progress, max_bytes=get_settings().download_max_bytes, request_headers=headers
+        )
+        try:
+            await run_ffmpeg(["-i", "pipe:0", *output_args, "-y", output_file], input_chunks=chunks)
+        except BaseException:
+            if os.path.exists(output_file):
+                os.remove(output_file)
+            raise
+
+    @staticmethod
+    def _transcode_progress(
+        progress: Optional[ProgressCallback], duration: Optional[float]
+    ) -> Optional[Callable[[float, int], None]]:
+        """Adapt ffmpeg progress (seconds written) to the job progress callback."""
+        if not progress:
+            return None
+        progress("transcoding")
+
+        def on_progress(seconds: float, size: int) -> None:
+            percent = min(100.0, seconds * 100.0 / duration) if duration else None
+            progress("transcoding", size, None, percent)
+
+        return on_progress
+
+    async def _convert_to_audio(
+        self,
+        input_file: str,
+        output_dir: str,
+        job_id: Optional[str],
+        progress: Optional[ProgressCallback] = None,
+        duration: Optional[float] = None,
+    ) -> str:
         """Convert to audio (WAV) using ffmpeg for Whisper compatibility."""
         output_file = os.path.join(output_dir, f"{job_id or 'audio'}.wav")
+        on_progress = self._transcode_progress(progress, duration)
         try:
-            subprocess.run(
+            await run_ffmpeg(
                 [
-                    "ffmpeg",
                     "-i",
                     input_file,
                     "-ar",
@@ -243,19 +443,17 @@ class YouTubeProvider(BaseProvider):
                     "-y",
                     output_file,
                 ],
-                check=True,
-                capture_output=True,
+                on_progress=on_progress,
             )
             return output_file
-        except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg audio conversion failed: {e.stderr.decode()}")
+        except FFmpegError as e:
+            logger.error(f"FFmpeg audio conversion failed: {e}")
             # Fallback to mp3
             output_file = os.path.join(output_dir, f"{job_id or 'audio'}.mp3")
             try:
-                subprocess.run(
-                    ["ffmpeg", "-i", input_file, "-acodec", "libmp3lame", "-y", output_file],
-                    check=True,
-                    capture_output=True,
+                await run_ffmpeg(
+                    ["-i", input_file, "-acodec", "libmp3lame", "-y", output_file],
+                    on_progress=on_progress,
                 )
                 return output_file
             except Exception:
@@ -267,27 +465,28 @@ class YouTubeProvider(BaseProvider):
         output_dir: str,
         output_type: str,
         job_id: Optional[str],
+        progress: Optional[ProgressCallback] = None,
     ) -> DownloadResult:
         """
         Fallback to yt-dlp when Playwright fails.
         Uses the existing multi-strategy extractor.
         """
         try:
-            from ...core.config import get_settings
             from ...core.youtube_extractor import extract_youtube_audio
 
             settings = get_settings()
             cookies_file = settings.youtube_cookies_file if hasattr(settings, 'youtube_cookies_file') else None
 
             logger.info("Using yt-dlp fallback for YouTube download")
+            progress_hooks = [ytdlp_progress_hook(progress)] if progress else None
 
             if output_type == "audio":
-                # Use the existing extractor
-                audio_path, duration = extract_youtube_audio(url, output_dir, cookies_file)
+                # Use the existing extractor (yt-dlp runs in the worker pool)
+                audio_path, duration = await extract_youtube_audio(url, output_dir, cookies_file, progress_hooks)
 
                 # Convert to WAV for Whisper if needed
                 if not audio_path.endswith('.wav'):
-                    output_file = await self._convert_to_audio(audio_path, output_dir, job_id)
+                    output_file = await self._convert_to_audio(audio_path, output_dir, job_id, progress, duration)
                     if output_file != audio_path and os.path.exists(audio_path):
                         os.remove(audio_path)
                 else:
@@ -302,8 +501,6 @@ class YouTubeProvider(BaseProvider):
                 )
             else:
                 # For video, use yt-dlp directly
-                from yt_dlp import YoutubeDL
-
                 output_file = os.path.join(output_dir, f"{job_id or 'video'}.mp4")
                 ydl_opts = {
                     "format": "bestvideo+bestaudio/best",
@@ -315,11 +512,10 @@ class YouTubeProvider(BaseProvider):
                 if cookies_file and os.path.exists(cookies_file):
                     ydl_opts["cookiefile"] = cookies_file
 
-                with YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(url, download=True)
-                    downloaded_path = ydl.prepare_filename(info).replace(".webm", ".mp4").replace(".mkv", ".mp4")
+                info = await ytdlp_pool.download(url, ydl_opts, progress_hooks=progress_hooks)
+                downloaded_path = info.get("filepath")
 
-                if os.path.exists(downloaded_path):
+                if downloaded_path and os.path.exists(downloaded_path):
                     metadata = {
                         "title": info.get("title", ""),
                         "duration": float(info.get("duration") or 0),
@@ -0,0 +1,120 @@
+"""Base for providers that download through yt-dlp."""
+
+from __future__ import annotations
+
+import os
+from typing import Callable, Optional
+
+from loguru import logger
+
+from ...core.ffmpeg_utils import run_ffmpeg
+from ...core.ytdlp_process import YtDlpProcessError, ytdlp_pool
+from ..base import BaseProvider, DownloadResult
+from ..metadata_cache import metadata_cache
+from ..progress import ProgressCallback, ytdlp_progress_hook
+
+
+AUDIO_FORMAT = "bestaudio/best"
+VIDEO_FORMAT = "bestvideo*+bestaudio/best"
+
+
+class YtDlpProvider(BaseProvider):
+    """
+    Provider that lets yt-dlp (in the worker pool) extract and download media.
+
+    Subclasses set ``name``, ``display_name`` and ``supported_domains`` and
+    usually override ``canonicalize`` and ``ytdlp_options``. Audio is
+    converted to 16 kHz mono WAV like the other providers; video is merged
+    into MP4. Formats cached by a probe are downloaded without extracting
+    again.
+    """
+
+    display_name: str
+
+    async def download(
+        self,
+        url: str,
+        output_dir: str,
+        output_type: str = "audio",
+        job_id: Optional[str] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> DownloadResult:
+        """
+        Download media with yt-dlp.
+
+        Args:
+            url: Media URL
+            output_dir: Directory to save the output file
+            output_type: "audio" or "video"
+            job_id: Optional job ID, used as the file name
+            progress: Optional callback receiving stage/bytes progress
+
+        Returns:
+            DownloadResult with success status and file path
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        options = {
+            **self.ytdlp_options(),
+            "outtmpl": os.path.join(output_dir, f"{job_id or self.name}.%(ext)s"),
+            "format": AUDIO_FORMAT if output_type == "audio" else VIDEO_FORMAT,
+        }
+        if output_type == "video":
+            options["merge_output_format"] = "mp4"
+        if progress:
+            progress("extracting")
+
+        try:
+            info = await self._download_info(url, options, progress)
+            output_file = info["filepath"]
+            if output_type == "audio" and not output_file.endswith(".wav"):
+                output_file = await self._convert_to_wav(output_file, info.get("duration"), progress)
+        except Exception as e:
+            logger.error(f"{self.display_name} download failed: {e}")
+            return DownloadResult(
+                success=False,
+                output_type=output_type,
+                error_message=f"{self.display_name} download failed: {e}",
+            )
+
+        metadata = {"title": info.get("title"), "uploader": info.get("uploader")}
+        if info.get("duration"):
+            metadata["duration"] = float(info["duration"])
+        return DownloadResult(
+            success=True,
+            output_path=output_file,
+            output_type=output_type,
+            metadata=metadata,
+        )
+
+    async def _download_info(self, url: str, options: dict, progress: Optional[ProgressCallback]) -> dict:
+        """Download from cached formats if a probe left them, otherwise extract and download."""
+        progress_hooks = [ytdlp_progress_hook(progress)] if progress else None
+        media_key = self.canonicalize(url)
+        cached = metadata_cache.get(media_key)
+        if cached is not None:
+            try:
+                return await ytdlp_pool.download(None, options, info=cached, progress_hooks=progress_hooks)
+            except YtDlpProcessError as e:
+                logger.warning(f"Download from cached formats failed, extracting again: {e}")
+                metadata_cache.discard(media_key)
+        return await ytdlp_pool.download(url, options, progress_hooks=progress_hooks)
+
+    async def _convert_to_wav(
+        self, input_file: str, duration: Optional[float], progress: Optional[ProgressCallback]
+    ) -> str:
+        """Convert downloaded audio to 16 kHz mono WAV (Whisper input) and remove the original."""
+        output_file = os.path.splitext(input_file)[0] + ".wav"
+        on_progress: Optional[Callable[[float, int], None]] = None
+        if progress:
+            progress("transcoding")
+
+            def on_progress(seconds: float, size: int) -> None:
+                percent = min(100.0, seconds * 100.0 / duration) if duration else None
+                progress("transcoding", size, None, percent)
+
+        await run_ffmpeg(
+            ["-i", input_file, "-vn", "-ar", "16000", "-ac", "1", "-y", output_file],
+            on_progress=on_progress,
+        )
+        os.remove(input_file)
+        return output_file
@@ -0,0 +1,329 @@
+"""Persistent download queue with a bounded worker pool."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import os
+import socket
+import statistics
+import time
+import uuid
+from collections import Counter, deque
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from .events import job_events
+from .batch import refresh_batch
+from .jobs import BATCH_PROVIDER, BaseJobStore, DownloadJob
+from .media_store import MediaStore
+from .progress import ProgressReporter
+from .registry import ProviderRegistry
+
+
+class DownloadQueue:
+    """
+    Schedules download jobs onto a fixed number of workers.
+
+    The job store is the durable part of the queue: every queued job is a
+    ``pending`` record, so nothing is lost on restart. Workers take the
+    highest-priority job (oldest first within a priority) whose provider is
+    below its concurrency limit.
+
+    A claimed job carries a lease that the queue renews while the download
+    runs. Several processes may share one job store: a ``running`` job is
+    only re-queued once its lease has expired (its process crashed or hung),
+    never while another live process is still running it.
+    """
+
+    def __init__(
+        self,
+        job_store: BaseJobStore,
+        registry: ProviderRegistry,
+        workers: int = 4,
+        provider_limits: Optional[dict[str, int]] = None,
+        media_dir: str = "storage/media",
+        dedup: bool = True,
+        lease_seconds: float = 120.0,
+    ):
+        """
+        Initialize download queue.
+
+        Args:
+            job_store: Store holding the job records
+            registry: Provider registry used to run downloads
+            workers: Number of concurrent downloads
+            provider_limits: Max concurrent downloads per provider name
+            media_dir: Directory for downloaded media
+            dedup: Store outputs content-addressed and reuse stored media for new jobs
+            lease_seconds: Lease on a running job; renewed every third of it while the download runs
+        """
+        self.job_store = job_store
+        self.registry = registry
+        self.workers = max(1, workers)
+        self.provider_limits = provider_limits or {}
+        self.media_dir = Path(media_dir)
+        self.media_store = MediaStore(str(self.media_dir)) if dedup else None
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        # Sorted by (-priority, enqueued_at, job_id)
+        self._waiting: list[tuple[int, float, str]] = []
+        self._providers: dict[str, str] = {}
+        self._queued: set[str] = set()
+        self._running: Counter[str] = Counter()
+        self._recent_waits: deque[float] = deque(maxlen=200)
+        self._cond: Optional[asyncio.Condition] = None
+        self._tasks: list[asyncio.Task] = []
+        self._active: set[str] = set()  # Jobs claimed by this queue
+
+    async def start(self) -> None:
+        """Recover persisted jobs and start the workers."""
+        self._cond = asyncio.Condition()
+        self.media_dir.mkdir(parents=True, exist_ok=True)
+        recovered = self.recover()
+        if recovered:
+            logger.info(f"Recovered {recovered} download jobs")
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._maintain_leases()))
+        logger.info(f"Download queue started with {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the workers. Interrupted jobs go back to ``pending`` and are recovered on next start."""
+        interrupted = list(self._active)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job_id in interrupted:
+            job = self.job_store.get_job(job_id)
+            if job and job.status == "running" and job.owner == self.owner:
+                self.job_store.update_fields(job_id, status="pending", owner=None, lease_expires_at=None)
+
+    def recover(self) -> int:
+        """
+        Queue jobs persisted as pending, re-queueing running jobs whose lease expired.
+
+        Returns:
+            Number of jobs queued
+        """
+        now = time.time()
+        for job in self.job_store.find_jobs_by_status("running"):
+            if job.provider == BATCH_PROVIDER or job.job_id in self._active:
+                continue
+            if self.job_store.release_expired_job(job.job_id, now):
+                logger.warning(f"Job {job.job_id} was interrupted (lease expired), re-queueing")
+
+        jobs = sorted(
+            (
+                job
+                for job in self.job_store.find_jobs_by_status("pending")
+                if job.provider != BATCH_PROVIDER and job.job_id not in self._queued
+            ),
+            key=lambda job: job.created_at,
+        )
+        for job in jobs:
+            self.submit(job)
+        return len(jobs)
+
+    async def _maintain_leases(self) -> None:
+        """Renew the leases of running jobs and pick up jobs whose owner stopped renewing."""
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self._renew_leases()
+                recovered = self.recover()
+                if recovered:
+                    logger.info(f"Queued {recovered} recovered download jobs")
+            except Exception as e:
+                logger.error(f"Download lease maintenance failed: {e}")
+
+    def _renew_leases(self) -> None:
+        expires_at = time.time() + self.lease_seconds
+        for job_id in list(self._active):
+            job = self.job_store.get_job(job_id)
+            if job and job.status == "running" and job.owner == self.owner:
+                self.job_store.update_fields(job_id, lease_expires_at=expires_at)
+
+    def submit(self, job: DownloadJob) -> None:
+        """
+        Queue a pending job.
+
+        Args:
+            job: Job to queue
+        """
+        if job.job_id in self._queued:
+            return
+        self._queued.add(job.job_id)
+        self._providers[job.job_id] = job.provider
+        bisect.insort(self._waiting, (-job.priority, time.monotonic(), job.job_id))
+        if self._cond is not None:
+            asyncio.ensure_future(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _limit(self, provider: str) -> int:
+        return self.provider_limits.get(provider, self.workers)
+
+    def _take_runnable(self) -> Optional[tuple[str, str]]:
+        """Pop the first waiting job whose provider has a free slot."""
+        for index, (_, enqueued_at, job_id) in enumerate(self._waiting):
+            provider = self._providers[job_id]
+            if self._running[provider] < self._limit(provider):
+                del self._waiting[index]
+                self._running[provider] += 1
+                self._recent_waits.append(time.monotonic() - enqueued_at)
+                return job_id, provider
+        return None
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            async with self._cond:
+                item = self._take_runnable()
+                while item is None:
+                    await self._cond.wait()
+                    item = self._take_runnable()
+
+            job_id, provider = item
+            try:
+                await self._run(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Download worker {index} crashed on job {job_id}: {e}")
+            finally:
+                self._queued.discard(job_id)
+                self._providers.pop(job_id, None)
+                self._running[provider] -= 1
+                async with self._cond:
+                    self._cond.notify_all()
+
+    async def _run(self, job_id: str) -> None:
+        """Claim a job and run its download."""
+        job = self.job_store.claim_job(job_id, owner=self.owner, lease_seconds=self.lease_seconds)
+        if not job:
+            logger.debug(f"Job {job_id} already claimed or no longer pending")
+            return
+        self._active.add(job_id)
+        try:
+            await self.process(job)
+        finally:
+            self._active.discard(job_id)
+        if job.parent_id:
+            refresh_batch(self.job_store, job.parent_id)
+
+    async def process(self, job: DownloadJob) -> None:
+        """
+        Run the download for a claimed job and record the outcome.
+
+        Args:
+            job: Job in ``running`` state
+        """
+        job_id = job.job_id
+
+        # Get provider
+        provider = self.registry.get_provider(job.url)
+        if not provider:
+            self.job_store.update_job_status(
+                job_id,
+                "failed",
+                error_message="No suitable provider found for this URL",
+            )
+            return
+
+        if self._complete_from_store(job):
+            return
+
+        # Perform download
+        try:
+            result = await provider.download(
+                job.url,
+                str(self.media_dir),
+                output_type=job.output_type,
+                job_id=job_id,
+                progress=ProgressReporter(job_id, self.job_store, job_events),
+            )
+
+            if result.success and result.output_path:
+                await self._store_output(job, str(result.output_path), result.metadata)
+                self.job_store.update_job_status(
+                    job_id,
+                    "completed",
+                    output_path=str(result.output_path),
+                    metadata=result.metadata,
+                )
+            else:
+                self.job_store.update_job_status(
+                    job_id,
+                    "failed",
+                    error_message=result.error_message or "Download failed",
+                )
+
+        except Exception as e:
+            logger.error(f"Download job {job_id} error: {e}")
+            self.job_store.update_job_status(
+                job_id,
+                "failed",
+                error_message=f"Download error: {str(e)}",
+            )
+
+    def _complete_from_store(self, job: DownloadJob) -> bool:
+        """Complete a job by linking media stored for its media key, if any."""
+        if self.media_store is None or not job.media_key:
+            return False
+        stored = self.media_store.lookup(job.media_key, job.output_type)
+        if stored is None:
+            return False
+        blob, metadata = stored
+        try:
+            output_path = self.media_store.link(blob, job.job_id)
+        except OSError as e:
+            logger.warning(f"Could not link stored media for job {job.job_id}, downloading: {e}")
+            return False
+        logger.info(f"Job {job.job_id} served from stored media {Path(blob).name}")
+        self.job_store.update_job_status(job.job_id, "completed", output_path=output_path, metadata=metadata)
+        return True
+
+    async def _store_output(self, job: DownloadJob, output_path: str, metadata: Optional[dict]) -> None:
+        """Move a finished output into the media store (the file stays usable if that fails)."""
+        if self.media_store is None:
+            return
+        try:
+            await asyncio.to_thread(self.media_store.ingest, output_path, job.media_key, job.output_type, metadata)
+        except OSError as e:
+            logger.warning(f"Could not store output of job {job.job_id}: {e}")
+
+    def stats(self) -> dict:
+        """
+        Queue depth, running jobs and wait times.
+
+        Returns:
+            Dict of queue statistics
+        """
+        now = time.monotonic()
+        waits = list(self._recent_waits)
+        waiting_by_provider = Counter(self._providers[job_id] for _, _, job_id in self._waiting)
+        return {
+            "workers": self.workers,
+            "depth": len(self._waiting),
+            "running": sum(self._running.values()),
+            "providers": {
+                name: {
+                    "waiting": waiting_by_provider.get(name, 0),
+                    "running": self._running.get(name, 0),
+                    "limit": self._limit(name),
+                }
+                for name in sorted(set(waiting_by_provider) | {n for n, c in self._running.items() if c})
+            },
+            "oldest_wait_seconds": round(max((now - t for _, t, _ in self._waiting), default=0.0), 3),
+            "recent_wait_seconds": {
+                "mean": round(statistics.mean(waits), 3) if waits else 0.0,
+                "max": round(max(waits), 3) if waits else 0.0,
+                "samples": len(waits),
+            },
+        }
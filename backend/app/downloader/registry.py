@@ -2,43 +2,192 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import importlib
+import threading
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Optional, Sequence
 from urllib.parse import urlparse
 
+from loguru import logger
+
 from .base import BaseProvider
-from .providers.youtube import YouTubeProvider
-from .providers.direct import DirectMediaProvider
-from .providers.tiktok import TikTokProvider
-from .providers.instagram import InstagramProvider
-from .providers.twitter import TwitterProvider
-from .providers.vimeo import VimeoProvider
+from .http_pool import HttpClientPool
+
+
+# Entry point group third-party providers register under
+ENTRY_POINT_GROUP = "nativewrite.providers"
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """
+    Where a provider lives and which hosts it serves, known without importing it.
+
+    A provider without domains is generic: it is asked (via ``can_handle``)
+    about every URL no domain-specific provider took.
+    """
+
+    name: str
+    target: str  # "package.module:ClassName"
+    domains: tuple[str, ...] = ()
+
+
+BUILTIN_PROVIDERS = (
+    ProviderSpec("youtube", "app.downloader.providers.youtube:YouTubeProvider", ("youtube.com", "youtu.be")),
+    ProviderSpec("direct", "app.downloader.providers.direct:DirectMediaProvider"),
+    ProviderSpec("tiktok", "app.downloader.providers.tiktok:TikTokProvider", ("tiktok.com",)),
+    ProviderSpec("instagram", "app.downloader.providers.instagram:InstagramProvider", ("instagram.com",)),
+    ProviderSpec("twitter", "app.downloader.providers.twitter:TwitterProvider", ("twitter.com", "x.com")),
+    ProviderSpec("vimeo", "app.downloader.providers.vimeo:VimeoProvider", ("vimeo.com",)),
+)
+
+
+def discover_plugins() -> list[ProviderSpec]:
+    """
+    Find third-party providers registered under the ``nativewrite.providers`` entry point group.
+
+    An entry point may name a ProviderSpec (preferred: the provider module is
+    imported only when a URL needs it) or a BaseProvider subclass (imported
+    now; its ``supported_domains`` are used).
+
+    Returns:
+        Specs of the discovered providers
+    """
+    specs = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entry_point.load()
+            if isinstance(loaded, ProviderSpec):
+                specs.append(loaded)
+            elif isinstance(loaded, type) and issubclass(loaded, BaseProvider):
+                target = f"{loaded.__module__}:{loaded.__qualname__}"
+                specs.append(ProviderSpec(loaded.name, target, tuple(loaded.supported_domains)))
+            else:
+                logger.warning(f"Provider entry point {entry_point.name} is not a ProviderSpec or provider class")
+        except Exception as e:
+            logger.warning(f"Could not load provider entry point {entry_point.name}: {e}")
+    return specs
 
 
 class ProviderRegistry:
-    """Registry that manages all download providers."""
-
-    def __init__(self):
-        """Initialize registry with all available providers."""
-        self._providers: list[BaseProvider] = [
-            YouTubeProvider(),
-            DirectMediaProvider(),
-            TikTokProvider(),
-            InstagramProvider(),
-            TwitterProvider(),
-            VimeoProvider(),
-        ]
+    """
+    Registry that resolves URLs to providers.
+
+    Hostnames are dispatched through a suffix index of provider domains
+    (``m.youtube.com`` finds ``youtube.com``, ``notyoutube.com`` does not).
+    Providers are imported and instantiated on first use, so deployments that
+    never download media don't load Playwright or yt-dlp.
+    """
+
+    def __init__(
+        self,
+        http: Optional[HttpClientPool] = None,
+        specs: Optional[Sequence[ProviderSpec]] = None,
+        plugins: bool = True,
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            http: Shared HTTP client pool handed to every provider
+            specs: Providers to register (built-in providers if omitted)
+            plugins: Also register providers found through entry points
+        """
+        self.http = http
+        self._specs: dict[str, ProviderSpec] = {}
+        self._domains: dict[str, str] = {}  # Domain -> provider name
+        self._generic: list[str] = []  # Providers without domains, in registration order
+        self._providers: dict[str, BaseProvider] = {}  # Loaded providers
+        self._lock = threading.Lock()
+
+        for spec in specs if specs is not None else BUILTIN_PROVIDERS:
+            self.register(spec)
+        if plugins:
+            for spec in discover_plugins():
+                self.register(spec)
+
+    def register(self, spec: ProviderSpec) -> None:
+        """
+        Register a provider (without importing it).
+
+        Args:
+            spec: Provider spec; a name or domain that is already registered is skipped
+        """
+        if spec.name in self._specs:
+            logger.warning(f"Provider {spec.name} is already registered, ignoring {spec.target}")
+            return
+        self._specs[spec.name] = spec
+        if not spec.domains:
+            self._generic.append(spec.name)
+        for domain in spec.domains:
+            domain = domain.lower().strip(".")
+            owner = self._domains.setdefault(domain, spec.name)
+            if owner != spec.name:
+                logger.warning(f"Domain {domain} already belongs to provider {owner}, not {spec.name}")
+
+    def _load(self, name: str) -> BaseProvider:
+        provider = self._providers.get(name)
+        if provider is not None:
+            return provider
+        with self._lock:
+            provider = self._providers.get(name)
+            if provider is None:
+                module_name, _, class_name = self._specs[name].target.partition(":")
+                provider_class = getattr(importlib.import_module(module_name), class_name)
+                provider = provider_class()
+                provider.http = self.http
+                self._providers[name] = provider
+                logger.info(f"Loaded provider {name}")
+            return provider
+
+    async def open(self) -> None:
+        """Open the shared HTTP client pool (called on app startup)."""
+        if self.http is not None:
+            await self.http.open()
+
+    async def close(self) -> None:
+        """Close loaded providers and the shared HTTP client pool (called on app shutdown)."""
+        for provider in list(self._providers.values()):
+            try:
+                await provider.close()
+            except Exception as e:
+                logger.warning(f"Error closing provider {provider.name}: {e}")
+        if self.http is not None:
+            await self.http.close()
+
+    def _lookup_domain(self, hostname: str) -> Optional[str]:
+        labels = hostname.lower().rstrip(".").split(".")
+        for index in range(len(labels)):
+            name = self._domains.get(".".join(labels[index:]))
+            if name is not None:
+                return name
+        return None
 
     def get_provider(self, url: str) -> Optional[BaseProvider]:
         """
         Get the appropriate provider for a URL.
 
+        The provider owning the longest matching domain suffix of the hostname
+        is asked first, then the generic providers.
+
         Args:
             url: The URL to find a provider for
 
         Returns:
             The provider that can handle the URL, or None if no provider found
         """
-        for provider in self._providers:
+        try:
+            hostname = urlparse(url).hostname or ""
+        except ValueError:
+            return None
+        name = self._lookup_domain(hostname) if hostname else None
+        if name is not None:
+            provider = self._load(name)
+            if provider.can_handle(url):
+                return provider
+        for name in self._generic:
+            provider = self._load(name)
             if provider.can_handle(url):
                 return provider
         return None
@@ -53,16 +202,10 @@ class ProviderRegistry:
         Returns:
             The provider with the given name, or None if not found
         """
-        for provider in self._providers:
-            if provider.name == name:
-                return provider
-        return None
+        if name not in self._specs:
+            return None
+        return self._load(name)
 
     def list_providers(self) -> list[BaseProvider]:
-        """List all registered providers."""
-        return self._providers.copy()
-
-
-
-
-
+        """List all registered providers (loading any not loaded yet)."""
+        return [self._load(name) for name in self._specs]
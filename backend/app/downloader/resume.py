@@ -0,0 +1,192 @@
+"""Sidecar manifests that let interrupted downloads resume."""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import httpx
+from loguru import logger
+from pydantic import BaseModel
+
+
+# Partial downloads keyed by resume key live here, inside the output directory
+PARTIAL_DIR = ".partial"
+
+
+def partial_path(path: str, resume_key: Optional[str] = None) -> str:
+    """
+    Path of the in-progress file for a download.
+
+    With a resume key (e.g. the media key) the partial file is shared by every
+    job downloading the same media, so a retry under a new job ID resumes it.
+    Use claim_partial() to get a partial file no other download is writing.
+
+    Args:
+        path: Final destination
+        resume_key: Stable identity of the content being downloaded
+
+    Returns:
+        Path of the ``.part`` file
+    """
+    if not resume_key:
+        return f"{path}.part"
+    digest = hashlib.sha256(resume_key.encode("utf-8")).hexdigest()[:32]
+    suffix = os.path.splitext(path)[1]
+    return os.path.join(os.path.dirname(path), PARTIAL_DIR, f"{digest}{suffix}.part")
+
+
+@contextmanager
+def claim_partial(path: str, resume_key: Optional[str] = None) -> Iterator[str]:
+    """
+    Claim the partial file of a download for exclusive use.
+
+    The shared partial file of a resume key is guarded by an exclusive lock
+    (released by the OS if the process dies). While another download holds it,
+    e.g. an audio and a video job for the same URL or a retry overlapping a
+    straggling attempt, this download uses a private ``<path>.part`` instead.
+
+    Args:
+        path: Final destination
+        resume_key: Stable identity of the content being downloaded
+
+    Yields:
+        Path of the ``.part`` file to use
+    """
+    if not resume_key:
+        yield partial_path(path)
+        return
+    part_path = partial_path(path, resume_key)
+    lock_path = f"{part_path}.lock"
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            logger.info(f"Partial download {part_path} is in use, downloading {path} separately")
+            yield partial_path(path)
+            return
+        try:
+            if os.fstat(fd).st_ino == os.stat(lock_path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        # The previous holder removed the lock file between our open and flock
+        os.close(fd)
+    try:
+        yield part_path
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+
+def response_validator(response: httpx.Response) -> Optional[str]:
+    """
+    Strong validator identifying the exact representation served.
+
+    Returns None when resuming would be unsafe: weak or missing ETag and
+    Last-Modified, or an encoded body whose byte offsets differ from the file.
+
+    Args:
+        response: Response to inspect
+
+    Returns:
+        ETag or Last-Modified value usable as If-Range
+    """
+    if response.headers.get("content-encoding", "identity") != "identity":
+        return None
+    etag = response.headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("last-modified")
+
+
+class ResumeManifest(BaseModel):
+    """State of a partial download, stored next to the ``.part`` file."""
+
+    url: str
+    size: Optional[int] = None
+    validator: str  # ETag or Last-Modified sent as If-Range
+    content_type: str = ""
+    completed: list[tuple[int, int]] = []  # Merged inclusive byte ranges on disk
+
+    @staticmethod
+    def manifest_path(part_path: str) -> str:
+        return f"{part_path}.json"
+
+    @classmethod
+    def load(cls, part_path: str) -> Optional["ResumeManifest"]:
+        """
+        Load the manifest of a partial file.
+
+        Args:
+            part_path: Path of the ``.part`` file
+
+        Returns:
+            Manifest, or None if there is nothing to resume
+        """
+        path = cls.manifest_path(part_path)
+        if not os.path.exists(part_path) or not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                return cls.model_validate_json(f.read())
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable resume manifest {path}: {e}")
+            return None
+
+    def save(self, part_path: str) -> None:
+        """Atomically write the manifest next to the partial file."""
+        path = self.manifest_path(part_path)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.model_dump_json().encode("utf-8"))
+        os.replace(temp_path, path)
+
+    def add(self, start: int, end: int) -> None:
+        """Record an inclusive byte range as written, merging adjacent ranges."""
+        merged = []
+        for range_start, range_end in sorted([*self.completed, (start, end)]):
+            if merged and range_start <= merged[-1][1] + 1:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+            else:
+                merged.append((range_start, range_end))
+        self.completed = merged
+
+    def completed_bytes(self) -> int:
+        return sum(end - start + 1 for start, end in self.completed)
+
+    def prefix_bytes(self) -> int:
+        """Number of bytes written contiguously from the start of the file."""
+        if self.completed and self.completed[0][0] == 0:
+            return self.completed[0][1] + 1
+        return 0
+
+    def missing(self) -> list[tuple[int, int]]:
+        """Inclusive byte ranges not yet written (requires a known size)."""
+        gaps = []
+        position = 0
+        for start, end in self.completed:
+            if start > position:
+                gaps.append((position, start - 1))
+            position = max(position, end + 1)
+        if self.size is not None and position < self.size:
+            gaps.append((position, self.size - 1))
+        return gaps
+
+
+def discard_partial(part_path: str) -> None:
+    """Remove a partial file and its manifest."""
+    for path in (part_path, ResumeManifest.manifest_path(part_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
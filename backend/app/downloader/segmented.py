@@ -0,0 +1,442 @@
+"""Segmented multi-connection downloads using HTTP range requests."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from typing import Optional
+
+import httpx
+from loguru import logger
+
+from .progress import ProgressCallback
+from .resume import ResumeManifest, claim_partial, discard_partial, response_validator
+from .streaming import (
+    CHUNK_SIZE,
+    CONTENT_RANGE_REGEX,
+    MANIFEST_SAVE_INTERVAL,
+    DownloadTooLarge,
+    StreamedFile,
+    stream_response_to_file,
+    stream_url_to_partial,
+)
+
+
+# Segments are sized to take about this long on the connection fetching them
+SEGMENT_TARGET_SECONDS = 2.0
+MAX_SEGMENT_SIZE = 64 * 1024 * 1024
+# Failed segment requests tolerated per connection before giving up
+MAX_RETRIES_PER_CONNECTION = 3
+
+
+class RangeNotHonored(Exception):
+    """Raised when the server stops honoring range requests mid-download."""
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SegmentedDownload:
+    """
+    Fetches one file over several connections with byte-range requests.
+
+    Workers carve segments from a shared list of unclaimed byte ranges. Each
+    worker sizes its next segment from its own measured throughput (about
+    SEGMENT_TARGET_SECONDS of transfer), capped so the remaining bytes are
+    spread over all connections near the end. Segments are written in place
+    with positional writes into a preallocated file, and written ranges are
+    recorded in the resume manifest. A worker that is rate limited (429/503)
+    hands its segment back and stops, reducing the connection count.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        fd: int,
+        total: int,
+        validator: Optional[str],
+        connections: int,
+        min_segment_size: int,
+        progress: Optional[ProgressCallback] = None,
+        manifest: Optional[ResumeManifest] = None,
+        part_path: Optional[str] = None,
+    ):
+        """
+        Initialize segmented download.
+
+        Args:
+            client: HTTP client
+            url: Final (post-redirect) URL of the file
+            fd: File descriptor of the preallocated destination
+            total: File size in bytes
+            validator: ETag or Last-Modified sent as If-Range
+            connections: Maximum concurrent connections
+            min_segment_size: Smallest segment requested
+            progress: Optional callback for download progress
+            manifest: Resume manifest updated as ranges are written
+            part_path: Path of the file the manifest belongs to
+        """
+        self.client = client
+        self.url = url
+        self.fd = fd
+        self.total = total
+        self.validator = validator
+        self.connections = connections
+        self.min_segment_size = min_segment_size
+        self.progress = progress
+        self.manifest = manifest
+        self.part_path = part_path
+
+        self.done = manifest.completed_bytes() if manifest is not None else 0
+        # Unclaimed inclusive byte ranges, including those handed back by failed connections
+        self._pending: list[tuple[int, int]] = []
+        self._active = 0
+        self._writes: set[asyncio.Future] = set()
+        self._saving = False
+        self._saved_at = time.monotonic()
+
+    def _take_segment(self, speed: Optional[float]) -> Optional[tuple[int, int]]:
+        """Claim the next byte range (inclusive) to fetch, or None when all are claimed."""
+        if not self._pending:
+            return None
+
+        size = int(speed * SEGMENT_TARGET_SECONDS) if speed else self.min_segment_size
+        size = max(self.min_segment_size, min(size, MAX_SEGMENT_SIZE))
+        remaining = sum(end - start + 1 for start, end in self._pending)
+        size = min(size, max(self.min_segment_size, -(-remaining // self.connections)))
+
+        start, end = self._pending[0]
+        if end - start + 1 <= size:
+            self._pending.pop(0)
+            return start, end
+        self._pending[0] = (start + size, end)
+        return start, start + size - 1
+
+    def _track(self, future: asyncio.Future) -> None:
+        self._writes.add(future)
+        future.add_done_callback(self._writes.discard)
+
+    async def _write(self, chunk: bytes, position: int) -> None:
+        # Shielded so a cancelled worker never leaves a write running after the fd closes
+        write = asyncio.ensure_future(asyncio.to_thread(os.pwrite, self.fd, chunk, position))
+        self._track(write)
+        await asyncio.shield(write)
+
+    async def _save_manifest(self) -> None:
+        self._saving = True
+        try:
+            await asyncio.to_thread(self.manifest.save, self.part_path)
+        except OSError as e:
+            logger.warning(f"Failed to save resume manifest for {self.part_path}: {e}")
+        finally:
+            self._saving = False
+
+    def _record(self, start: int, end: int) -> None:
+        """Mark a written range in the manifest, saving it periodically."""
+        if self.manifest is None:
+            return
+        self.manifest.add(start, end)
+        if not self._saving and time.monotonic() - self._saved_at >= MANIFEST_SAVE_INTERVAL:
+            self._saved_at = time.monotonic()
+            self._track(asyncio.ensure_future(self._save_manifest()))
+
+    async def _write_body(self, response: httpx.Response, start: int, end: int) -> int:
+        """Write a 206 response body at its offset; returns bytes written."""
+        position = start
+        try:
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                chunk = chunk[: end + 1 - position]
+                if not chunk:
+                    break
+                await self._write(chunk, position)
+                self._record(position, position + len(chunk) - 1)
+                position += len(chunk)
+                self.done += len(chunk)
+                if self.progress:
+                    self.progress("downloading", self.done, self.total)
+        finally:
+            if position <= end:
+                # Hand the unfinished part back to the pool
+                self._pending.insert(0, (position, end))
+        return position - start
+
+    def _check_range(self, response: httpx.Response, start: int) -> None:
+        match = CONTENT_RANGE_REGEX.match(response.headers.get("content-range", ""))
+        if response.status_code != 206 or not match or int(match.group(1)) != start:
+            raise RangeNotHonored(
+                f"Server returned {response.status_code} for range starting at {start}; the file may have changed"
+            )
+
+    async def _fetch(self, start: int, end: int) -> int:
+        headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+        if self.validator:
+            headers["If-Range"] = self.validator
+        writing = False
+        try:
+            async with self.client.stream("GET", self.url, headers=headers) as response:
+                response.raise_for_status()
+                self._check_range(response, start)
+                writing = True
+                return await self._write_body(response, start, end)
+        except BaseException:
+            if not writing:
+                self._pending.insert(0, (start, end))
+            raise
+
+    async def worker(self, first: Optional[tuple[httpx.Response, int, int]] = None) -> None:
+        """
+        Fetch segments until none are left.
+
+        Args:
+            first: Already-open response for the first segment (the probe)
+        """
+        self._active += 1
+        speed: Optional[float] = None
+        failures = 0
+        try:
+            if first is not None:
+                response, start, end = first
+                started = time.monotonic()
+                try:
+                    written = await self._write_body(response, start, end)
+                    speed = written / max(time.monotonic() - started, 1e-3)
+                except httpx.TransportError:
+                    failures += 1
+
+            while (segment := self._take_segment(speed)) is not None:
+                start, end = segment
+                started = time.monotonic()
+                try:
+                    written = await self._fetch(start, end)
+                except (httpx.HTTPStatusError, httpx.TransportError) as e:
+                    rate_limited = isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (429, 503)
+                    if rate_limited and self._active > 1:
+                        logger.debug(f"Range request rate limited, dropping to {self._active - 1} connections")
+                        return
+                    failures += 1
+                    if failures > MAX_RETRIES_PER_CONNECTION:
+                        raise
+                    await asyncio.sleep(min(2**failures * 0.25, 5.0))
+                    continue
+                if written == 0:
+                    # Server ended the body early without sending anything
+                    failures += 1
+                    if failures > MAX_RETRIES_PER_CONNECTION:
+                        raise RangeNotHonored(f"No data received for range starting at {start}")
+                    continue
+                speed = written / max(time.monotonic() - started, 1e-3)
+        finally:
+            self._active -= 1
+
+    async def run(self, first: tuple[httpx.Response, int, int], pending: list[tuple[int, int]]) -> None:
+        """
+        Run all connections until the file is complete.
+
+        Args:
+            first: Open probe response and its byte range (continued as one connection)
+            pending: Remaining byte ranges to fetch
+
+        Raises:
+            RangeNotHonored: If the server stops honoring ranges or bytes are missing
+        """
+        self._pending = list(pending)
+        tasks = [asyncio.create_task(self.worker(first))]
+        tasks += [asyncio.create_task(self.worker()) for _ in range(self.connections - 1)]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception():
+                    raise task.exception()
+            if self._pending:
+                # Segments handed back by a connection that stopped after the others finished
+                await self.worker()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+        if self.done != self.total:
+            raise RangeNotHonored(f"Downloaded {self.done} of {self.total} bytes")
+
+
+async def _complete(part_path: str, path: str, total: int, content_type: str) -> StreamedFile:
+    """Validate a fully downloaded ``.part`` file and move it into place."""
+    size = os.path.getsize(part_path)
+    if size != total:
+        discard_partial(part_path)
+        raise RangeNotHonored(f"Partial file has {size} bytes, expected {total}")
+    os.replace(part_path, path)
+    discard_partial(part_path)
+    return StreamedFile(
+        path=path,
+        size=total,
+        sha256=await asyncio.to_thread(_sha256_file, path),
+        content_type=content_type,
+    )
+
+
+async def download_file(
+    client: httpx.AsyncClient,
+    url: str,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    max_bytes: Optional[int] = None,
+    connections: int = 4,
+    min_segment_size: int = 4 * 1024 * 1024,
+    resume_key: Optional[str] = None,
+) -> StreamedFile:
+    """
+    Download a URL, over several connections when the server supports ranges.
+
+    The first request asks for the first segment. A ``206`` reply reveals the
+    size and that ranges work, and the file is fetched by SegmentedDownload
+    into a ``.part`` file. Otherwise (``200``, unknown size, or a file smaller
+    than two segments) the same response is streamed single-connection.
+
+    Partial downloads are resumable: the ``.part`` file is kept on failure
+    together with a manifest of the byte ranges written. The next attempt
+    requests the first missing range with ``If-Range``; if the server still
+    serves the same file (a 206 of the same total size) only the missing
+    ranges are fetched, otherwise the partial file is discarded.
+
+    Args:
+        client: HTTP client
+        url: URL to download
+        path: Destination file
+        progress: Optional callback for download progress
+        max_bytes: Abort if the file is larger than this (None/0 disables)
+        connections: Maximum concurrent connections (1 disables segmenting)
+        min_segment_size: Smallest segment requested
+        resume_key: Stable identity of the content, shared by retries (see claim_partial)
+
+    Returns:
+        StreamedFile with size and sha256 of the file
+    """
+    with claim_partial(path, resume_key) as part_path:
+        return await _download_file(client, url, path, part_path, progress, max_bytes, connections, min_segment_size)
+
+
+async def _download_file(
+    client: httpx.AsyncClient,
+    url: str,
+    path: str,
+    part_path: str,
+    progress: Optional[ProgressCallback],
+    max_bytes: Optional[int],
+    connections: int,
+    min_segment_size: int,
+) -> StreamedFile:
+    """download_file() on a claimed partial file."""
+    manifest = ResumeManifest.load(part_path)
+    if connections <= 1 or (manifest is not None and manifest.size is None):
+        return await stream_url_to_partial(client, url, path, part_path, progress, max_bytes)
+
+    missing = manifest.missing() if manifest is not None else [(0, None)]
+    if not missing:
+        return await _complete(part_path, path, manifest.size, manifest.content_type)
+
+    start, end = missing[0]
+    end = start + min_segment_size - 1 if end is None else min(end, start + min_segment_size - 1)
+    headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+    if manifest is not None:
+        headers["If-Range"] = manifest.validator
+
+    async with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+        response.raise_for_status()
+        match = CONTENT_RANGE_REGEX.match(response.headers.get("content-range", ""))
+        ranged = (
+            response.status_code == 206
+            and match is not None
+            and match.group(3) != "*"
+            and int(match.group(1)) == start
+        )
+        content_type = response.headers.get("content-type", "")
+
+        if manifest is None:
+            if not ranged or int(match.group(3)) <= int(match.group(2)) + 1:
+                # No range support, unknown size, or the whole file fit in the probe
+                return await stream_response_to_file(response, path, progress, max_bytes, part_path=part_path)
+            total = int(match.group(3))
+            if max_bytes and total > max_bytes:
+                raise DownloadTooLarge(max_bytes)
+            validator = response_validator(response)
+            if validator:
+                manifest = ResumeManifest(
+                    url=str(response.url), size=total, validator=validator, content_type=content_type
+                )
+            pending = [(int(match.group(2)) + 1, total - 1)]
+            resuming = False
+        elif ranged and int(match.group(3)) == manifest.size:
+            total = manifest.size
+            validator = manifest.validator
+            first_end = missing[0][1]
+            end = int(match.group(2))
+            pending = ([(end + 1, first_end)] if end < first_end else []) + missing[1:]
+            resuming = True
+            logger.info(f"Resuming download of {url} with {manifest.completed_bytes()} of {total} bytes on disk")
+        else:
+            pending = None
+
+        if pending is not None:
+            remaining = sum(range_end - range_start + 1 for range_start, range_end in pending)
+            connections = max(1, min(connections, -(-remaining // min_segment_size)))
+            logger.info(f"Downloading {remaining} bytes over up to {connections} connections")
+
+            os.makedirs(os.path.dirname(part_path) or ".", exist_ok=True)
+            flags = os.O_RDWR | os.O_CREAT | (0 if resuming else os.O_TRUNC)
+            fd = os.open(part_path, flags, 0o644)
+            try:
+                if hasattr(os, "posix_fallocate"):
+                    os.posix_fallocate(fd, 0, total)
+                else:
+                    os.ftruncate(fd, max(total, os.fstat(fd).st_size))
+                if manifest is not None and not resuming:
+                    manifest.save(part_path)
+                if progress:
+                    progress("downloading", manifest.completed_bytes() if resuming else 0, total)
+
+                download = SegmentedDownload(
+                    client,
+                    str(response.url),
+                    fd,
+                    total,
+                    validator,
+                    connections,
+                    min_segment_size,
+                    progress,
+                    manifest,
+                    part_path,
+                )
+                await download.run((response, start, int(match.group(2))), pending)
+            except BaseException as e:
+                os.close(fd)
+                if manifest is None or isinstance(e, RangeNotHonored):
+                    discard_partial(part_path)
+                else:
+                    try:
+                        manifest.save(part_path)
+                    except OSError as save_error:
+                        logger.warning(f"Failed to save resume manifest for {part_path}: {save_error}")
+                    done = manifest.completed_bytes()
+                    logger.info(f"Kept partial download {part_path} ({done} of {total} bytes) for resuming")
+                raise
+            os.close(fd)
+
+    if pending is None:
+        # The server no longer serves the file the partial download came from
+        logger.info(f"{url} changed since the partial download, starting over")
+        discard_partial(part_path)
+        return await _download_file(
+            client, url, path, part_path, progress, max_bytes, connections, min_segment_size
+        )
+
+    return await _complete(part_path, path, total, content_type)
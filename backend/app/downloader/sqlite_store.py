@@ -0,0 +1,378 @@
+"""SQLite-backed job store with indexed lookups."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+from loguru import logger
+
+from .jobs import BaseJobStore, DownloadJob, decode_cursor, encode_cursor
+
+
+# Columns mirrored out of the job record so they can be indexed.
+# The full record is always kept in the ``data`` JSON column.
+_COLUMNS: dict[str, str] = {
+    "url": "TEXT NOT NULL",
+    "provider": "TEXT NOT NULL",
+    "media_key": "TEXT",
+    "status": "TEXT NOT NULL",
+    "output_type": "TEXT NOT NULL",
+    "created_at": "TEXT NOT NULL",
+    "updated_at": "TEXT NOT NULL",
+}
+
+_INDEXES: dict[str, str] = {
+    "idx_jobs_url": "url, status, created_at",
+    "idx_jobs_media_key": "media_key, output_type, status, created_at",
+    "idx_jobs_status": "status, created_at",
+    "idx_jobs_provider": "provider, created_at",
+    "idx_jobs_created_at": "created_at",
+}
+
+
+class SQLiteJobStore(BaseJobStore):
+    """Manages job storage in a single SQLite database (WAL mode)."""
+
+    def __init__(self, db_path: str = "storage/jobs.db"):
+        """
+        Initialize SQLite job store.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """Create the jobs table and indexes, adding columns missing from older databases."""
+        with self._lock:
+            columns = ", ".join(f"{name} {decl}" for name, decl in _COLUMNS.items())
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, {columns}, data TEXT NOT NULL)"
+            )
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, decl in _COLUMNS.items():
+                if name not in existing:
+                    # Added columns cannot be NOT NULL without a default
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {decl.replace(' NOT NULL', '')}")
+            for index_name, index_columns in _INDEXES.items():
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON jobs({index_columns})")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reservations (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def _row_values(job: DownloadJob) -> tuple:
+        """Build the INSERT parameter tuple for a job."""
+        return (
+            job.job_id,
+            *(getattr(job, name) for name in _COLUMNS),
+            job.model_dump_json(),
+        )
+
+    def _upsert_sql(self) -> str:
+        names = ["job_id", *_COLUMNS, "data"]
+        placeholders = ", ".join("?" for _ in names)
+        return f"INSERT OR REPLACE INTO jobs ({', '.join(names)}) VALUES ({placeholders})"
+
+    @staticmethod
+    def _decode(data: str) -> Optional[DownloadJob]:
+        try:
+            return DownloadJob.model_validate_json(data)
+        except Exception as e:
+            logger.error(f"Error decoding job record: {e}")
+            return None
+
+    def save_job(self, job: DownloadJob) -> None:
+        """
+        Save job to the database.
+
+        Args:
+            job: Job to save
+        """
+        job.updated_at = datetime.utcnow().isoformat()
+        with self._lock:
+            self._conn.execute(self._upsert_sql(), self._row_values(job))
+        logger.debug(f"Saved job {job.job_id}")
+
+    def update_fields(self, job_id: str, **fields) -> bool:
+        """
+        Set top-level fields of a job in place, refreshing updated_at.
+
+        Only the given fields are written (``json_set`` on the record plus the
+        mirrored columns); the record is not read or re-encoded.
+
+        Args:
+            job_id: Job ID
+            **fields: DownloadJob field values
+
+        Returns:
+            True if job was updated, False if not found
+        """
+        fields["updated_at"] = datetime.utcnow().isoformat()
+        assignments: list[str] = []
+        column_params: list = []
+        paths: list[str] = []
+        path_params: list = []
+        for name, value in fields.items():
+            if name not in DownloadJob.model_fields:
+                raise ValueError(f"Unknown job field: {name}")
+            if name in _COLUMNS:
+                assignments.append(f"{name} = ?")
+                column_params.append(value)
+            if isinstance(value, (dict, list, bool)):
+                paths.append(f"'$.{name}', json(?)")
+                path_params.append(json.dumps(value, separators=(",", ":")))
+            else:
+                paths.append(f"'$.{name}', ?")
+                path_params.append(value)
+
+        assignments.append(f"data = json_set(data, {', '.join(paths)})")
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {', '.join(assignments)} WHERE job_id = ?",
+                (*column_params, *path_params, job_id),
+            )
+        return cursor.rowcount > 0
+
+    def get_job(self, job_id: str) -> Optional[DownloadJob]:
+        """
+        Get job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def find_job_by_url(self, url: str) -> Optional[DownloadJob]:
+        """
+        Find the most recent completed job for a URL.
+
+        Args:
+            url: URL to search for
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE url = ? AND status = 'completed' ORDER BY created_at DESC LIMIT 1",
+                (url,),
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def find_job_by_media_key(
+        self,
+        media_key: str,
+        output_type: Optional[str] = None,
+        statuses: Iterable[str] = ("completed",),
+    ) -> Optional[DownloadJob]:
+        """
+        Find the most recent job for a canonical media key.
+
+        Args:
+            media_key: Canonical media key from the provider
+            output_type: "audio" or "video", or None to match either
+            statuses: Job statuses that count as a match
+
+        Returns:
+            DownloadJob or None if not found
+        """
+        statuses = list(statuses)
+        conditions = ["media_key = ?"]
+        params: list = [media_key]
+        if output_type is not None:
+            conditions.append("output_type = ?")
+            params.append(output_type)
+        conditions.append(f"status IN ({', '.join('?' for _ in statuses)})")
+        params.extend(statuses)
+        query = f"SELECT data FROM jobs WHERE {' AND '.join(conditions)} ORDER BY created_at DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def reserve(self, key: str, ttl_seconds: float) -> bool:
+        """
+        Take a short-lived reservation on a key (atomic across processes).
+
+        Args:
+            key: Reservation key
+            ttl_seconds: Reservation lifetime
+
+        Returns:
+            True if the reservation was taken, False if someone else holds it
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM reservations WHERE key = ? AND expires_at < ?", (key, now))
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO reservations (key, expires_at) VALUES (?, ?)",
+                (key, now + ttl_seconds),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """
+        Release a reservation taken with reserve().
+
+        Args:
+            key: Reservation key
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM reservations WHERE key = ?", (key,))
+
+    def find_jobs_by_status(self, status: str) -> list[DownloadJob]:
+        """
+        Find all jobs with a given status, oldest first.
+
+        Args:
+            status: Job status
+
+        Returns:
+            List of matching jobs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM jobs WHERE status = ? ORDER BY created_at", (status,)
+            ).fetchall()
+        jobs = [self._decode(row[0]) for row in rows]
+        return [job for job in jobs if job]
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        provider: Optional[str] = None,
+        output_type: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[DownloadJob], Optional[str]]:
+        """
+        List jobs newest first with optional filters (keyset pagination).
+
+        Args:
+            status: Only jobs with this status
+            provider: Only jobs from this provider
+            output_type: Only jobs with this output type
+            created_from: Only jobs created at or after this ISO timestamp
+            created_to: Only jobs created before this ISO timestamp
+            limit: Maximum number of jobs to return
+            cursor: ``next_cursor`` from the previous page
+
+        Returns:
+            (jobs, next_cursor) where next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        clauses: list[str] = []
+        params: list = []
+        for column, value in (("status", status), ("provider", provider), ("output_type", output_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if created_from is not None:
+            clauses.append("created_at >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            clauses.append("created_at < ?")
+            params.append(created_to)
+        if cursor:
+            created_at, job_id = decode_cursor(cursor)
+            clauses.append("(created_at < ? OR (created_at = ? AND job_id < ?))")
+            params.extend([created_at, created_at, job_id])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM jobs {where} ORDER BY created_at DESC, job_id DESC LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+
+        jobs = [job for job in (self._decode(row[0]) for row in rows[:limit]) if job]
+        next_cursor = encode_cursor(jobs[-1]) if len(rows) > limit and jobs else None
+        return jobs, next_cursor
+
+    def delete_jobs_before(self, updated_before: str, statuses: Iterable[str]) -> int:
+        """
+        Delete jobs in the given statuses last updated before a timestamp.
+
+        Args:
+            updated_before: ISO timestamp (UTC)
+            statuses: Job statuses eligible for deletion
+
+        Returns:
+            Number of jobs deleted
+        """
+        statuses = list(statuses)
+        placeholders = ", ".join("?" * len(statuses))
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*statuses, updated_before),
+            )
+        return cursor.rowcount
+
+    def import_jobs(self, jobs: Iterable[DownloadJob], batch_size: int = 1000) -> int:
+        """
+        Bulk insert jobs as-is, preserving their timestamps.
+
+        Args:
+            jobs: Jobs to insert (existing job_ids are replaced)
+            batch_size: Rows per transaction
+
+        Returns:
+            Number of jobs imported
+        """
+        sql = self._upsert_sql()
+        count = 0
+        batch: list[tuple] = []
+
+        def flush() -> None:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(sql, batch)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+
+        for job in jobs:
+            batch.append(self._row_values(job))
+            if len(batch) >= batch_size:
+                flush()
+                count += len(batch)
+                batch = []
+        if batch:
+            flush()
+            count += len(batch)
+        return count
+
+    def count_jobs(self) -> int:
+        """Return the number of stored jobs."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,213 @@
+"""Rolling success statistics and circuit breakers for extraction strategies."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from ..core.config import get_settings
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+# Success rates closer than this rank as equal and are ordered by latency
+RATE_BUCKET = 0.1
+
+
+@dataclass
+class _Outcome:
+    at: float
+    success: bool
+    latency: float
+
+
+@dataclass
+class _StrategyState:
+    outcomes: deque = field(default_factory=deque)
+    consecutive_failures: int = 0
+    state: str = CLOSED
+    opened_at: float = 0.0
+    probe_started: Optional[float] = None
+
+
+def url_domain(url: str) -> str:
+    """Hostname used to scope statistics (lowercase, without ``www.``/``m.``)."""
+    hostname = (urlparse(url).hostname or "").lower()
+    for prefix in ("www.", "m."):
+        if hostname.startswith(prefix):
+            return hostname[len(prefix) :]
+    return hostname
+
+
+class StrategyStats:
+    """
+    Tracks how each extraction strategy performs per provider and domain.
+
+    Outcomes (success and latency) are kept in a rolling window bounded by
+    sample count and age. ``order`` ranks strategies by smoothed success rate,
+    then by median success latency, keeping the configured order without data.
+
+    Each (provider, domain, strategy) has a circuit breaker. It opens after
+    ``breaker_failures`` consecutive failures and the strategy is skipped for
+    ``breaker_cooldown`` seconds. The breaker then goes half-open: one probe is
+    let through, and its success closes the breaker while a failure reopens it.
+    """
+
+    def __init__(
+        self,
+        window: int = 100,
+        window_seconds: float = 3600.0,
+        breaker_failures: int = 5,
+        breaker_cooldown: float = 300.0,
+    ):
+        """
+        Initialize statistics.
+
+        Args:
+            window: Outcomes kept per strategy
+            window_seconds: Outcomes older than this are dropped
+            breaker_failures: Consecutive failures that open the breaker
+            breaker_cooldown: Seconds an open breaker waits before a probe
+        """
+        self.window = window
+        self.window_seconds = window_seconds
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self._states: dict[tuple[str, str, str], _StrategyState] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "StrategyStats":
+        """Build statistics from application settings."""
+        return cls(
+            window=settings.strategy_stats_window,
+            window_seconds=settings.strategy_stats_window_seconds,
+            breaker_failures=settings.strategy_breaker_failures,
+            breaker_cooldown=settings.strategy_breaker_cooldown_seconds,
+        )
+
+    def _state(self, provider: str, domain: str, strategy: str) -> _StrategyState:
+        key = (provider, domain, strategy)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _StrategyState(outcomes=deque(maxlen=self.window))
+        return state
+
+    def _recent(self, state: _StrategyState, now: float) -> list[_Outcome]:
+        while state.outcomes and now - state.outcomes[0].at > self.window_seconds:
+            state.outcomes.popleft()
+        return list(state.outcomes)
+
+    def _available(self, state: _StrategyState, now: float) -> bool:
+        if state.state == CLOSED:
+            return True
+        if state.state == OPEN and now - state.opened_at < self.breaker_cooldown:
+            return False
+        # Half-open: one probe at a time; a probe that never reported (lost a race) expires
+        state.state = HALF_OPEN
+        return state.probe_started is None or now - state.probe_started >= self.breaker_cooldown
+
+    def order(self, provider: str, domain: str, strategies: Sequence[str]) -> list[str]:
+        """
+        Rank strategies for the next extraction and skip those with an open breaker.
+
+        If every breaker is open, all strategies are returned in ranked order
+        so the request still has a chance.
+
+        Args:
+            provider: Provider name
+            domain: Domain of the URL (see url_domain)
+            strategies: Strategy names in configured order
+
+        Returns:
+            Strategy names to try, best first
+        """
+        now = time.monotonic()
+
+        def rank(item: tuple[int, str]) -> tuple:
+            index, name = item
+            outcomes = self._recent(self._state(provider, domain, name), now)
+            successes = sorted(o.latency for o in outcomes if o.success)
+            rate = (len(successes) + 1) / (len(outcomes) + 2)
+            latency = successes[len(successes) // 2] if successes else float("inf")
+            return -round(rate / RATE_BUCKET), latency, index
+
+        ranked = [name for _, name in sorted(enumerate(strategies), key=rank)]
+        available = [name for name in ranked if self._available(self._state(provider, domain, name), now)]
+        if not available:
+            logger.warning(f"All {provider} strategies for {domain} have open breakers, trying them anyway")
+            return ranked
+        for name in available:
+            state = self._state(provider, domain, name)
+            if state.state == HALF_OPEN:
+                state.probe_started = now
+        if available != list(strategies):
+            logger.info(f"{provider} strategy order for {domain}: {', '.join(available)}")
+        return available
+
+    def record(self, provider: str, domain: str, strategy: str, success: bool, latency: float) -> None:
+        """
+        Record the outcome of a strategy run and update its breaker.
+
+        Args:
+            provider: Provider name
+            domain: Domain of the URL
+            strategy: Strategy name
+            success: Whether the strategy produced a result
+            latency: Seconds the strategy ran
+        """
+        now = time.monotonic()
+        state = self._state(provider, domain, strategy)
+        state.outcomes.append(_Outcome(now, success, latency))
+        state.probe_started = None
+        if success:
+            if state.state != CLOSED:
+                logger.info(f"Closing breaker for {provider}/{domain}/{strategy}")
+            state.consecutive_failures = 0
+            state.state = CLOSED
+            return
+        state.consecutive_failures += 1
+        if state.state == HALF_OPEN or (
+            state.state == CLOSED and state.consecutive_failures >= self.breaker_failures
+        ):
+            logger.warning(
+                f"Opening breaker for {provider}/{domain}/{strategy} "
+                f"after {state.consecutive_failures} consecutive failures"
+            )
+            state.state = OPEN
+            state.opened_at = now
+
+    def snapshot(self) -> dict:
+        """
+        Statistics and breaker states for ops.
+
+        Returns:
+            Nested dict: provider -> domain -> strategy -> stats
+        """
+        now = time.monotonic()
+        result: dict = {}
+        for (provider, domain, strategy), state in sorted(self._states.items()):
+            outcomes = self._recent(state, now)
+            latencies = sorted(o.latency for o in outcomes if o.success)
+            successes = len(latencies)
+            entry = {
+                "samples": len(outcomes),
+                "successes": successes,
+                "success_rate": round(successes / len(outcomes), 3) if outcomes else None,
+                "latency_p50_seconds": round(latencies[len(latencies) // 2], 3) if latencies else None,
+                "latency_p95_seconds": round(latencies[int(len(latencies) * 0.95)], 3) if latencies else None,
+                "breaker": state.state,
+                "consecutive_failures": state.consecutive_failures,
+            }
+            if state.state == OPEN:
+                entry["retry_in_seconds"] = round(max(0.0, state.opened_at + self.breaker_cooldown - now), 1)
+            result.setdefault(provider, {}).setdefault(domain, {})[strategy] = entry
+        return result
+
+
+strategy_stats = StrategyStats.from_settings(get_settings())
@@ -0,0 +1,345 @@
+"""Bounded-memory streaming of HTTP responses to disk."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+import httpx
+from loguru import logger
+
+from .progress import ProgressCallback
+from .resume import ResumeManifest, claim_partial, discard_partial, response_validator
+
+
+# Bytes read from the network per chunk; at most two chunks are held in memory
+CHUNK_SIZE = 1024 * 1024
+# Seconds between resume manifest updates while downloading
+MANIFEST_SAVE_INTERVAL = 2.0
+# Reconnects tolerated by stream_url_chunks
+STREAM_RECONNECTS = 3
+
+CONTENT_RANGE_REGEX = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class DownloadTooLarge(Exception):
+    """Raised when a response exceeds the maximum download size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File exceeds maximum download size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+class IncompleteDownload(Exception):
+    """Raised when a response body ends before its announced length."""
+
+
+@dataclass
+class StreamedFile:
+    """A response body written to disk."""
+
+    path: str
+    size: int
+    sha256: str
+    content_type: str
+
+
+def _hash_prefix(f, digest, length: int) -> None:
+    f.seek(0)
+    while length > 0:
+        chunk = f.read(min(CHUNK_SIZE, length))
+        if not chunk:
+            break
+        digest.update(chunk)
+        length -= len(chunk)
+
+
+async def stream_response_to_file(
+    response: httpx.Response,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    part_path: Optional[str] = None,
+    offset: int = 0,
+) -> StreamedFile:
+    """
+    Write a streaming response body to a file.
+
+    The body is read in fixed-size chunks. Writing and hashing run in a worker
+    thread, overlapped with receiving the next chunk, so memory stays bounded
+    and the event loop never blocks on disk. Data goes to a ``.part`` file
+    which is renamed into place once complete.
+
+    When the response carries a strong validator, a resume manifest is kept
+    next to the ``.part`` file and the partial data survives failures and
+    cancellation, so a later attempt can continue it with a range request.
+
+    Args:
+        response: Response opened with ``client.stream()``
+        path: Destination file
+        progress: Optional callback for download progress
+        max_bytes: Abort once the file exceeds this many bytes (None/0 disables)
+        chunk_size: Bytes per chunk
+        part_path: In-progress file (defaults to ``<path>.part``)
+        offset: Bytes already in the ``.part`` file that the response (a 206) continues
+
+    Returns:
+        StreamedFile with size and sha256 of the file
+
+    Raises:
+        DownloadTooLarge: If the file exceeds max_bytes
+        IncompleteDownload: If the body is shorter than announced
+    """
+    length = int(response.headers.get("content-length") or 0) or None
+    total = offset + length if length else None
+    if max_bytes and total and total > max_bytes:
+        raise DownloadTooLarge(max_bytes)
+
+    part_path = part_path or f"{path}.part"
+    os.makedirs(os.path.dirname(part_path) or ".", exist_ok=True)
+    validator = response_validator(response)
+    manifest = None
+    if validator:
+        manifest = ResumeManifest(
+            url=str(response.url),
+            size=total,
+            validator=validator,
+            content_type=response.headers.get("content-type", ""),
+        )
+    elif not offset:
+        discard_partial(part_path)
+
+    digest = hashlib.sha256()
+    done = offset
+    written = offset
+    saved_at = time.monotonic()
+    if progress:
+        progress("downloading", done, total)
+
+    def record(f) -> None:
+        f.flush()
+        manifest.completed = [(0, written - 1)] if written else []
+        manifest.save(part_path)
+
+    def write(f, chunk: bytes) -> None:
+        nonlocal written, saved_at
+        f.write(chunk)
+        digest.update(chunk)
+        written += len(chunk)
+        if manifest is not None and time.monotonic() - saved_at >= MANIFEST_SAVE_INTERVAL:
+            saved_at = time.monotonic()
+            record(f)
+
+    if offset:
+        # Rehash the bytes already on disk and continue after them
+        f = open(part_path, "r+b")
+        f.truncate(offset)
+        await asyncio.to_thread(_hash_prefix, f, digest, offset)
+        f.seek(offset)
+    else:
+        f = open(part_path, "wb")
+    if manifest is not None:
+        record(f)
+    pending: Optional[asyncio.Future] = None
+    try:
+        async for chunk in response.aiter_bytes(chunk_size):
+            done += len(chunk)
+            if max_bytes and done > max_bytes:
+                raise DownloadTooLarge(max_bytes)
+            if pending is not None:
+                # Shielded: on cancellation the write must still finish before the file closes
+                await asyncio.shield(pending)
+            pending = asyncio.ensure_future(asyncio.to_thread(write, f, chunk))
+            if progress:
+                progress("downloading", done, total)
+        if pending is not None:
+            await asyncio.shield(pending)
+            pending = None
+        if total is not None and done != total:
+            raise IncompleteDownload(f"Received {done} of {total} bytes")
+    except BaseException as e:
+        if pending is not None:
+            # Let the in-flight write finish before closing the file
+            await asyncio.gather(pending, return_exceptions=True)
+        keep = manifest is not None and written > 0 and not isinstance(e, DownloadTooLarge)
+        if keep:
+            try:
+                record(f)
+            except OSError:
+                keep = False
+        f.close()
+        if keep:
+            logger.info(f"Kept partial download {part_path} ({written} bytes) for resuming")
+        else:
+            discard_partial(part_path)
+        raise
+
+    f.close()
+    os.replace(part_path, path)
+    discard_partial(part_path)
+    return StreamedFile(
+        path=path,
+        size=done,
+        sha256=digest.hexdigest(),
+        content_type=response.headers.get("content-type", ""),
+    )
+
+
+async def stream_url_to_file(
+    client: httpx.AsyncClient,
+    url: str,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    max_bytes: Optional[int] = None,
+    resume_key: Optional[str] = None,
+) -> StreamedFile:
+    """
+    Download a URL to a file with bounded memory, resuming a partial download.
+
+    If a partial file with a manifest exists, the request asks for the bytes
+    after its contiguous prefix with ``If-Range``. A 206 continuing at that
+    offset is appended; a 200 means the file changed (or ranges are not
+    supported) and the download starts over with that response.
+
+    Args:
+        client: HTTP client
+        url: URL to download
+        path: Destination file
+        progress: Optional callback for download progress
+        max_bytes: Abort once the file exceeds this many bytes (None/0 disables)
+        resume_key: Stable identity of the content, shared by retries (see claim_partial)
+
+    Returns:
+        StreamedFile with size and sha256 of the file
+    """
+    with claim_partial(path, resume_key) as part_path:
+        return await stream_url_to_partial(client, url, path, part_path, progress, max_bytes)
+
+
+async def stream_url_to_partial(
+    client: httpx.AsyncClient,
+    url: str,
+    path: str,
+    part_path: str,
+    progress: Optional[ProgressCallback],
+    max_bytes: Optional[int],
+) -> StreamedFile:
+    """
+    stream_url_to_file() through a partial file the caller has claimed (see claim_partial).
+
+    Args:
+        client: HTTP client
+        url: URL to download
+        path: Destination file
+        part_path: Claimed in-progress file, resumed if it has a manifest
+        progress: Optional callback for download progress
+        max_bytes: Abort once the file exceeds this many bytes (None/0 disables)
+
+    Returns:
+        StreamedFile with size and sha256 of the file
+    """
+    manifest = ResumeManifest.load(part_path)
+    offset = manifest.prefix_bytes() if manifest is not None else 0
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        headers["If-Range"] = manifest.validator
+
+    async with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+        response.raise_for_status()
+        if offset:
+            match = CONTENT_RANGE_REGEX.match(response.headers.get("content-range", ""))
+            if response.status_code == 206 and match and int(match.group(1)) == offset:
+                size = None if match.group(3) == "*" else int(match.group(3))
+                if manifest.size is None or size == manifest.size:
+                    logger.info(f"Resuming download of {url} at byte {offset}")
+                    return await stream_response_to_file(
+                        response, path, progress, max_bytes, part_path=part_path, offset=offset
+                    )
+            elif response.status_code != 206:
+                logger.info(f"{url} changed since the partial download, starting over")
+                return await stream_response_to_file(response, path, progress, max_bytes, part_path=part_path)
+        else:
+            return await stream_response_to_file(response, path, progress, max_bytes, part_path=part_path)
+
+    # A range reply that does not continue the partial file: discard it and start over
+    discard_partial(part_path)
+    return await stream_url_to_partial(client, url, path, part_path, progress, max_bytes)
+
+
+async def stream_url_chunks(
+    client: httpx.AsyncClient,
+    url: str,
+    progress: Optional[ProgressCallback] = None,
+    max_bytes: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    request_headers: Optional[dict[str, str]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Yield a URL's body in chunks, for consumers that process it as it arrives.
+
+    If the connection drops, the request is reopened at the current offset
+    with ``Range`` and ``If-Range``, so a long stream survives network
+    hiccups without buffering anything beyond the current chunk.
+
+    Args:
+        client: HTTP client
+        url: URL to download
+        progress: Optional callback for download progress
+        max_bytes: Abort once the body exceeds this many bytes (None/0 disables)
+        chunk_size: Bytes per chunk
+        request_headers: Extra headers sent with every request
+
+    Yields:
+        Body chunks in order
+
+    Raises:
+        DownloadTooLarge: If the body exceeds max_bytes
+        IncompleteDownload: If the server cannot continue an interrupted body
+    """
+    done = 0
+    total: Optional[int] = None
+    validator: Optional[str] = None
+    reconnects = 0
+    while True:
+        headers = {**(request_headers or {}), "Accept-Encoding": "identity"}
+        if done:
+            headers["Range"] = f"bytes={done}-"
+            headers["If-Range"] = validator
+        try:
+            async with client.stream("GET", url, headers=headers, follow_redirects=True) as response:
+                response.raise_for_status()
+                if done:
+                    match = CONTENT_RANGE_REGEX.match(response.headers.get("content-range", ""))
+                    if response.status_code != 206 or not match or int(match.group(1)) != done:
+                        raise IncompleteDownload(f"Server cannot continue the stream at byte {done}")
+                else:
+                    total = int(response.headers.get("content-length") or 0) or None
+                    validator = response_validator(response)
+                    if max_bytes and total and total > max_bytes:
+                        raise DownloadTooLarge(max_bytes)
+                    if progress:
+                        progress("downloading", 0, total)
+                async for chunk in response.aiter_bytes(chunk_size):
+                    done += len(chunk)
+                    if max_bytes and done > max_bytes:
+                        raise DownloadTooLarge(max_bytes)
+                    yield chunk
+                    if progress:
+                        progress("downloading", done, total)
+            if total is None or done >= total:
+                return
+            error: Exception = IncompleteDownload(f"Received {done} of {total} bytes")
+        except httpx.TransportError as e:
+            error = e
+        reconnects += 1
+        if reconnects > STREAM_RECONNECTS or (done and not validator):
+            raise error
+        logger.warning(f"Stream interrupted at byte {done} ({error}), reconnecting")
+        await asyncio.sleep(min(2**reconnects * 0.5, 5.0))
@@ -0,0 +1,90 @@
+"""Pass-level checkpoint cache for the multi-pass rewrite pipeline."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from ..core.config import get_settings
+
+
+def root_key(text: str) -> str:
+    """Checkpoint key for the pipeline input (before any pass has run)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pass_key(parent_key: str, *parts: object) -> str:
+    """
+    Derive the checkpoint key for a pass.
+
+    The key chains the key of the pass input with everything the pass itself
+    depends on (rendered prompts, temperature), so a pass stays valid exactly
+    as long as its input and its own parameters are unchanged.
+
+    Args:
+        parent_key: Key of the previous pass (or ``root_key`` of the input)
+        *parts: Values the pass output depends on
+
+    Returns:
+        Hex digest key
+    """
+    digest = hashlib.sha256(parent_key.encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x00")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CheckpointStore:
+    """Bounded in-process LRU of pass outputs with a TTL."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: int = 3600):
+        """
+        Initialize checkpoint store.
+
+        Args:
+            max_entries: Maximum number of pass outputs kept
+            ttl_seconds: Lifetime of a checkpoint
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the checkpointed text for a key, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, text = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text
+
+    def put(self, key: str, text: str) -> None:
+        """Store a pass output, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), text)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all checkpoints."""
+        with self._lock:
+            self._entries.clear()
+
+
+_settings = get_settings()
+checkpoint_store = CheckpointStore(
+    max_entries=_settings.humanizer_checkpoint_max_entries,
+    ttl_seconds=_settings.humanizer_checkpoint_ttl_seconds,
+)
@@ -1,7 +1,9 @@
 """LLM prompts for text humanization (multi-mode, multi-language)."""
 
+from typing import Optional
 
-def get_system_prompt(mode: str, lang: str, strict_meaning: str, voice_strength: int) -> str:
+
+def get_system_prompt(mode: str, lang: str, strict_meaning: str, voice_strength: Optional[int]) -> str:
     """
     Get system prompt for humanization based on mode and language.
     
@@ -9,7 +11,7 @@ def get_system_prompt(mode: str, lang: str, strict_meaning: str, voice_strength:
         mode: Humanization mode ("standard", "academic", "business", "narrative")
         lang: Language code ("en" or "fa")
         strict_meaning: How strictly to preserve meaning ("low", "medium", "high")
-        voice_strength: Voice strength (0-100)
+        voice_strength: Voice strength (0-100), or None to leave voice out of the prompt
     
     Returns:
         System prompt string
@@ -20,7 +22,7 @@ def get_system_prompt(mode: str, lang: str, strict_meaning: str, voice_strength:
         return _get_english_prompt(mode, strict_meaning, voice_strength)
 
 
-def _get_english_prompt(mode: str, strict_meaning: str, voice_strength: int) -> str:
+def _get_english_prompt(mode: str, strict_meaning: str, voice_strength: Optional[int]) -> str:
     """Get English system prompt."""
     base_prompt = """You are a professional human editor. Your task is to rewrite text so it sounds naturally written by a human, not an AI.
 
@@ -37,8 +39,9 @@ Core principles:
         "low": "Preserve the general meaning. You may slightly adapt or rephrase content while maintaining the main message.",
     }
 
-    voice_instruction = ""
-    if voice_strength >= 70:
+    if voice_strength is None:
+        voice_instruction = ""
+    elif voice_strength >= 70:
         voice_instruction = "Use a strong, distinctive voice with personality and character."
     elif voice_strength >= 40:
         voice_instruction = "Use a moderate voice with some personality while maintaining professionalism."
@@ -78,15 +81,13 @@ Style: Storytelling and narrative flow.
     return f"""{base_prompt}
 
 {meaning_strictness.get(strict_meaning, meaning_strictness["high"])}
-
-{voice_instruction}
-
+{_voice_section(voice_instruction)}
 {mode_specific.get(mode, mode_specific["standard"])}
 
 Output only the rewritten text. Do not add explanations, comments, or meta-commentary."""
 
 
-def _get_persian_prompt(mode: str, strict_meaning: str, voice_strength: int) -> str:
+def _get_persian_prompt(mode: str, strict_meaning: str, voice_strength: Optional[int]) -> str:
     """Get Persian/Farsi system prompt with native Persian cadence."""
     base_prompt = """شما یک ویراستار حرفه‌ای هستید. وظیفه شما بازنویسی متن است تا به‌طور طبیعی توسط انسان نوشته شده باشد، نه هوش مصنوعی.
 
@@ -103,8 +104,9 @@ def _get_persian_prompt(mode: str, strict_meaning: str, voice_strength: int) ->
         "low": "معنی کلی را حفظ کنید. می‌توانید محتوا را تا حدودی تطبیق داده یا بازنویسی کنید در حالی که پیام اصلی را حفظ می‌کنید.",
     }
 
-    voice_instruction = ""
-    if voice_strength >= 70:
+    if voice_strength is None:
+        voice_instruction = ""
+    elif voice_strength >= 70:
         voice_instruction = "از صدای قوی و متمایز با شخصیت و ویژگی استفاده کنید."
     elif voice_strength >= 40:
         voice_instruction = "از صدای متوسط با مقداری شخصیت در عین حفظ حرفه‌ای بودن استفاده کنید."
@@ -144,14 +146,17 @@ def _get_persian_prompt(mode: str, strict_meaning: str, voice_strength: int) ->
     return f"""{base_prompt}
 
 {meaning_strictness.get(strict_meaning, meaning_strictness["high"])}
-
-{voice_instruction}
-
+{_voice_section(voice_instruction)}
 {mode_specific.get(mode, mode_specific["standard"])}
 
 فقط متن بازنویسی شده را خروجی دهید. توضیحات، نظرات یا متا-کامنت اضافه نکنید."""
 
 
+def _voice_section(voice_instruction: str) -> str:
+    """Render the voice instruction block (empty when the pass has no voice)."""
+    return f"\n{voice_instruction}\n" if voice_instruction else ""
+
+
 def get_user_prompt(
     text: str, preserve_keywords: list[str], avoid_phrases: list[str]
 ) -> str:
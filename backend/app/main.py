@@ -6,13 +6,13 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from loguru import logger
 
 from .core.config import get_settings
+from .core.ytdlp_process import ytdlp_pool
 from .routes import download, health, transcribe
 from .routers import download as download_router_module
-from .workers.cleanup import start_cleanup_scheduler
+from .workers.storage import StorageArea, StorageManager, TrackedStaticFiles, start_storage_scheduler
 from .humanizer import router as humanizer_router
 
 
@@ -30,12 +30,28 @@ if settings.allowed_origins:
     )
 
 os.makedirs(settings.audio_root, exist_ok=True)
-app.mount("/files", StaticFiles(directory=settings.audio_root), name="files")
+app.mount("/files", TrackedStaticFiles(directory=settings.audio_root), name="files")
 
 # Mount media storage for downloader engine
-media_dir = Path("storage/media")
+media_dir = Path(settings.storage_media_dir)
 media_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/media", StaticFiles(directory=str(media_dir)), name="media")
+app.mount("/media", TrackedStaticFiles(directory=str(media_dir)), name="media")
+
+storage_manager = StorageManager(
+    areas=[
+        StorageArea(
+            "media",
+            str(media_dir),
+            settings.storage_media_ttl_seconds,
+            job_outputs=True,
+            content_addressed=settings.storage_dedup,
+        ),
+        StorageArea("audio", settings.audio_root, settings.cleanup_max_age_seconds),
+    ],
+    job_store=download_router_module.job_store,
+    quota_bytes=settings.storage_quota_bytes,
+    job_ttl_seconds=settings.storage_job_ttl_seconds,
+)
 
 app.include_router(download.router)
 app.include_router(health.router)
@@ -49,12 +65,10 @@ async def on_startup():
     logger.info("Starting Nativewrite backend")
     os.makedirs(settings.audio_root, exist_ok=True)
     app.state.cleanup_task = asyncio.create_task(
-        start_cleanup_scheduler(
-            settings.audio_root,
-            settings.cleanup_interval_seconds,
-            settings.cleanup_max_age_seconds,
-        )
+        start_storage_scheduler(storage_manager, settings.cleanup_interval_seconds)
     )
+    await download_router_module.registry.open()
+    await download_router_module.download_queue.start()
 
 
 @app.on_event("shutdown")
@@ -63,4 +77,7 @@ async def on_shutdown():
     task = getattr(app.state, "cleanup_task", None)
     if task:
         task.cancel()
+    await download_router_module.download_queue.stop()
+    await download_router_module.registry.close()
+    await ytdlp_pool.close()
 
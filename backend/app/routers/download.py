@@ -3,22 +3,51 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 from ..core.config import get_settings
 from ..core.security import require_api_key, enforce_rate_limit
-from ..downloader import JobStore, ProviderRegistry
+from ..downloader import DownloadJob, DownloadQueue, ProviderRegistry, create_job_store
+from ..core.youtube_extractor import extract_playlist_entries
+from ..core.ytdlp_process import YtDlpProcessError
+from ..downloader.batch import refresh_batch, summarize_batch
+from ..downloader.events import job_events
+from ..downloader.http_pool import HttpClientPool
+from ..downloader.jobs import BATCH_PROVIDER
+from ..downloader.metadata_cache import metadata_cache
+from ..downloader.strategy_stats import strategy_stats
+from ..workers.storage import touch
 
 router = APIRouter(prefix="/api", tags=["download"])
 
-# Initialize registry and job store
-registry = ProviderRegistry()
-job_store = JobStore()
+SSE_KEEPALIVE_SECONDS = 15
+
+# Clients may reorder their own jobs within this range, not jump the whole queue
+MAX_PRIORITY = 10
+
+# Initialize registry, job store and queue (opened and started from app startup)
+settings = get_settings()
+registry = ProviderRegistry(HttpClientPool.from_settings(settings), plugins=settings.download_provider_plugins)
+job_store = create_job_store()
+download_queue = DownloadQueue(
+    job_store,
+    registry,
+    workers=settings.download_workers,
+    provider_limits=settings.download_provider_concurrency,
+    media_dir=settings.storage_media_dir,
+    dedup=settings.storage_dedup,
+    lease_seconds=settings.download_lease_seconds,
+)
 
 
 class DownloadRequest(BaseModel):
@@ -26,6 +55,16 @@ class DownloadRequest(BaseModel):
 
     url: HttpUrl
     type: str = "audio"  # "audio" or "video"
+    priority: int = Field(0, ge=-MAX_PRIORITY, le=MAX_PRIORITY)  # Higher runs first
+
+
+class BatchDownloadRequest(BaseModel):
+    """Request to download several URLs and/or a playlist."""
+
+    urls: List[HttpUrl] = []
+    playlist_url: Optional[HttpUrl] = None  # Expanded into its entries
+    type: str = "audio"  # "audio" or "video"
+    priority: int = Field(0, ge=-MAX_PRIORITY, le=MAX_PRIORITY)  # Higher runs first
 
 
 class DownloadResponse(BaseModel):
@@ -48,105 +87,234 @@ class JobStatusResponse(BaseModel):
     download_url: Optional[str] = None
     metadata: dict = {}
     error_message: Optional[str] = None
+    progress: dict = {}
     created_at: str
     updated_at: str
 
 
-async def process_download_job(job_id: str, url: str, output_type: str) -> None:
+class JobListResponse(BaseModel):
+    """A page of jobs."""
+
+    jobs: List[JobStatusResponse]
+    next_cursor: Optional[str] = None  # Pass as ``cursor`` to get the next page
+
+
+class BatchItem(BaseModel):
+    """Outcome of one URL in a batch request."""
+
+    url: str
+    job_id: Optional[str] = None
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchDownloadResponse(BaseModel):
+    """Response for batch creation."""
+
+    batch_id: str
+    status: str
+    total: int
+    items: List[BatchItem]
+
+
+class BatchStatusResponse(BaseModel):
+    """Aggregate status of a batch."""
+
+    batch_id: str
+    title: Optional[str] = None
+    status: str
+    total: int
+    counts: dict
+    percent: float
+    jobs: List[JobStatusResponse]
+    created_at: str
+    updated_at: str
+
+
+class MediaFormat(BaseModel):
+    """One format offered for a media item."""
+
+    format_id: str
+    ext: Optional[str] = None
+    protocol: Optional[str] = None
+    vcodec: Optional[str] = None
+    acodec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    abr: Optional[float] = None  # Audio bitrate, kbit/s
+    tbr: Optional[float] = None  # Total bitrate, kbit/s
+    filesize: Optional[int] = None  # Exact or approximate bytes
+    format_note: Optional[str] = None
+
+
+class MediaProbeResponse(BaseModel):
+    """Metadata of a media item, extracted without downloading."""
+
+    url: str
+    media_key: str
+    provider: str
+    title: Optional[str] = None
+    duration: Optional[float] = None
+    uploader: Optional[str] = None
+    thumbnail: Optional[str] = None
+    is_live: Optional[bool] = None
+    formats: List[MediaFormat] = []
+    cached: bool  # Served from the metadata cache
+
+
+# Statuses after which a job no longer changes
+FINAL_STATUSES = ("completed", "failed", "expired")
+
+
+def build_job_status(job: DownloadJob) -> JobStatusResponse:
     """
-    Background task to process a download job.
+    Build the status response for a job.
 
     Args:
-        job_id: Job ID
-        url: URL to download
-        output_type: "audio" or "video"
+        job: Job to describe
+
+    Returns:
+        JobStatusResponse including the download URL once completed
     """
-    from ..core.config import get_settings
+    download_url = None
+    if job.status == "completed" and job.output_path:
+        ext = Path(job.output_path).suffix
+        download_url = f"/media/{job.job_id}{ext}"
 
-    settings = get_settings()
-    media_dir = Path("storage/media")
-    media_dir.mkdir(parents=True, exist_ok=True)
+    return JobStatusResponse(
+        job_id=job.job_id,
+        status=job.status,
+        url=job.url,
+        provider=job.provider,
+        output_type=job.output_type,
+        download_url=download_url,
+        metadata=job.metadata,
+        error_message=job.error_message,
+        progress=job.progress,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
 
-    # Update job to running
-    job_store.update_job_status(job_id, "running")
 
-    # Get provider
-    provider = registry.get_provider(str(url))
-    if not provider:
-        job_store.update_job_status(
-            job_id,
-            "failed",
-            error_message="No suitable provider found for this URL",
-        )
-        return
+# Statuses that count as a dedup hit: finished, or still being downloaded
+ACTIVE_STATUSES = ("pending", "running")
+
+
+def retry_allowed(job: DownloadJob) -> bool:
+    """
+    Check whether a failed job's backoff has elapsed.
+
+    The backoff doubles with each consecutive failed attempt.
+
+    Args:
+        job: Failed job
 
-    # Perform download
+    Returns:
+        True if a new download may be attempted
+    """
+    settings = get_settings()
+    attempt = int(job.metadata.get("attempt", 1))
+    backoff = min(
+        settings.download_retry_backoff_seconds * 2 ** (attempt - 1),
+        settings.download_retry_backoff_max_seconds,
+    )
     try:
-        result = await provider.download(
-            str(url),
-            str(media_dir),
-            output_type=output_type,
-            job_id=job_id,
-        )
+        failed_at = datetime.fromisoformat(job.updated_at)
+    except ValueError:
+        return True
+    return (datetime.utcnow() - failed_at).total_seconds() >= backoff
 
-        if result.success and result.output_path:
-            # Get file extension
-            output_path = Path(result.output_path)
-            ext = output_path.suffix
 
-            # Determine download URL
-            download_url = f"/media/{job_id}{ext}"
+def media_available(job: DownloadJob) -> bool:
+    """
+    Check that a completed job's output is still on disk.
 
-            # Update job with success
-            job_store.update_job_status(
-                job_id,
-                "completed",
-                output_path=str(result.output_path),
-                metadata=result.metadata,
-            )
-        else:
-            # Update job with failure
-            job_store.update_job_status(
-                job_id,
-                "failed",
-                error_message=result.error_message or "Download failed",
-            )
+    Records the access for LRU eviction, or marks the job ``expired`` if the
+    file is gone so the media is downloaded again.
 
-    except Exception as e:
-        logger.error(f"Download job {job_id} error: {e}")
-        job_store.update_job_status(
-            job_id,
-            "failed",
-            error_message=f"Download error: {str(e)}",
-        )
+    Args:
+        job: Job to check
 
+    Returns:
+        False if the job is completed but its output no longer exists
+    """
+    if job.status != "completed":
+        return True
+    if job.output_path and os.path.exists(job.output_path):
+        touch(job.output_path)
+        return True
+    job_store.update_job_status(
+        job.job_id,
+        "expired",
+        error_message="Media was removed from storage; request it again to re-download",
+    )
+    return False
 
-@router.post("/download", dependencies=[Depends(require_api_key)])
-async def create_download_job(
-    request: DownloadRequest,
-    background_tasks: BackgroundTasks,
-    req: Request,
-):
+
+def find_existing_job(url: str, output_type: Optional[str], include_failed: bool = False) -> Optional[DownloadJob]:
     """
-    Create a new download job.
+    Find a job for the same media and output type.
 
-    Returns immediately with job_id, processes download in background.
+    Completed jobs are preferred, then pending/running ones so concurrent
+    requests attach to the download already in flight. Dedups on the provider's
+    canonical media key, falling back to the raw URL for jobs created before
+    media keys were recorded.
+
+    Args:
+        url: Requested URL
+        output_type: "audio" or "video", or None to match either
+        include_failed: Also return a failed job whose retry backoff has not elapsed
+
+    Returns:
+        Matching DownloadJob or None
     """
-    enforce_rate_limit(req)
+    provider = registry.get_provider(url)
+    if provider:
+        media_key = provider.canonicalize(url)
+        job = job_store.find_job_by_media_key(media_key, output_type)
+        if job and not media_available(job):
+            job = None
+        job = job or job_store.find_job_by_media_key(media_key, output_type, statuses=ACTIVE_STATUSES)
+        if job:
+            return job
+        if include_failed:
+            failed = job_store.find_job_by_media_key(media_key, output_type, statuses=("failed",))
+            if failed and not retry_allowed(failed):
+                return failed
 
-    url_str = str(request.url)
-    output_type = request.type
+    job = job_store.find_job_by_url(url)
+    if (
+        job
+        and job.provider != BATCH_PROVIDER
+        and (output_type is None or job.output_type == output_type)
+        and media_available(job)
+    ):
+        return job
+    return None
+
+
+async def submit_download(
+    url_str: str,
+    output_type: str,
+    priority: int = 0,
+    parent_id: Optional[str] = None,
+) -> tuple[DownloadJob, bool]:
+    """
+    Attach to an existing job for the media or create and queue a new one.
 
-    # Check if job already exists for this URL
-    existing_job = job_store.find_job_by_url(url_str)
-    if existing_job:
-        return DownloadResponse(
-            job_id=existing_job.job_id,
-            status=existing_job.status,
-            url=existing_job.url,
-            provider=existing_job.provider,
-        )
+    Args:
+        url_str: URL to download
+        output_type: "audio" or "video"
+        priority: Queue priority for a new job
+        parent_id: Batch job a new job belongs to
 
+    Returns:
+        (job, created) where created is False when an existing job was reused
+
+    Raises:
+        HTTPException: If no provider handles the URL
+    """
     # Get provider
     provider = registry.get_provider(url_str)
     if not provider:
@@ -154,13 +322,60 @@ async def create_download_job(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No suitable provider found for this URL",
         )
+    media_key = provider.canonicalize(url_str)
+
+    # Attach to a completed or in-flight job for the same media and output type
+    existing_job = find_existing_job(url_str, output_type, include_failed=True)
+
+    if not existing_job:
+        # Reserve the media key so concurrent requests (in any worker process)
+        # wait for our job instead of creating their own
+        reservation = f"{media_key}|{output_type}"
+        while not job_store.reserve(reservation, settings.download_reservation_ttl_seconds):
+            await asyncio.sleep(0.05)
+            existing_job = find_existing_job(url_str, output_type, include_failed=True)
+            if existing_job:
+                break
+
+        if not existing_job:
+            try:
+                existing_job = find_existing_job(url_str, output_type, include_failed=True)
+                if not existing_job:
+                    previous = job_store.find_job_by_media_key(media_key, output_type, statuses=("failed",))
+                    attempt = int(previous.metadata.get("attempt", 1)) + 1 if previous else 1
+                    job = job_store.create_job(
+                        url_str,
+                        provider.name,
+                        output_type,
+                        media_key=media_key,
+                        metadata={"attempt": attempt},
+                        priority=priority,
+                        parent_id=parent_id,
+                    )
+            finally:
+                job_store.release(reservation)
+
+    if existing_job:
+        return existing_job, False
+
+    # Queue the download
+    download_queue.submit(job)
+    return job, True
 
-    # Create job
-    job = job_store.create_job(url_str, provider.name, output_type)
 
-    # Schedule background task
-    background_tasks.add_task(process_download_job, job.job_id, url_str, output_type)
+@router.post("/download", dependencies=[Depends(require_api_key)])
+async def create_download_job(
+    request: DownloadRequest,
+    req: Request,
+):
+    """
+    Create a new download job.
+
+    Returns immediately with job_id, the download runs on the queue workers.
+    """
+    enforce_rate_limit(req)
 
+    job, _ = await submit_download(str(request.url), request.type, request.priority)
     return DownloadResponse(
         job_id=job.job_id,
         status=job.status,
@@ -169,79 +384,422 @@ async def create_download_job(
     )
 
 
+@router.post("/download/batch", dependencies=[Depends(require_api_key)])
+async def create_batch_download(
+    request: BatchDownloadRequest,
+    req: Request,
+):
+    """
+    Create download jobs for a list of URLs and/or a playlist.
+
+    The playlist is expanded with a metadata-only extraction. Each URL gets a
+    child job (or attaches to an existing job for the same media) and is
+    queued individually, so the items download in parallel on the worker
+    pool. Track the batch with ``GET /api/download/batch/{batch_id}``.
+
+    Returns:
+        Batch ID and the job (or error) for each URL
+    """
+    enforce_rate_limit(req)
+
+    max_items = settings.download_batch_max_items
+    urls = [str(url) for url in request.urls]
+    title = None
+    if request.playlist_url:
+        try:
+            title, entries = await extract_playlist_entries(
+                str(request.playlist_url),
+                max_items,
+                settings.youtube_cookies_file or None,
+            )
+        except Exception as e:
+            logger.warning(f"Playlist expansion failed for {request.playlist_url}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not read playlist: {e}",
+            )
+        urls.extend(entries)
+
+    # Drop repeated URLs, keeping order
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No URLs to download",
+        )
+    if len(urls) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch exceeds {max_items} URLs",
+        )
+
+    batch = job_store.create_job(
+        str(request.playlist_url or ""),
+        BATCH_PROVIDER,
+        request.type,
+        metadata={"title": title, "children": None},  # Set once all children exist
+        status="running",
+    )
+
+    items: list[BatchItem] = []
+    children: list[str] = []
+    for url_str in urls:
+        try:
+            job, _ = await submit_download(url_str, request.type, request.priority, parent_id=batch.job_id)
+        except HTTPException as e:
+            items.append(BatchItem(url=url_str, error=e.detail))
+            continue
+        if job.job_id not in children:
+            children.append(job.job_id)
+        items.append(BatchItem(url=url_str, job_id=job.job_id, status=job.status))
+
+    batch.metadata["children"] = children
+    job_store.save_job(batch)
+    summary = refresh_batch(job_store, batch.job_id)
+
+    return BatchDownloadResponse(
+        batch_id=batch.job_id,
+        status=summary["status"],
+        total=summary["total"],
+        items=items,
+    )
+
+
+@router.get("/download/batch/{batch_id}", dependencies=[Depends(require_api_key)])
+async def get_batch_status(batch_id: str):
+    """
+    Get aggregate status of a batch and the status of each child job.
+
+    Args:
+        batch_id: Batch ID
+
+    Returns:
+        Batch status, per-status counts, overall percent and child jobs
+    """
+    batch = job_store.get_job(batch_id)
+    if not batch or batch.provider != BATCH_PROVIDER:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Batch {batch_id} not found",
+        )
+
+    refresh_batch(job_store, batch_id)
+    batch = job_store.get_job(batch_id) or batch
+    summary, children = summarize_batch(job_store, batch)
+    return BatchStatusResponse(
+        batch_id=batch.job_id,
+        title=batch.metadata.get("title"),
+        status=summary["status"],
+        total=summary["total"],
+        counts=summary["counts"],
+        percent=summary["percent"],
+        jobs=[build_job_status(child) for child in children],
+        created_at=batch.created_at,
+        updated_at=batch.updated_at,
+    )
+
+
+@router.get("/download/queue", dependencies=[Depends(require_api_key)])
+async def get_queue_stats():
+    """
+    Get download queue depth, running jobs and wait times.
+
+    Returns:
+        Queue statistics
+    """
+    return download_queue.stats()
+
+
+@router.get("/download/strategies", dependencies=[Depends(require_api_key)])
+async def get_strategy_stats():
+    """
+    Get extraction strategy success rates, latencies and circuit breaker states.
+
+    Returns:
+        Statistics per provider, domain and strategy
+    """
+    return strategy_stats.snapshot()
+
+
+def to_utc_iso(value: Optional[datetime]) -> Optional[str]:
+    """Convert a query datetime to the naive UTC ISO format jobs are stored with."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+@router.get("/download/jobs", dependencies=[Depends(require_api_key)])
+async def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status", description="Job status"),
+    provider: Optional[str] = Query(None, description="Provider name"),
+    type: Optional[str] = Query(None, description='Output type ("audio" or "video")'),
+    created_from: Optional[datetime] = Query(None, description="Created at or after (ISO 8601, UTC if no offset)"),
+    created_to: Optional[datetime] = Query(None, description="Created before (ISO 8601, UTC if no offset)"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+):
+    """
+    List jobs, newest first, with filters and cursor pagination.
+
+    Served from the job store's indexes, so cost depends on the page size
+    rather than the total number of jobs.
+
+    Returns:
+        Page of job statuses and the cursor for the next page
+    """
+    try:
+        jobs, next_cursor = job_store.list_jobs(
+            status=status_filter,
+            provider=provider,
+            output_type=type,
+            created_from=to_utc_iso(created_from),
+            created_to=to_utc_iso(created_to),
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return JobListResponse(jobs=[build_job_status(job) for job in jobs], next_cursor=next_cursor)
+
+
+def job_etag(job: DownloadJob) -> str:
+    """Weak ETag for a job version (changes whenever the record is saved)."""
+    digest = hashlib.sha1(f"{job.job_id}:{job.updated_at}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag.removeprefix("W/") for candidate in candidates)
+
+
 @router.get("/download/{job_id}", dependencies=[Depends(require_api_key)])
-async def get_job_status(job_id: str):
+async def get_job_status(
+    job_id: str,
+    request: Request,
+    response: Response,
+    wait: float = Query(0, ge=0, description="Long-poll: seconds to wait for the job to change"),
+):
     """
     Get status of a download job.
 
+    Supports conditional requests: the response carries an ``ETag`` and a
+    matching ``If-None-Match`` yields ``304 Not Modified``. With ``wait=N`` the
+    request is held until the job's status changes (or N seconds pass, capped
+    by settings). If the client sent an ``If-None-Match`` that is already out
+    of date, the request returns immediately.
+
     Args:
         job_id: Job ID
+        wait: Long-poll timeout in seconds
 
     Returns:
-        Job status and metadata
+        Job status and metadata, or 304 if unchanged
     """
-    job = job_store.get_job(job_id)
-    if not job:
+    if_none_match = request.headers.get("if-none-match")
+    wait = min(wait, settings.download_long_poll_max_seconds)
+
+    # Subscribe before reading so a change between the read and the wait is not missed
+    queue = job_events.subscribe(job_id) if wait > 0 else None
+    try:
+        job = job_store.get_job(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Job {job_id} not found",
+            )
+
+        unchanged = if_none_match is None or etag_matches(if_none_match, job_etag(job))
+        if queue is not None and unchanged and job.status not in FINAL_STATUSES:
+            deadline = asyncio.get_running_loop().time() + wait
+            while True:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if message["event"] == "status":
+                    break
+            job = job_store.get_job(job_id) or job
+    finally:
+        if queue is not None:
+            job_events.unsubscribe(job_id, queue)
+
+    etag = job_etag(job)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return build_job_status(job)
+
+
+@router.get("/download/{job_id}/events", dependencies=[Depends(require_api_key)])
+async def stream_job_events(job_id: str):
+    """
+    Stream live job updates as Server-Sent Events.
+
+    Sends a ``status`` event with the full job status first, then ``progress``
+    events (stage, bytes, ETA) while the download runs and a ``status`` event
+    on every state change. The stream ends once the job completes or fails.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        text/event-stream response
+    """
+    if not job_store.get_job(job_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job {job_id} not found",
         )
 
-    # Build download URL if completed
-    download_url = None
-    if job.status == "completed" and job.output_path:
-        output_path = Path(job.output_path)
-        ext = output_path.suffix
-        download_url = f"/media/{job_id}{ext}"
-
-    return JobStatusResponse(
-        job_id=job.job_id,
-        status=job.status,
-        url=job.url,
-        provider=job.provider,
-        output_type=job.output_type,
-        download_url=download_url,
-        metadata=job.metadata,
-        error_message=job.error_message,
-        created_at=job.created_at,
-        updated_at=job.updated_at,
+    def format_event(event: str, data: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    async def event_stream():
+        # Subscribe before the snapshot so no update falls between the two
+        queue = job_events.subscribe(job_id)
+        try:
+            job = job_store.get_job(job_id)
+            if not job:
+                return
+            yield format_event("status", build_job_status(job).model_dump())
+            if job.status in FINAL_STATUSES:
+                return
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if message["event"] == "progress":
+                    yield format_event("progress", message["data"])
+                    continue
+
+                job = job_store.get_job(job_id)
+                if not job:
+                    return
+                yield format_event("status", build_job_status(job).model_dump())
+                if job.status in FINAL_STATUSES:
+                    return
+        finally:
+            job_events.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.get("/download", dependencies=[Depends(require_api_key)])
-async def find_job_by_url(url: str = Query(..., description="URL to search for")):
+async def find_job_by_url(
+    url: str = Query(..., description="URL to search for"),
+    type: Optional[str] = Query(None, description='Output type ("audio" or "video")'),
+):
     """
     Find existing job by URL.
 
     Args:
-        url: URL to search for
+        url: URL to search for (any URL of the same media matches)
+        type: Optional output type filter
 
     Returns:
         Job status if found, 404 if not
     """
-    job = job_store.find_job_by_url(url)
+    job = find_existing_job(url, type)
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"No job found for URL: {url}",
         )
 
-    download_url = None
-    if job.status == "completed" and job.output_path:
-        output_path = Path(job.output_path)
-        ext = output_path.suffix
-        download_url = f"/media/{job.job_id}{ext}"
+    return build_job_status(job)
 
-    return JobStatusResponse(
-        job_id=job.job_id,
-        status=job.status,
-        url=job.url,
-        provider=job.provider,
-        output_type=job.output_type,
-        download_url=download_url,
-        metadata=job.metadata,
-        error_message=job.error_message,
-        created_at=job.created_at,
-        updated_at=job.updated_at,
-    )
 
+@router.get("/media/probe", dependencies=[Depends(require_api_key)])
+async def probe_media(
+    req: Request,
+    url: str = Query(..., description="Media URL to inspect"),
+):
+    """
+    Get title, duration and available formats without downloading.
+
+    The extraction is cached per media key, so repeated probes and a
+    following download of the same media skip a new extraction.
+
+    Args:
+        url: Media URL
+
+    Returns:
+        Media metadata and formats
+    """
+    enforce_rate_limit(req)
+
+    provider = registry.get_provider(url)
+    if not provider:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No suitable provider found for this URL",
+        )
+    media_key = provider.canonicalize(url)
+
+    try:
+        info, cached = await metadata_cache.get_or_extract(media_key, lambda: provider.probe(url))
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Metadata extraction timed out",
+        )
+    except YtDlpProcessError as e:
+        logger.warning(f"Probe failed for {url}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Could not extract metadata: {e}",
+        )
+
+    formats = [
+        MediaFormat(
+            format_id=str(fmt.get("format_id")),
+            ext=fmt.get("ext"),
+            protocol=fmt.get("protocol"),
+            vcodec=fmt.get("vcodec"),
+            acodec=fmt.get("acodec"),
+            width=fmt.get("width"),
+            height=fmt.get("height"),
+            fps=fmt.get("fps"),
+            abr=fmt.get("abr"),
+            tbr=fmt.get("tbr"),
+            filesize=fmt.get("filesize") or fmt.get("filesize_approx"),
+            format_note=fmt.get("format_note"),
+        )
+        for fmt in info.get("formats") or [info]
+        if fmt.get("format_id") is not None
+    ]
+    return MediaProbeResponse(
+        url=url,
+        media_key=media_key,
+        provider=provider.name,
+        title=info.get("title"),
+        duration=info.get("duration"),
+        uploader=info.get("uploader"),
+        thumbnail=info.get("thumbnail"),
+        is_live=info.get("is_live"),
+        formats=formats,
+        cached=cached,
+    )
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from uuid import uuid4
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -27,12 +28,12 @@ async def download_audio_endpoint(
     os.makedirs(settings.audio_root, exist_ok=True)
 
     try:
-        raw_path, duration = download_best_audio(
+        raw_path, duration = await download_best_audio(
             str(payload.url), 
             settings.audio_root,
             cookies_file=settings.youtube_cookies_file if settings.youtube_cookies_file else None
         )
-        normalized_path = ensure_mp3(raw_path, settings.audio_root)
+        normalized_path = await asyncio.to_thread(ensure_mp3, raw_path, settings.audio_root)
 
         filename = os.path.basename(normalized_path)
         file_url = request.url_for("files", path=filename)
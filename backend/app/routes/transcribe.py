@@ -1,3 +1,4 @@
+import asyncio
 import os
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, HttpUrl
@@ -35,12 +36,12 @@ async def transcribe_url_endpoint(
 
     try:
         # Step 1: Download audio
-        raw_path, duration = download_best_audio(
+        raw_path, duration = await download_best_audio(
             str(payload.url), 
             settings.audio_root,
             cookies_file=settings.youtube_cookies_file if settings.youtube_cookies_file else None
         )
-        normalized_path = ensure_mp3(raw_path, settings.audio_root)
+        normalized_path = await asyncio.to_thread(ensure_mp3, raw_path, settings.audio_root)
 
         # Step 2: Transcribe using OpenAI Whisper
         openai_client = OpenAI(api_key=settings.openai_api_key)
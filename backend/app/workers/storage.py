@@ -0,0 +1,243 @@
+"""Storage lifecycle management: TTL expiry, byte quota and LRU eviction."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi.staticfiles import StaticFiles
+from loguru import logger
+from starlette.responses import FileResponse
+
+from ..downloader.jobs import BaseJobStore
+from ..downloader.media_store import BLOB_DIR, INDEX_DIR, MediaStore
+
+
+# Files modified more recently than this are never evicted (downloads in progress)
+WRITE_GRACE_SECONDS = 600
+
+# Job statuses whose records may be expired
+FINAL_JOB_STATUSES = ("completed", "failed", "expired")
+
+
+def touch(path: str) -> None:
+    """
+    Record an access to a stored file by bumping its atime.
+
+    The explicit update works regardless of relatime/noatime mount options.
+
+    Args:
+        path: File that was accessed
+    """
+    try:
+        stat = os.stat(path)
+        os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+    except OSError:
+        pass
+
+
+def last_access(stat: os.stat_result) -> float:
+    """Last access time of a file (atime, never earlier than mtime)."""
+    return max(stat.st_atime, stat.st_mtime)
+
+
+class TrackedStaticFiles(StaticFiles):
+    """StaticFiles that records each served file as accessed."""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if isinstance(response, FileResponse) and response.status_code == 200:
+            touch(str(response.path))
+        return response
+
+
+@dataclass
+class StorageArea:
+    """A directory of artifacts managed by the storage manager."""
+
+    name: str
+    directory: str
+    ttl_seconds: int
+    job_outputs: bool = False  # Files are named "<job_id>..." and referenced by jobs
+    content_addressed: bool = False  # Outputs are hardlinks to blobs kept by a MediaStore
+
+    def is_blob(self, path: str) -> bool:
+        """Whether a path is a blob of the area's media store."""
+        return self.content_addressed and os.path.dirname(os.path.dirname(path)) == os.path.join(
+            self.directory, BLOB_DIR
+        )
+
+
+@dataclass
+class StoredFile:
+    """One stored inode and every managed name (hardlink) it has."""
+
+    stat: os.stat_result
+    names: list[tuple[StorageArea, str]]
+
+    @property
+    def orphaned(self) -> bool:
+        """A blob no job output links to any more (reference count 0)."""
+        return all(area.is_blob(path) for area, path in self.names) and self.stat.st_nlink <= len(self.names)
+
+
+class StorageManager:
+    """
+    Tracks stored artifacts and reclaims disk space.
+
+    Every run:
+    1. Deletes files not accessed within their area's TTL.
+    2. Evicts least-recently-accessed files until usage is under the quota.
+    3. Marks completed jobs whose output was removed as ``expired`` so the
+       next request downloads the media again.
+    4. Deletes finished job records older than the job TTL.
+
+    Hardlinked names of one inode (job outputs sharing a content-addressed
+    blob) are handled as one file: counted once towards the quota, and
+    expired or evicted together with every job that references them. Blobs
+    whose job outputs are all gone are deleted.
+    """
+
+    def __init__(
+        self,
+        areas: list[StorageArea],
+        job_store: Optional[BaseJobStore] = None,
+        quota_bytes: int = 0,
+        job_ttl_seconds: int = 0,
+    ):
+        """
+        Initialize storage manager.
+
+        Args:
+            areas: Managed directories
+            job_store: Store whose jobs reference files in job output areas
+            quota_bytes: Maximum total bytes across all areas (0 disables)
+            job_ttl_seconds: Age after which finished job records are deleted (0 disables)
+        """
+        self.areas = areas
+        self.job_store = job_store
+        self.quota_bytes = quota_bytes
+        self.job_ttl_seconds = job_ttl_seconds
+
+    def _scan(self) -> list[StoredFile]:
+        files: dict[tuple[int, int], StoredFile] = {}
+        for area in self.areas:
+            index_dir = os.path.join(area.directory, BLOB_DIR, INDEX_DIR)
+            for root, _, names in os.walk(area.directory):
+                if area.content_addressed and root == index_dir:
+                    continue
+                for name in names:
+                    if name.endswith(".lock"):
+                        continue  # Partial-download locks, removed by their holder
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    stored = files.setdefault((stat.st_dev, stat.st_ino), StoredFile(stat, []))
+                    stored.names.append((area, path))
+        return list(files.values())
+
+    def _remove(self, stored: StoredFile) -> bool:
+        """Delete every name of a stored file; True if any was deleted."""
+        removed = False
+        for area, path in stored.names:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed = True
+            if area.job_outputs and not area.is_blob(path):
+                self._expire_job(path)
+        return removed
+
+    def _expire_job(self, path: str) -> None:
+        """Mark the completed job whose output file was removed as expired."""
+        if not self.job_store:
+            return
+        job_id = os.path.basename(path).split(".")[0].split("_")[0]
+        job = self.job_store.get_job(job_id)
+        if (
+            job
+            and job.status == "completed"
+            and job.output_path
+            and os.path.abspath(job.output_path) == os.path.abspath(path)
+        ):
+            self.job_store.update_job_status(
+                job_id,
+                "expired",
+                error_message="Media was removed from storage; request it again to re-download",
+            )
+
+    def run_once(self) -> dict:
+        """
+        Run one expiry/eviction pass.
+
+        Returns:
+            Counts of expired and evicted files, bytes freed and jobs deleted
+        """
+        now = time.time()
+        expired = evicted = freed = 0
+        kept = []
+
+        for stored in self._scan():
+            stat = stored.stat
+            ttl = max(area.ttl_seconds for area, _ in stored.names)
+            if stored.orphaned:
+                expire = now - stat.st_ctime > WRITE_GRACE_SECONDS
+            else:
+                expire = now - last_access(stat) > ttl and now - stat.st_mtime > WRITE_GRACE_SECONDS
+            if expire:
+                if self._remove(stored):
+                    expired += 1
+                    freed += stat.st_size
+            else:
+                kept.append(stored)
+
+        if self.quota_bytes > 0:
+            usage = sum(stored.stat.st_size for stored in kept)
+            for stored in sorted(kept, key=lambda item: last_access(item.stat)):
+                if usage <= self.quota_bytes:
+                    break
+                if now - stored.stat.st_mtime <= WRITE_GRACE_SECONDS:
+                    continue
+                if self._remove(stored):
+                    evicted += 1
+                    freed += stored.stat.st_size
+                    usage -= stored.stat.st_size
+
+        for area in self.areas:
+            if area.content_addressed:
+                MediaStore(area.directory).prune_index()
+
+        jobs_deleted = 0
+        if self.job_store and self.job_ttl_seconds > 0:
+            cutoff = (datetime.utcnow() - timedelta(seconds=self.job_ttl_seconds)).isoformat()
+            jobs_deleted = self.job_store.delete_jobs_before(cutoff, FINAL_JOB_STATUSES)
+
+        result = {"expired": expired, "evicted": evicted, "bytes_freed": freed, "jobs_deleted": jobs_deleted}
+        if expired or evicted or jobs_deleted:
+            logger.info(
+                "Storage cleanup: {expired} expired, {evicted} evicted, {freed} bytes freed, {jobs} job records deleted",
+                expired=expired,
+                evicted=evicted,
+                freed=freed,
+                jobs=jobs_deleted,
+            )
+        return result
+
+
+def start_storage_scheduler(manager: StorageManager, interval: int):
+    async def scheduler():
+        while True:
+            try:
+                await asyncio.to_thread(manager.run_once)
+            except Exception as e:
+                logger.error(f"Storage cleanup failed: {e}")
+            await asyncio.sleep(interval)
+
+    return scheduler()
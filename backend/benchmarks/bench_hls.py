@@ -0,0 +1,114 @@
+"""Benchmark concurrent HLS segment downloads against a local high-latency server.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_hls --segments 360 --segment-kb 512 --latency-ms 80 --concurrency 1 4 8 16
+
+A local HTTP server serves a VOD media playlist of --segments segments (6 s
+each, so 360 segments is a one-hour stream). Every request waits
+--latency-ms before responding and is sent at --rate-mb MB/s, like a CDN
+edge far from the client. Each concurrency level is timed and the
+concatenated output is checked byte for byte. Concurrency 1 matches how
+ffmpeg reads a playlist (one segment at a time).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from loguru import logger
+
+from app.downloader.hls import download_hls
+
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _make_handler(segments: list[bytes], latency: float, rate: float):
+    playlist = "#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:6\n"
+    playlist += "".join(f"#EXTINF:6.0,\nseg{index}.ts\n" for index in range(len(segments)))
+    playlist += "#EXT-X-ENDLIST\n"
+
+    class LatencyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            if self.path.endswith(".m3u8"):
+                body = playlist.encode()
+                content_type = "application/vnd.apple.mpegurl"
+            else:
+                body = segments[int(self.path.rsplit("seg", 1)[1].split(".")[0])]
+                content_type = "video/mp2t"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+
+            started = time.monotonic()
+            for offset in range(0, len(body), BLOCK_SIZE):
+                self.wfile.write(body[offset : offset + BLOCK_SIZE])
+                ahead = (offset + BLOCK_SIZE) / rate - (time.monotonic() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+    return LatencyHandler
+
+
+async def _download(url: str, output_dir: str, concurrency: int) -> tuple[float, str]:
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        started = time.perf_counter()
+        result = await download_hls(client, url, output_dir, f"c{concurrency}", "video", concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+    with open(result.paths[0], "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    os.remove(result.paths[0])
+    return elapsed, digest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent HLS segment downloads")
+    parser.add_argument("--segments", type=int, default=360)
+    parser.add_argument("--segment-kb", type=int, default=512)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--rate-mb", type=float, default=8.0, help="Per-request transfer rate in MB/s")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    segments = [os.urandom(args.segment_kb * 1024) for _ in range(args.segments)]
+    expected = hashlib.sha256(b"".join(segments)).hexdigest()
+    handler = _make_handler(segments, args.latency_ms / 1000, args.rate_mb * 1024 * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/stream.m3u8"
+
+    hours = args.segments * 6 / 3600
+    print(f"{args.segments} segments ({hours:.1f} h of media), {args.segment_kb} KB each", end="")
+    print(f", {args.latency_ms:.0f} ms latency")
+    with tempfile.TemporaryDirectory(prefix="bench-hls-") as tmp:
+        for concurrency in args.concurrency:
+            elapsed, digest = asyncio.run(_download(url, tmp, concurrency))
+            status = "ok" if digest == expected else "MISMATCH"
+            print(f"  concurrency {concurrency:<3} {elapsed:7.2f} s  {status}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
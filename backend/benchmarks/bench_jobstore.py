@@ -0,0 +1,116 @@
+"""Benchmark JobStore backends at increasing job counts.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_jobstore --sizes 10000 100000 1000000 --backends json sqlite
+
+Each backend is populated in a temporary directory, then the hot-path
+operations used by the download router are timed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+from app.downloader.jobs import BaseJobStore, DownloadJob, JobStore
+from app.downloader.sqlite_store import SQLiteJobStore
+
+
+def _make_job(index: int) -> DownloadJob:
+    return DownloadJob(
+        job_id=str(uuid.uuid4()),
+        url=f"https://www.youtube.com/watch?v=bench{index:08d}",
+        provider="youtube",
+        status="completed" if index % 10 else "failed",
+        output_path=f"storage/media/bench{index:08d}.wav",
+        metadata={"title": f"Benchmark video {index}", "duration": 300},
+    )
+
+
+def _populate(backend: str, root: Path, size: int) -> BaseJobStore:
+    jobs = (_make_job(i) for i in range(size))
+    if backend == "sqlite":
+        store = SQLiteJobStore(str(root / "jobs.db"))
+        store.import_jobs(jobs, batch_size=10000)
+        return store
+
+    jobs_dir = root / "jobs"
+    jobs_dir.mkdir(parents=True, exist_ok=True)
+    for job in jobs:
+        (jobs_dir / f"{job.job_id}.json").write_text(job.model_dump_json())
+    return JobStore(str(jobs_dir))
+
+
+def _time(op: Callable[[], object], repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        op()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return statistics.mean(samples), p95
+
+
+def run(backend: str, size: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory(prefix=f"bench-{backend}-") as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        store = _populate(backend, root, size)
+        populate_s = time.perf_counter() - start
+
+        sample_job = store.create_job("https://www.youtube.com/watch?v=benchsample", "youtube")
+        store.update_job_status(sample_job.job_id, "completed", output_path="storage/media/sample.wav")
+        progress = {"stage": "downloading", "bytes_done": 1 << 20, "bytes_total": 8 << 20, "percent": 12.5}
+        # _make_job seeds every tenth index as failed; pick a completed one
+        hit_index = random.randrange(1, size)
+        if hit_index % 10 == 0:
+            hit_index -= 1
+        hit_url = f"https://www.youtube.com/watch?v=bench{hit_index:08d}"
+
+        results = {
+            "find_job_by_url (hit)": _time(lambda: store.find_job_by_url(hit_url), repeat),
+            "find_job_by_url (miss)": _time(lambda: store.find_job_by_url("https://example.com/missing.mp4"), repeat),
+            "get_job": _time(lambda: store.get_job(sample_job.job_id), repeat),
+            "update_job_status": _time(lambda: store.update_job_status(sample_job.job_id, "completed"), repeat),
+            "update_job_progress": _time(lambda: store.update_job_progress(sample_job.job_id, progress), repeat),
+            "list_jobs (failed, 50)": _time(lambda: store.list_jobs(status="failed", limit=50), repeat),
+            "list_jobs (all, 50)": _time(lambda: store.list_jobs(limit=50), repeat),
+            "create_job": _time(lambda: store.create_job(f"https://example.com/{uuid.uuid4()}.mp4", "direct"), repeat),
+        }
+
+        print(f"\n{backend} @ {size:,} jobs (populated in {populate_s:.1f}s)")
+        for name, (mean_ms, p95_ms) in results.items():
+            print(f"  {name:<24} mean {mean_ms:9.3f} ms   p95 {p95_ms:9.3f} ms")
+
+        if isinstance(store, SQLiteJobStore):
+            store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark download JobStore backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"], choices=["json", "sqlite"])
+    parser.add_argument("--repeat", type=int, default=20, help="Timed iterations per operation")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    for size in args.sizes:
+        for backend in args.backends:
+            run(backend, size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Benchmark segmented range downloads against a per-connection throttled server.
+
+Usage (from the backend directory):
+
+    python -m benchmarks.bench_segmented --size-mb 64 --rate-mb 8 --connections 1 2 4 8
+
+A local HTTP server serves a random file with Range support and limits each
+connection to --rate-mb MB/s (like CDN per-connection throttling). Each
+connection count is timed, plus a run against the same server with ranges
+disabled to show the single-stream fallback.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+from loguru import logger
+
+from app.downloader.segmented import download_file
+
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _make_handler(data: bytes, rate: float, ranges: bool):
+    etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+
+    class ThrottledHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            start, end = 0, len(data) - 1
+            match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+            if ranges and match:
+                start = int(match.group(1))
+                end = min(int(match.group(2) or end), end)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+            else:
+                self.send_response(200)
+            if ranges:
+                self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            started = time.monotonic()
+            sent = 0
+            try:
+                for offset in range(start, end + 1, BLOCK_SIZE):
+                    block = data[offset : min(offset + BLOCK_SIZE, end + 1)]
+                    self.wfile.write(block)
+                    sent += len(block)
+                    ahead = sent / rate - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return ThrottledHandler
+
+
+async def _download(url: str, path: str, connections: int) -> tuple[float, str]:
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        started = time.perf_counter()
+        result = await download_file(client, url, path, connections=connections, min_segment_size=1024 * 1024)
+        return time.perf_counter() - started, result.sha256
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark segmented range downloads")
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--rate-mb", type=float, default=8.0, help="Per-connection limit in MB/s")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    data = os.urandom(args.size_mb * 1024 * 1024)
+    expected = hashlib.sha256(data).hexdigest()
+    rate = args.rate_mb * 1024 * 1024
+
+    servers = {}
+    for ranges in (True, False):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(data, rate, ranges))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers[ranges] = server
+
+    print(f"{args.size_mb} MB file, {args.rate_mb} MB/s per connection")
+    with tempfile.TemporaryDirectory(prefix="bench-segmented-") as tmp:
+        runs = [(True, n) for n in args.connections] + [(False, max(args.connections))]
+        for ranges, connections in runs:
+            url = f"http://127.0.0.1:{servers[ranges].server_port}/media.mp4"
+            elapsed, digest = asyncio.run(_download(url, os.path.join(tmp, "media.mp4"), connections))
+            label = f"{connections} connection(s)" + ("" if ranges else ", ranges disabled")
+            status = "ok" if digest == expected else "CHECKSUM MISMATCH"
+            print(f"  {label:<34} {elapsed:7.2f} s  {args.size_mb / elapsed:7.1f} MB/s  {status}")
+
+    for server in servers.values():
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()